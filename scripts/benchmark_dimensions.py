@@ -0,0 +1,107 @@
+"""
+Scaling benchmark for the geography and store generators.
+
+    python -m scripts.benchmark_dimensions
+    python -m scripts.benchmark_dimensions --sizes 50 5000 500000 --keep
+
+Each size generates and writes a full Parquet file into a scratch folder
+and reports wall time, rows/s and file size.
+"""
+
+import argparse
+import copy
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from src.dimensions.geography import GEOGRAPHY_SCHEMA, iter_geography_batches
+from src.dimensions.stores import STORE_SCHEMA, iter_store_batches
+from src.utils.output_utils import write_batches
+
+
+DEFAULT_SIZES = [50, 5_000, 50_000, 500_000, 5_000_000]
+
+# Geography sampled once for every store run (stores only read its keys)
+STORE_GEOGRAPHY_ROWS = 500
+
+
+def _geography_cfg(cfg, rows):
+    cfg = copy.deepcopy(cfg)
+    cfg["geography"]["target_rows"] = rows
+    return cfg
+
+
+def _timed_write(path, batches, schema):
+    t0 = time.perf_counter()
+    rows = write_batches(path, batches, schema)
+    secs = time.perf_counter() - t0
+    return rows, secs, Path(path).stat().st_size
+
+
+def _report(name, rows, secs, size):
+    rate = rows / secs if secs > 0 else float("inf")
+    print(
+        f"{name:<10} {rows:>12,} rows  {secs:>8.3f}s  "
+        f"{rate:>14,.0f} rows/s  {size / 1e6:>9.1f} MB"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark geography / store dimension generation"
+    )
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--out", default=None, help="Scratch folder (default: temp)")
+    parser.add_argument("--keep", action="store_true", help="Keep written files")
+    args = parser.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+
+    out = Path(args.out or tempfile.mkdtemp(prefix="dim_bench_"))
+    out.mkdir(parents=True, exist_ok=True)
+
+    try:
+        geo_path = out / "geography.parquet"
+        write_batches(
+            geo_path,
+            iter_geography_batches(_geography_cfg(cfg, STORE_GEOGRAPHY_ROWS)),
+            GEOGRAPHY_SCHEMA,
+        )
+
+        store_cfg = cfg["stores"]
+        for n in args.sizes:
+            rows, secs, size = _timed_write(
+                out / f"geography_{n}.parquet",
+                iter_geography_batches(_geography_cfg(cfg, n)),
+                GEOGRAPHY_SCHEMA,
+            )
+            _report("geography", rows, secs, size)
+
+            rows, secs, size = _timed_write(
+                out / f"stores_{n}.parquet",
+                iter_store_batches(
+                    geography_parquet_path=geo_path,
+                    num_stores=n,
+                    opening_start=store_cfg.get("opening", {}).get("start", "1995-01-01"),
+                    opening_end=store_cfg.get("opening", {}).get("end", "2020-12-31"),
+                    closing_end=store_cfg.get("closing_end", "2025-12-31"),
+                    seed=42,
+                ),
+                STORE_SCHEMA,
+            )
+            _report("stores", rows, secs, size)
+    finally:
+        if not args.keep:
+            shutil.rmtree(out, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
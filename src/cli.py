@@ -7,6 +7,8 @@ from pprint import pprint
 from src.engine.config.config_loader import load_config_file, load_config
 from src.engine.runners.dimensions_runner import generate_dimensions
 from src.engine.runners.sales_runner import run_sales_pipeline
+from src.engine.runners.append_runner import run_sales_append
+from src.utils import logging_utils
 from src.utils.logging_utils import info, fail, PIPELINE_START_TIME, fmt_sec
 
 
@@ -30,7 +32,9 @@ def main():
 
     parser.add_argument(
         "--format",
-        choices=["csv", "parquet", "delta", "deltaparquet"],
+        choices=[
+            "csv", "parquet", "delta", "deltaparquet", "arrow", "orc", "duckdb",
+        ],
         help="Override sales.file_format"
     )
 
@@ -104,6 +108,22 @@ def main():
         help="Path to configuration file"
     )
 
+    parser.add_argument(
+        "--append-until",
+        help=(
+            "Append sales for dates after the existing dataset's max "
+            "OrderDate up to this date (YYYY-MM-DD)"
+        ),
+    )
+
+    parser.add_argument(
+        "--append-to",
+        help=(
+            "Packaged dataset folder to append to "
+            "(default: latest dataset of the same format)"
+        ),
+    )
+
     parser.add_argument(
         "--regen-dimensions",
         nargs="+",
@@ -139,6 +159,121 @@ def main():
         help="Override promotions.total_promotions"
     )
 
+    # ----------------- SUBCOMMANDS -----------------
+
+    subparsers = parser.add_subparsers(dest="command")
+
+    serve = subparsers.add_parser(
+        "serve",
+        help="Stream sales as Arrow IPC over HTTP (GET /sales)",
+    )
+
+    serve.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Bind address (default: localhost only)"
+    )
+
+    serve.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="Listen port"
+    )
+
+    serve.add_argument(
+        "--workers",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Shared worker pool size (default: sales.workers)"
+    )
+
+    serve.add_argument(
+        "--chunk-size",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Rows per streamed chunk (default: 100000)"
+    )
+
+    serve.add_argument(
+        "--max-inflight",
+        type=int,
+        default=2,
+        help="Chunks queued per client before waiting on the client"
+    )
+
+    serve.add_argument(
+        "--max-rows",
+        type=int,
+        help="Reject requests above this many rows"
+    )
+
+    emit = subparsers.add_parser(
+        "emit",
+        help="Emit sales as timestamped events at a fixed rate",
+    )
+
+    emit.add_argument(
+        "--rate",
+        type=float,
+        required=True,
+        help="Target rows per second"
+    )
+
+    emit.add_argument(
+        "--rows",
+        type=int,
+        help="Total rows to emit (default: sales.total_rows)"
+    )
+
+    emit.add_argument(
+        "--output-format",
+        choices=["ndjson", "csv", "arrow"],
+        default="ndjson",
+        help="Event encoding"
+    )
+
+    emit.add_argument(
+        "--target",
+        default="-",
+        help="'-' for stdout, a file/FIFO path, or tcp://host:port"
+    )
+
+    emit.add_argument(
+        "--workers",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Pre-generation workers (default: sales.workers)"
+    )
+
+    emit.add_argument(
+        "--chunk-size",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Rows per pre-generated chunk (default: 50000)"
+    )
+
+    emit.add_argument(
+        "--prefetch",
+        type=int,
+        default=4,
+        help="Chunks generated ahead of the clock"
+    )
+
+    emit.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Seed for sales chunks and event times"
+    )
+
+    emit.add_argument(
+        "--report-every",
+        type=float,
+        default=5.0,
+        help="Seconds between throughput / lag reports (0 = final only)"
+    )
+
     args = parser.parse_args()
 
     # Normalize force regeneration intent
@@ -154,6 +289,19 @@ def main():
     if args.format == "delta":
         args.format = "deltaparquet"
 
+    if args.command and args.append_until:
+        parser.error(f"--append-until cannot be combined with {args.command}")
+
+    # Keep stdout clean when emitting events to it
+    if args.command == "emit" and args.target == "-":
+        logging_utils.LOG_TO_STDERR = True
+
+    if args.append_to and not args.append_until:
+        parser.error("--append-to requires --append-until")
+
+    if args.append_until and args.only == "dimensions":
+        parser.error("--append-until cannot be combined with --only dimensions")
+
     try:
         # ==================================================
         # LOAD CONFIG
@@ -224,6 +372,40 @@ def main():
             pprint(cfg)
             return
 
+        # ==================================================
+        # SERVE (no files written)
+        # ==================================================
+        if args.command == "serve":
+            from src.facts.sales.sales_server import run_sales_server
+
+            run_sales_server(
+                cfg,
+                host=args.host,
+                port=args.port,
+                workers=sales_cfg.get("workers"),
+                max_inflight=args.max_inflight,
+                chunk_size=args.chunk_size or 100_000,
+                max_rows=args.max_rows,
+            )
+            return
+
+        if args.command == "emit":
+            from src.facts.sales.sales_emitter import run_sales_emitter
+
+            run_sales_emitter(
+                cfg,
+                rate=args.rate,
+                total_rows=args.rows,
+                output_format=args.output_format,
+                target=args.target,
+                chunk_size=args.chunk_size or 50_000,
+                workers=sales_cfg.get("workers"),
+                prefetch=args.prefetch,
+                seed=args.seed,
+                report_every=args.report_every,
+            )
+            return
+
         # ==================================================
         # HARD RESET FACT OUTPUT
         # ==================================================
@@ -250,15 +432,34 @@ def main():
 
         parquet_dims = Path(sales_cfg["parquet_folder"]).resolve()
 
+        dimensions = None
         if args.only != "sales":
-            generate_dimensions(
+            # Runs in the background; sales starts on the dimensions it
+            # reads while dates / exchange rates are still generating
+            dimensions = generate_dimensions(
                 cfg,
                 parquet_dims,
                 force_regenerate=force_regenerate,
+                wait=False,
             )
 
-        if args.only != "dimensions":
-            run_sales_pipeline(sales_cfg, fact_out, parquet_dims, cfg)
+        if args.append_until or args.only == "dimensions":
+            if dimensions is not None:
+                dimensions.wait_all()
+
+        if args.append_until:
+            run_sales_append(
+                sales_cfg,
+                fact_out,
+                parquet_dims,
+                cfg,
+                append_until=args.append_until,
+                dataset_folder=args.append_to,
+            )
+        elif args.only != "dimensions":
+            run_sales_pipeline(
+                sales_cfg, fact_out, parquet_dims, cfg, dimensions=dimensions
+            )
 
         # ==================================================
         # FINAL CLEANUP
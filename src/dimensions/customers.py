@@ -3,11 +3,17 @@
 # ---------------------------------------------------------
 
 import os
+import json
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from multiprocessing import cpu_count
 from pathlib import Path
 
-from src.utils import info, skip, stage
+from src.utils import info, skip, stage, work
+from src.utils.mp_utils import pool_context
 from src.versioning import should_regenerate, save_version
 from src.engine.dimension_loader import load_dimension
 
@@ -25,233 +31,428 @@ def load_list(path):
 
 
 # ---------------------------------------------------------
-# Main generator
+# Output schema
 # ---------------------------------------------------------
-def generate_synthetic_customers(cfg, parquet_dims_folder):
+# (name, arrow type, pandas_type, numpy_type) — the pandas metadata keeps
+# round-trips identical to the former DataFrame-based writer (e.g.
+# TotalChildren reads back as nullable Int64).
+_COLUMNS = [
+    ("CustomerKey",   pa.int64(),  "int64",   "int64"),
+    ("CustomerName",  pa.string(), "unicode", "object"),
+    ("DOB",           pa.date32(), "date",    "object"),
+    ("MaritalStatus", pa.string(), "unicode", "object"),
+    ("Gender",        pa.string(), "unicode", "object"),
+    ("EmailAddress",  pa.string(), "unicode", "object"),
+    ("YearlyIncome",  pa.int64(),  "int64",   "object"),
+    ("TotalChildren", pa.int64(),  "int64",   "Int64"),
+    ("Education",     pa.string(), "unicode", "object"),
+    ("Occupation",    pa.string(), "unicode", "object"),
+    ("CustomerType",  pa.string(), "unicode", "object"),
+    ("CompanyName",   pa.string(), "unicode", "object"),
+    ("GeographyKey",  pa.int64(),  "int64",   "int64"),
+]
+
+# Appended when customers.lifecycle.enabled
+_LIFECYCLE_COLUMNS = [
+    ("CustomerStartDate", pa.date32(), "date", "object"),
+    ("CustomerEndDate",   pa.date32(), "date", "object"),
+]
+
+
+def customer_schema(lifecycle=False) -> pa.Schema:
+    columns = _COLUMNS + (_LIFECYCLE_COLUMNS if lifecycle else [])
+    pandas_meta = {
+        "index_columns": [],
+        "column_indexes": [],
+        "columns": [
+            {
+                "name": name,
+                "field_name": name,
+                "pandas_type": pandas_type,
+                "numpy_type": numpy_type,
+                "metadata": None,
+            }
+            for name, _, pandas_type, numpy_type in columns
+        ],
+        "attributes": {},
+        "creator": {"library": "pyarrow", "version": pa.__version__},
+        "pandas_version": pd.__version__,
+    }
+    return pa.schema(
+        [pa.field(name, t) for name, t, _, _ in columns],
+        metadata={b"pandas": json.dumps(pandas_meta).encode("utf-8")},
+    )
 
-    cust_cfg = cfg["customers"]
-    total_customers = cust_cfg["total_customers"]
 
-    pct_india = cust_cfg["pct_india"]
-    pct_us = cust_cfg["pct_us"]
-    pct_eu = cust_cfg["pct_eu"]
-    pct_org = cust_cfg["pct_org"]
+# ---------------------------------------------------------
+# Categorical pools
+# ---------------------------------------------------------
+PERSONAL_EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "hotmail.com"]
+
+COMPANY_POOL = [
+    "TechNova", "BrightWave", "ZenithSystems", "PrimeSource",
+    "ApexCorp", "GlobalWorks", "VertexInnovations",
+    "OmniSoft", "NimbusSolutions", "SilverlineTech",
+]
+
+MARITAL = (["Married", "Single"], [0.55, 0.45])
+EDUCATION = (
+    ["High School", "Bachelors", "Masters", "PhD"],
+    [0.2, 0.5, 0.25, 0.05],
+)
+OCCUPATION = (
+    ["Professional", "Clerical", "Skilled", "Service", "Executive"],
+    [0.5, 0.2, 0.15, 0.1, 0.05],
+)
+
+# Region codes drawn per customer
+_REGIONS = ("IN", "US", "EU")
+
+
+def _dictionary(indices, values, mask=None):
+    """Dictionary-encoded column; mask=True rows are null."""
+    return pa.DictionaryArray.from_arrays(
+        pa.array(indices.astype(np.int32), mask=mask),
+        pa.array(values, type=pa.string()),
+    )
 
-    override_seed = cust_cfg.get("override", {}).get("seed")
-    seed = override_seed if override_seed is not None else 42
-    rng = np.random.default_rng(seed)
-
-    # -------------------------------------------------
-    # Email domain pools (simple, realistic)
-    # -------------------------------------------------
-    PERSONAL_EMAIL_DOMAINS = np.array([
-        "gmail.com",
-        "yahoo.com",
-        "outlook.com",
-        "hotmail.com",
-    ])
 
-    names_folder = cust_cfg["names_folder"]
+def _pool(*lists):
+    """
+    Concatenate name lists into one Arrow string array.
+    Returns (array, lowercase array, offsets, sizes).
+    """
+    values = [v for lst in lists for v in lst]
+    sizes = np.array([len(lst) for lst in lists], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    arr = pa.array(values, type=pa.string())
+    return arr, pc.utf8_lower(arr), offsets, sizes
 
-    # -----------------------------------------------------
-    # Load names
-    # -----------------------------------------------------
-    paths = {
-        "us_male":   os.path.join(names_folder, "us_male_first.csv"),
-        "us_female": os.path.join(names_folder, "us_female_first.csv"),
-        "us_last":   os.path.join(names_folder, "us_surnames.csv"),
-        "in_first":  os.path.join(names_folder, "india_first.csv"),
-        "in_last":   os.path.join(names_folder, "india_last.csv"),
-        "eu_first":  os.path.join(names_folder, "eu_first.csv"),
-        "eu_last":   os.path.join(names_folder, "eu_last.csv"),
-    }
 
-    us_male   = load_list(paths["us_male"])
-    us_female = load_list(paths["us_female"])
-    us_last   = load_list(paths["us_last"])
-    in_first  = load_list(paths["in_first"])
-    in_last   = load_list(paths["in_last"])
-    eu_first  = load_list(paths["eu_first"])
-    eu_last   = load_list(paths["eu_last"])
+def _draw(rng, group, offsets, sizes, valid):
+    """Index into a concatenated pool per row (null where not valid)."""
+    idx = offsets[group] + (rng.random(len(group)) * sizes[group]).astype(np.int64)
+    return pa.array(idx, mask=~valid)
 
-    # -----------------------------------------------------
-    # Load Geography
-    # -----------------------------------------------------
-    geography, _ = load_dimension(
-        "geography",
-        parquet_dims_folder,
-        cfg["geography"]
-    )
 
-    geo_keys = geography["GeographyKey"].to_numpy()
+# ---------------------------------------------------------
+# Shard builder (runs in pool workers)
+# ---------------------------------------------------------
+_CTX = {}
 
-    # -----------------------------------------------------
-    # Allocate arrays
-    # -----------------------------------------------------
-    N = total_customers
 
-    CustomerKey = np.arange(1, N + 1)
+def _init_customer_worker(ctx):
+    first_lists = [ctx["in_first"], ctx["us_male"], ctx["us_female"], ctx["eu_first"]]
+    last_lists = [ctx["in_last"], ctx["us_last"], ctx["eu_last"]]
 
-    Region = rng.choice(
-        ["IN", "US", "EU"],
-        size=N,
-        p=[pct_india / 100, pct_us / 100, pct_eu / 100],
-    )
+    _CTX.clear()
+    _CTX.update(ctx)
+    _CTX["first"] = _pool(*first_lists)
+    _CTX["last"] = _pool(*last_lists)
+    _CTX["schema"] = customer_schema(ctx["lifecycle"] is not None)
 
-    IsOrg = rng.random(N) < (pct_org / 100)
 
-    Gender = np.empty(N, dtype=object)
-    Gender[~IsOrg] = rng.choice(["Male", "Female"], size=(~IsOrg).sum())
-    Gender[IsOrg] = "Org"
+def _choice(rng, spec, n):
+    values, p = spec
+    return np.searchsorted(np.cumsum(p), rng.random(n), side="right").clip(
+        0, len(values) - 1
+    )
 
-    GeographyKey = rng.choice(geo_keys, size=N, replace=True)
 
-    # -----------------------------------------------------
-    # Names
-    # -----------------------------------------------------
-    FirstName = np.empty(N, dtype=object)
-    LastName = np.empty(N, dtype=object)
+def _draw_lifecycle(rng, n, window, lc):
+    """
+    (start, end) day numbers per customer; end = -1 means no churn.
 
-    mask = (Region == "IN") & (~IsOrg)
-    LastName[mask] = rng.choice(in_last, size=mask.sum())
+    initial_active_pct of customers are active from the first day of
+    the window, the rest are acquired uniformly across it. churn_pct of
+    customers churn uniformly between start + min_active_days and the
+    end of the window (end is the first day they no longer buy).
+    """
+    first, last = window
+    span = last - first + 1
 
-    mask = (Region == "US") & (~IsOrg)
-    LastName[mask] = rng.choice(us_last, size=mask.sum())
+    acquired = rng.integers(0, span, size=n)
+    initial = rng.random(n) < lc["initial_active_pct"]
+    start = first + np.where(initial, 0, acquired)
 
-    mask = (Region == "EU") & (~IsOrg)
-    LastName[mask] = rng.choice(eu_last, size=mask.sum())
+    churn_from = start + lc["min_active_days"]
+    churn_span = last + 1 - churn_from
+    churns = (rng.random(n) < lc["churn_pct"]) & (churn_span > 0)
+    offset = (rng.random(n) * np.maximum(churn_span, 1)).astype(np.int64)
+    end = np.where(churns, churn_from + offset, -1)
 
-    LastName[IsOrg] = None
+    return start, end
 
-    mask = (Region == "IN") & (~IsOrg)
-    FirstName[mask] = rng.choice(in_first, size=mask.sum())
 
-    mask = (Region == "US") & (~IsOrg) & (Gender == "Male")
-    FirstName[mask] = rng.choice(us_male, size=mask.sum())
+def build_customer_shard(shard, start_key, n):
+    """
+    Customers start_key .. start_key + n - 1 as an Arrow table.
 
-    mask = (Region == "US") & (~IsOrg) & (Gender == "Female")
-    FirstName[mask] = rng.choice(us_female, size=mask.sum())
+    The RNG stream is derived from (seed, shard), so a shard's rows do
+    not depend on how many workers generate the dimension.
+    """
+    c = _CTX
+    rng = np.random.default_rng(np.random.SeedSequence(c["seed"], spawn_key=(shard,)))
 
-    mask = (Region == "EU") & (~IsOrg)
-    FirstName[mask] = rng.choice(eu_first, size=mask.sum())
+    keys = np.arange(start_key, start_key + n, dtype=np.int64)
 
-    FirstName[IsOrg] = None
+    region = _choice(rng, (_REGIONS, c["region_p"]), n)      # 0=IN 1=US 2=EU
+    is_org = rng.random(n) < c["pct_org"]
+    person = ~is_org
+    female = rng.random(n) < 0.5
 
-    safe_first = np.where(FirstName == None, "", FirstName.astype(str))
-    safe_last  = np.where(LastName  == None, "", LastName.astype(str))
+    # 0=Male 1=Female 2=Org
+    gender = np.where(is_org, 2, female.astype(np.int8))
 
-    # -----------------------------------------------------
-    # Organization handling
-    # -----------------------------------------------------
-    company_pool = np.array([
-        "TechNova", "BrightWave", "ZenithSystems", "PrimeSource",
-        "ApexCorp", "GlobalWorks", "VertexInnovations",
-        "OmniSoft", "NimbusSolutions", "SilverlineTech"
-    ])
+    # ---------------- Names ----------------
+    first_arr, first_lower, f_off, f_size = c["first"]
+    last_arr, last_lower, l_off, l_size = c["last"]
 
-    CompanyName = np.empty(N, dtype=object)
-    CompanyName[IsOrg] = company_pool[rng.integers(0, len(company_pool), size=IsOrg.sum())]
-    CompanyName[~IsOrg] = None
+    # first-name pool: 0=IN 1=US male 2=US female 3=EU
+    first_group = np.choose(region, [0, 1 + female.astype(np.int64), 3])
+    first_idx = _draw(rng, first_group, f_off, f_size, person)
+    last_idx = _draw(rng, region, l_off, l_size, person)
 
-    safe_company = np.where(CompanyName == None, "", CompanyName.astype(str))
-    OrgDomain = np.where(IsOrg, np.char.lower(safe_company) + ".com", None)
+    first = first_arr.take(first_idx)
+    last = last_arr.take(last_idx)
 
-    # -----------------------------------------------------
-    # Emails
-    # -----------------------------------------------------
-    Email = np.empty(N, dtype=object)
-    person_mask = ~IsOrg
+    # ---------------- Organizations ----------------
+    company_idx = rng.integers(0, len(COMPANY_POOL), size=n)
+    company = _dictionary(company_idx, COMPANY_POOL, mask=person)
+    company_lower = pc.utf8_lower(pc.cast(company, pa.string()))
+
+    # ---------------- Emails ----------------
+    domain = pa.array(PERSONAL_EMAIL_DOMAINS).take(
+        pa.array(rng.integers(0, len(PERSONAL_EMAIL_DOMAINS), size=n))
+    )
+    suffix = pc.cast(pa.array(rng.integers(10, 99999, size=n)), pa.string())
 
-    email_domain = rng.choice(PERSONAL_EMAIL_DOMAINS, size=person_mask.sum())
+    person_email = pc.binary_join_element_wise(
+        first_lower.take(first_idx), ".", last_lower.take(last_idx),
+        suffix, "@", domain, "",
+    )
+    org_email = pc.binary_join_element_wise("info@", company_lower, ".com", "")
+    email = pc.if_else(pa.array(is_org), org_email, person_email)
 
-    Email[person_mask] = (
-        np.char.lower(safe_first[person_mask]) + "." +
-        np.char.lower(safe_last[person_mask]) +
-        rng.integers(10, 99999, size=person_mask.sum()).astype(str) +
-        "@" + email_domain
+    # ---------------- CustomerName ----------------
+    org_name = pc.binary_join_element_wise(
+        "Organization ", pc.cast(pa.array(keys), pa.string()), ""
+    )
+    person_name = pc.binary_join_element_wise(first, " ", last, "")
+    name = pc.if_else(pa.array(is_org), org_name, person_name)
+
+    # ---------------- Demographics ----------------
+    ages = rng.integers(18 * 365, 70 * 365, size=n)
+    dob = pa.array(c["today"] - ages.astype("timedelta64[D]"), mask=is_org)
+
+    marital = _dictionary(_choice(rng, MARITAL, n), MARITAL[0], mask=is_org)
+    income = pa.array(rng.integers(20000, 200000, size=n), mask=is_org)
+    children = pa.array(rng.integers(0, 5, size=n), mask=is_org)
+    education = _dictionary(_choice(rng, EDUCATION, n), EDUCATION[0], mask=is_org)
+    occupation = _dictionary(_choice(rng, OCCUPATION, n), OCCUPATION[0], mask=is_org)
+
+    geo_keys = c["geo_keys"]
+    geography = geo_keys[rng.integers(0, len(geo_keys), size=n)]
+
+    columns = [
+        keys,
+        name,
+        dob,
+        marital,
+        _dictionary(gender, ["Male", "Female", "Org"]),
+        email,
+        income,
+        children,
+        education,
+        occupation,
+        _dictionary(is_org.astype(np.int8), ["Person", "Organization"]),
+        company,
+        geography,
+    ]
+
+    # ---------------- Lifecycle ----------------
+    # Drawn last so the columns above keep their RNG stream
+    if c["lifecycle"] is not None:
+        first_day, last_day = _draw_lifecycle(rng, n, c["window"], c["lifecycle"])
+        columns += [
+            first_day.astype("datetime64[D]"),
+            pa.array(last_day.astype("datetime64[D]"), mask=last_day < 0),
+        ]
+
+    # Dictionaries are cast to plain strings per shard, so the file
+    # schema is unchanged for CSV / Delta / SQL consumers.
+    schema = c["schema"]
+    return pa.Table.from_arrays(
+        [pa.array(col).cast(field.type) for col, field in zip(columns, schema)],
+        schema=schema,
     )
 
-    Email[IsOrg] = "info@" + OrgDomain[IsOrg]
+
+def _customer_shard_task(task):
+    shard, start_key, n = task
+    return build_customer_shard(shard, start_key, n)
+
+
+# ---------------------------------------------------------
+# Lifecycle config
+# ---------------------------------------------------------
+def _lifecycle_params(cust_cfg):
+    """
+    customers.lifecycle -> fractions / day counts for _draw_lifecycle,
+    or None (no CustomerStartDate / CustomerEndDate) when disabled.
+    """
+    lc_cfg = cust_cfg.get("lifecycle") or {}
+    if not lc_cfg.get("enabled", False):
+        return None
+
+    initial = float(lc_cfg.get("initial_active_pct", 30))
+    churn = float(lc_cfg.get("churn_pct", 20))
+    min_days = int(lc_cfg.get("min_active_days", 30))
+
+    for name, value in (("initial_active_pct", initial), ("churn_pct", churn)):
+        if not 0 <= value <= 100:
+            raise ValueError(f"customers.lifecycle.{name} must be between 0 and 100")
+    if min_days < 0:
+        raise ValueError("customers.lifecycle.min_active_days must be >= 0")
+
+    return {
+        "initial_active_pct": initial / 100,
+        "churn_pct": churn / 100,
+        "min_active_days": min_days,
+    }
+
+
+def _activity_window(cust_cfg):
+    """customers.dates (inherited from defaults.dates) as day numbers."""
+    dates = cust_cfg.get("dates") or {}
+    if not dates.get("start") or not dates.get("end"):
+        raise ValueError("customers.dates.start / end missing (set defaults.dates)")
+
+    first = int(np.datetime64(dates["start"], "D").astype(np.int64))
+    last = int(np.datetime64(dates["end"], "D").astype(np.int64))
+    if last < first:
+        raise ValueError("customers.dates.end must not be before start")
+    return first, last
+
+
+# ---------------------------------------------------------
+# Main generator
+# ---------------------------------------------------------
+def generate_synthetic_customers(cfg, parquet_dims_folder, out_path):
+    """
+    Generate the customer dimension in key-range shards and stream them
+    into out_path (one row group per shard). Returns the row count.
+
+    customers.shard_size sets rows per shard (part of the output's
+    identity, like the seed); customers.workers only sets parallelism.
+    With customers.lifecycle.enabled, CustomerStartDate /
+    CustomerEndDate fall inside customers.dates.
+    """
+    cust_cfg = cfg["customers"]
+    total_customers = int(cust_cfg["total_customers"])
+
+    pct_india = cust_cfg["pct_india"]
+    pct_us = cust_cfg["pct_us"]
+    pct_eu = cust_cfg["pct_eu"]
+    pct_org = cust_cfg["pct_org"]
+
+    override_seed = cust_cfg.get("override", {}).get("seed")
+    seed = override_seed if override_seed is not None else 42
+
+    region_p = [pct_india / 100, pct_us / 100, pct_eu / 100]
+    if not np.isclose(sum(region_p), 1.0):
+        raise ValueError("customers.pct_india + pct_us + pct_eu must equal 100")
+
+    shard_size = int(cust_cfg.get("shard_size") or 1_000_000)
+    if shard_size <= 0:
+        raise ValueError("customers.shard_size must be > 0")
+
+    lifecycle = _lifecycle_params(cust_cfg)
+    window = _activity_window(cust_cfg) if lifecycle is not None else None
+
+    names_folder = cust_cfg["names_folder"]
 
     # -----------------------------------------------------
-    # CustomerName
+    # Load names
     # -----------------------------------------------------
-    CustomerName = np.where(
-        IsOrg,
-        "Organization " + CustomerKey.astype(str),
-        safe_first + " " + safe_last,
-    )
+    paths = {
+        "us_male":   os.path.join(names_folder, "us_male_first.csv"),
+        "us_female": os.path.join(names_folder, "us_female_first.csv"),
+        "us_last":   os.path.join(names_folder, "us_surnames.csv"),
+        "in_first":  os.path.join(names_folder, "india_first.csv"),
+        "in_last":   os.path.join(names_folder, "india_last.csv"),
+        "eu_first":  os.path.join(names_folder, "eu_first.csv"),
+        "eu_last":   os.path.join(names_folder, "eu_last.csv"),
+    }
+    ctx = {k: list(load_list(p)) for k, p in paths.items()}
 
     # -----------------------------------------------------
-    # Demographics
+    # Load Geography
     # -----------------------------------------------------
-    BirthDate = np.empty(N, dtype=object)
-    if person_mask.sum():
-        ages = rng.integers(18 * 365, 70 * 365, size=person_mask.sum())
-        dates = pd.Timestamp("today").normalize() - pd.to_timedelta(ages, unit="D")
-        BirthDate[person_mask] = pd.to_datetime(dates).date
-
-    BirthDate[IsOrg] = None
-
-    MaritalStatus = np.empty(N, dtype=object)
-    MaritalStatus[~IsOrg] = rng.choice(
-        ["Married", "Single"],
-        size=(~IsOrg).sum(),
-        p=[0.55, 0.45],
-    )
-    MaritalStatus[IsOrg] = None
-
-    YearlyIncome = np.where(
-        IsOrg,
-        None,
-        rng.integers(20000, 200000, size=N)
-    )
-
-    TotalChildren = pd.Series(
-        np.where(IsOrg, pd.NA, rng.integers(0, 5, size=N)),
-        dtype="Int64",
-    )
-
-    Education = np.where(
-        IsOrg,
-        None,
-        rng.choice(
-            ["High School", "Bachelors", "Masters", "PhD"],
-            size=N,
-            p=[0.2, 0.5, 0.25, 0.05],
-        ),
+    geography, _ = load_dimension(
+        "geography",
+        parquet_dims_folder,
+        cfg["geography"]
     )
 
-    Occupation = np.where(
-        IsOrg,
-        None,
-        rng.choice(
-            ["Professional", "Clerical", "Skilled", "Service", "Executive"],
-            size=N,
-            p=[0.5, 0.2, 0.15, 0.1, 0.05],
-        ),
+    if geography is None:
+        raise RuntimeError(
+            f"geography.parquet not found in {parquet_dims_folder}; "
+            "generate geography first"
+        )
+
+    ctx.update(
+        seed=seed,
+        region_p=region_p,
+        pct_org=pct_org / 100,
+        today=np.datetime64("today", "D"),
+        window=window,
+        lifecycle=lifecycle,
+        # Only the key column is read
+        geo_keys=geography.numpy("GeographyKey").astype(np.int64),
     )
 
     # -----------------------------------------------------
-    # Final DataFrame
+    # Shards
     # -----------------------------------------------------
-    df = pd.DataFrame({
-        "CustomerKey": CustomerKey,
-        "CustomerName": CustomerName,
-        "DOB": BirthDate,
-        "MaritalStatus": MaritalStatus,
-        "Gender": Gender,
-        "EmailAddress": Email,
-        "YearlyIncome": YearlyIncome,
-        "TotalChildren": TotalChildren,
-        "Education": Education,
-        "Occupation": Occupation,
-        "CustomerType": np.where(IsOrg, "Organization", "Person"),
-        "CompanyName": CompanyName,
-        "GeographyKey": GeographyKey,
-    })
-
-    return df
+    tasks = [
+        (i, start + 1, min(shard_size, total_customers - start))
+        for i, start in enumerate(range(0, total_customers, shard_size))
+    ]
+
+    workers = cust_cfg.get("workers") or max(1, cpu_count() - 1)
+    workers = max(1, min(int(workers), len(tasks)))
+
+    schema = customer_schema(lifecycle is not None)
+    written = 0
+
+    with pq.ParquetWriter(str(out_path), schema) as writer:
+        if workers == 1:
+            _init_customer_worker(ctx)
+            shards = map(_customer_shard_task, tasks)
+            pool = None
+        else:
+            # Runs on a DimensionScheduler thread: never plain fork
+            pool = pool_context().Pool(
+                processes=workers,
+                initializer=_init_customer_worker,
+                initargs=(ctx,),
+            )
+            shards = pool.imap(_customer_shard_task, tasks)
+
+        try:
+            for table in shards:
+                writer.write_table(table, row_group_size=table.num_rows)
+                written += table.num_rows
+                if len(tasks) > 1:
+                    work(f"Customers: {written:,}/{total_customers:,} rows")
+                del table
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    return written
 
 
 # ---------------------------------------------------------
@@ -263,13 +464,15 @@ def run_customers(cfg, parquet_folder: Path):
     cust_cfg = cfg["customers"]
     force = cust_cfg.get("_force_regenerate", False)
 
-    if not force and not should_regenerate("customers", cust_cfg, out_path):
+    # Worker count does not change the output
+    version_cfg = {k: v for k, v in cust_cfg.items() if k != "workers"}
+
+    if not force and not should_regenerate("customers", version_cfg, out_path):
         skip("Customers up-to-date; skipping.")
         return
 
     with stage("Generating Customers"):
-        df = generate_synthetic_customers(cfg, parquet_folder)
-        df.to_parquet(out_path, index=False)
+        generate_synthetic_customers(cfg, parquet_folder, out_path)
 
-    save_version("customers", cust_cfg, out_path)
+    save_version("customers", version_cfg, out_path)
     info(f"Customers dimension written: {out_path}")
@@ -4,7 +4,6 @@
 
 import pandas as pd
 import numpy as np
-import re
 from pathlib import Path
 
 from src.utils import info, skip, stage
@@ -68,155 +67,279 @@ def resolve_date_columns(dates_cfg):
 
 
 # ---------------------------------------------------------
-# DATE GENERATOR (LOGIC UNCHANGED)
+# DAY-NUMBER ARITHMETIC
 # ---------------------------------------------------------
+#
+# Dates are int64 day numbers (days since 1970-01-01). Civil dates are
+# converted with Howard Hinnant's days_from_civil / civil_from_days,
+# so every column is integer arithmetic plus small name lookups.
 
-def generate_date_table(start_date, end_date, first_fy_month):
+MONTH_NAMES = np.array([
+    "January", "February", "March", "April", "May", "June", "July",
+    "August", "September", "October", "November", "December",
+])
+MONTH_SHORT = np.array([m[:3] for m in MONTH_NAMES])
 
-    start_date = start_date or "2020-01-01"
-    end_date = end_date or "2026-12-31"
-    fy_start_month = first_fy_month or 5
+# Indexed by weekday, Monday = 0 (as pandas .dt.weekday)
+DAY_NAMES = np.array([
+    "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday",
+])
+DAY_SHORT = np.array([d[:3] for d in DAY_NAMES])
 
-    df = pd.DataFrame({"Date": pd.date_range(start_date, end_date, freq="D")})
 
-    df["DateKey"] = df["Date"].dt.strftime("%Y%m%d").astype(int)
+def days_from_civil(y, m, d):
+    """Day numbers for (year, month, day) integer arrays."""
+    y = np.asarray(y, dtype=np.int64)
+    m = np.asarray(m, dtype=np.int64)
+    d = np.asarray(d, dtype=np.int64)
 
-    df["Year"] = df["Date"].dt.year
-    df["Month"] = df["Date"].dt.month
-    df["Day"] = df["Date"].dt.day
-    df["Quarter"] = df["Date"].dt.quarter
+    y = y - (m <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (m + np.where(m > 2, -3, 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
 
-    df["MonthName"] = df["Date"].dt.strftime("%B")
-    df["MonthShort"] = df["Date"].dt.strftime("%b")
 
-    df["MonthStartDate"] = df["Date"].values.astype("datetime64[M]")
-    df["MonthEndDate"] = df["MonthStartDate"] + pd.offsets.MonthEnd(1)
+def civil_from_days(days):
+    """(year, month, day) int64 arrays for day numbers."""
+    z = np.asarray(days, dtype=np.int64) + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    d = doy - (153 * mp + 2) // 5 + 1
+    m = np.where(mp < 10, mp + 3, mp - 9)
+    y = yoe + era * 400 + (m <= 2)
+    return y, m, d
 
-    df["DayName"] = df["Date"].dt.strftime("%A")
-    df["DayShort"] = df["Date"].dt.strftime("%a")
-    df["DayOfYear"] = df["Date"].dt.dayofyear
 
-    df["MonthYear"] = df["Date"].dt.strftime("%b %Y")
-    df["MonthYearNumber"] = df["Year"] * 100 + df["Month"]
-    df["CalendarMonthIndex"] = df["Year"] * 12 + df["Month"]
-    df["CalendarQuarterIndex"] = df["Year"] * 4 + df["Quarter"]
+def _month_start(y, m):
+    """Day number of the first day of month m (may be <1 or >12) in year y."""
+    m0 = np.asarray(m, dtype=np.int64) - 1
+    return days_from_civil(np.asarray(y) + m0 // 12, m0 % 12 + 1, 1)
 
-    weekday = df["Date"].dt.weekday
-    df["DayOfWeek"] = (weekday + 1) % 7
-    df["IsWeekend"] = df["DayOfWeek"].isin([0, 6]).astype(int)
-    df["IsBusinessDay"] = (df["IsWeekend"] == 0).astype(int)
 
-    iso = df["Date"].dt.isocalendar()
-    df["WeekOfYearISO"] = iso.week.astype(int)
-    df["ISOYear"] = iso.year.astype(int)
+def _labels(codes, fmt):
+    """Format each distinct code once and gather: object array."""
+    uniq, inv = np.unique(codes, return_inverse=True)
+    table = np.array([fmt(int(u)) for u in uniq], dtype=object)
+    return table[inv.reshape(-1)]
 
-    df["QuarterStartDate"] = pd.to_datetime(
-        df["Year"].astype(str)
-        + "-"
-        + ((df["Quarter"] - 1) * 3 + 1).astype(str).str.zfill(2)
-        + "-01"
-    )
-    df["QuarterEndDate"] = df["QuarterStartDate"] + pd.offsets.QuarterEnd(0)
-
-    df["IsMonthStart"] = (df["Day"] == 1).astype(int)
-    df["IsMonthEnd"] = df["Date"].dt.is_month_end.astype(int)
-    df["IsQuarterStart"] = df["Date"].dt.is_quarter_start.astype(int)
-    df["IsQuarterEnd"] = df["Date"].dt.is_quarter_end.astype(int)
-    df["IsYearStart"] = ((df["Month"] == 1) & (df["Day"] == 1)).astype(int)
-    df["IsYearEnd"] = ((df["Month"] == 12) & (df["Day"] == 31)).astype(int)
-
-    df["QuarterYear"] = "Q" + df["Quarter"].astype(str) + " " + df["Year"].astype(str)
-    df["WeekOfMonth"] = ((df["Day"] - 1) // 7 + 1).astype(int)
-
-    df["WeekStartDate"] = df["Date"] - pd.to_timedelta(df["Date"].dt.weekday, unit="D")
-    df["WeekEndDate"] = df["WeekStartDate"] + pd.Timedelta(days=6)
-
-    biz = df.loc[df["IsBusinessDay"] == 1, ["Date"]].rename(columns={"Date": "BizDate"})
-
-    df = pd.merge_asof(
-        df.sort_values("Date"),
-        biz.assign(NextBD=biz["BizDate"]),
-        left_on="Date",
-        right_on="BizDate",
-        direction="forward"
-    ).drop(columns=["BizDate"])
-    df.rename(columns={"NextBD": "NextBusinessDay"}, inplace=True)
-
-    df = pd.merge_asof(
-        df,
-        biz.sort_values("BizDate").assign(PrevBD=biz["BizDate"]),
-        left_on="Date",
-        right_on="BizDate",
-        direction="backward"
-    ).drop(columns=["BizDate"])
-    df.rename(columns={"PrevBD": "PreviousBusinessDay"}, inplace=True)
-
-    df["FiscalYearStartYear"] = np.where(
-        df["Month"] >= fy_start_month, df["Year"], df["Year"] - 1
-    )
 
-    df["FiscalMonthNumber"] = ((df["Month"] - fy_start_month + 12) % 12) + 1
-    df["FiscalQuarterNumber"] = ((df["FiscalMonthNumber"] - 1) // 3 + 1)
+def _ts(days, unit="ns"):
+    return np.asarray(days, dtype=np.int64).astype("datetime64[D]").astype(f"datetime64[{unit}]")
 
-    df["FiscalYearBin"] = (
-        df["FiscalYearStartYear"].astype(str)
-        + "-"
-        + (df["FiscalYearStartYear"] + 1).astype(str)
-    )
 
-    df["FiscalQuarterName"] = (
-        "Q" + df["FiscalQuarterNumber"].astype(str)
-        + " FY" + (df["FiscalYearStartYear"] + 1).astype(str)
-    )
+def _day_number(value):
+    return int(np.datetime64(pd.Timestamp(value).date(), "D").astype(np.int64))
 
-    df["FiscalYearMonthNumber"] = df["FiscalYearStartYear"] * 12 + df["FiscalMonthNumber"]
-    df["FiscalYearQuarterNumber"] = df["FiscalYearStartYear"] * 4 + df["FiscalQuarterNumber"]
 
-    df["FiscalMonthIndex"] = df["FiscalYearStartYear"] * 12 + df["FiscalMonthNumber"]
-    df["FiscalQuarterIndex"] = df["FiscalYearStartYear"] * 4 + df["FiscalQuarterNumber"]
+# ---------------------------------------------------------
+# DATE GENERATOR
+# ---------------------------------------------------------
 
-    df["FiscalYearStartDate"] = pd.to_datetime(
-        df["FiscalYearStartYear"].astype(str)
-        + "-"
-        + str(fy_start_month).zfill(2)
-        + "-01"
-    )
-    df["FiscalYearEndDate"] = df["FiscalYearStartDate"] + pd.DateOffset(years=1) - pd.Timedelta(days=1)
+def _build_calendar(first_day, last_day, fy_start_month, groups):
+    """
+    Range-independent columns for day numbers first_day..last_day.
+    Business-day neighbours and today-relative flags depend on the
+    requested range / run date and are added by _finish.
+    """
+    days = np.arange(first_day, last_day + 1, dtype=np.int64)
+    y, m, d = civil_from_days(days)
+    weekday = (days + 3) % 7           # 1970-01-01 was a Thursday
+    q = (m - 1) // 3 + 1
+
+    i32 = lambda a: a.astype(np.int32)
+    flag = lambda a: a.astype(np.int64)
+
+    cols = {"Date": _ts(days)}
+
+    if "calendar" in groups:
+        month_start = _month_start(y, m)
+        month_end = _month_start(y, m + 1) - 1
+        q_start = _month_start(y, (q - 1) * 3 + 1)
+        q_end = _month_start(y, q * 3 + 1) - 1
+        dow = (weekday + 1) % 7
+        weekend = (dow == 0) | (dow == 6)
+        month_index = y * 12 + m
+
+        cols.update({
+            "DateKey": y * 10000 + m * 100 + d,
+            "Year": i32(y),
+            "IsYearStart": flag((m == 1) & (d == 1)),
+            "IsYearEnd": flag((m == 12) & (d == 31)),
+            "Quarter": i32(q),
+            "QuarterStartDate": _ts(q_start),
+            "QuarterEndDate": _ts(q_end),
+            "IsQuarterStart": flag(days == q_start),
+            "IsQuarterEnd": flag(days == q_end),
+            "QuarterYear": _labels(y * 4 + q - 1, lambda c: f"Q{c % 4 + 1} {c // 4}"),
+            "Month": i32(m),
+            "MonthName": MONTH_NAMES[m - 1].astype(object),
+            "MonthShort": MONTH_SHORT[m - 1].astype(object),
+            "MonthStartDate": _ts(month_start, "s"),
+            "MonthEndDate": _ts(month_end, "s"),
+            "MonthYear": _labels(month_index - 1, lambda c: f"{MONTH_SHORT[c % 12]} {c // 12}"),
+            "MonthYearNumber": i32(y * 100 + m),
+            "CalendarMonthIndex": i32(month_index),
+            "CalendarQuarterIndex": i32(y * 4 + q),
+            "IsMonthStart": flag(d == 1),
+            "IsMonthEnd": flag(days == month_end),
+            "WeekOfMonth": (d - 1) // 7 + 1,
+            "Day": i32(d),
+            "DayName": DAY_NAMES[weekday].astype(object),
+            "DayShort": DAY_SHORT[weekday].astype(object),
+            "DayOfYear": i32(days - days_from_civil(y, 1, 1) + 1),
+            "DayOfWeek": i32(dow),
+            "IsWeekend": flag(weekend),
+            "IsBusinessDay": flag(~weekend),
+        })
+
+    if "iso" in groups:
+        thursday = days - weekday + 3
+        iso_year = civil_from_days(thursday)[0]
+        cols.update({
+            "WeekOfYearISO": (thursday - days_from_civil(iso_year, 1, 1)) // 7 + 1,
+            "ISOYear": iso_year,
+            "WeekStartDate": _ts(days - weekday),
+            "WeekEndDate": _ts(days - weekday + 6),
+        })
+
+    if "fiscal" in groups:
+        fy_start = np.where(m >= fy_start_month, y, y - 1)
+        f_month = (m - fy_start_month + 12) % 12 + 1
+        f_quarter = (f_month - 1) // 3 + 1
+        fy_first = _month_start(fy_start, fy_start_month)
+        fy_last = _month_start(fy_start + 1, fy_start_month) - 1
+        fq_first_month = fy_start_month + (f_quarter - 1) * 3
+        fq_first = _month_start(fy_start, fq_first_month)
+        fq_last = _month_start(fy_start, fq_first_month + 3) - 1
+        fiscal_year = np.where(m < fy_start_month, y, y + 1)
+
+        cols.update({
+            "FiscalYearStartYear": i32(fy_start),
+            "FiscalMonthNumber": i32(f_month),
+            "FiscalQuarterNumber": i32(f_quarter),
+            "FiscalMonthIndex": i32(fy_start * 12 + f_month),
+            "FiscalQuarterIndex": i32(fy_start * 4 + f_quarter),
+            "FiscalQuarterName": _labels(
+                fy_start * 4 + f_quarter - 1,
+                lambda c: f"Q{c % 4 + 1} FY{c // 4 + 1}",
+            ),
+            "FiscalYearBin": _labels(fy_start, lambda c: f"{c}-{c + 1}"),
+            "FiscalYearMonthNumber": i32(fy_start * 12 + f_month),
+            "FiscalYearQuarterNumber": i32(fy_start * 4 + f_quarter),
+            "FiscalYearStartDate": _ts(fy_first),
+            "FiscalYearEndDate": _ts(fy_last),
+            "FiscalQuarterStartDate": _ts(fq_first),
+            "FiscalQuarterEndDate": _ts(fq_last),
+            "IsFiscalYearStart": flag(days == fy_first),
+            "IsFiscalYearEnd": flag(days == fy_last),
+            "IsFiscalQuarterStart": flag(days == fq_first),
+            "IsFiscalQuarterEnd": flag(days == fq_last),
+            "FiscalYear": fiscal_year,
+            "FiscalYearLabel": _labels(fiscal_year, lambda c: f"FY {c}"),
+        })
+
+    return pd.DataFrame(cols)
+
+
+def _finish(df, first_day, last_day, groups):
+    """Add range- and run-date-dependent calendar columns."""
+    if "calendar" not in groups:
+        return df
+
+    days = np.arange(first_day, last_day + 1, dtype=np.int64)
+    weekday = (days + 3) % 7
+
+    # Nearest business day inside the range (NaT past either end)
+    next_bd = days + np.select([weekday == 5, weekday == 6], [2, 1], 0)
+    prev_bd = days - np.select([weekday == 5, weekday == 6], [1, 2], 0)
+    nat = np.datetime64("NaT", "ns")
 
-    fq_shift = (df["FiscalQuarterNumber"] - 1) * 3
-    fq_year = df["FiscalYearStartDate"].dt.year + ((df["FiscalYearStartDate"].dt.month + fq_shift - 1) // 12)
-    fq_month = (df["FiscalYearStartDate"].dt.month + fq_shift - 1) % 12 + 1
+    today = pd.Timestamp.today().normalize()
+    today_day = _day_number(today)
+    year = df["Year"].to_numpy()
+    current_year = year == today.year
+    current_quarter = (today.month - 1) // 3 + 1
 
-    df["FiscalQuarterStartDate"] = pd.to_datetime(
-        fq_year.astype(str) + "-" + fq_month.astype(str).str.zfill(2) + "-01"
-    )
-    df["FiscalQuarterEndDate"] = df["FiscalQuarterStartDate"] + pd.DateOffset(months=3) - pd.Timedelta(days=1)
+    df = df.copy()
+    df["NextBusinessDay"] = np.where(next_bd <= last_day, _ts(next_bd), nat)
+    df["PreviousBusinessDay"] = np.where(prev_bd >= first_day, _ts(prev_bd), nat)
+    df["IsToday"] = (days == today_day).astype(np.int64)
+    df["IsCurrentYear"] = current_year.astype(np.int64)
+    df["IsCurrentMonth"] = (current_year & (df["Month"].to_numpy() == today.month)).astype(np.int64)
+    df["IsCurrentQuarter"] = (current_year & (df["Quarter"].to_numpy() == current_quarter)).astype(np.int64)
+    df["CurrentDayOffset"] = days - today_day
+    return df
 
-    df["IsFiscalYearStart"] = (df["Date"] == df["FiscalYearStartDate"]).astype(int)
-    df["IsFiscalYearEnd"] = (df["Date"] == df["FiscalYearEndDate"]).astype(int)
-    df["IsFiscalQuarterStart"] = (df["Date"] == df["FiscalQuarterStartDate"]).astype(int)
-    df["IsFiscalQuarterEnd"] = (df["Date"] == df["FiscalQuarterEndDate"]).astype(int)
 
-    df["FiscalYear"] = np.where(
-        df["Month"] < fy_start_month, df["Year"], df["Year"] + 1
-    ).astype(int)
+# (fy_start_month, groups) -> list of (first_day, last_day, frame), most recent last
+_CALENDAR_CACHE = {}
+_CALENDAR_CACHE_ENTRIES = 4
 
-    df["FiscalYearLabel"] = "FY " + df["FiscalYear"].astype(str)
 
-    today = pd.Timestamp.today().normalize()
-    df["IsToday"] = (df["Date"] == today).astype(int)
-    df["IsCurrentYear"] = (df["Year"] == today.year).astype(int)
-    df["IsCurrentMonth"] = ((df["Year"] == today.year) & (df["Month"] == today.month)).astype(int)
+def _cached_calendar(first_day, last_day, fy_start_month, groups):
+    """
+    Calendar frame for the range, sliced from a cached covering range
+    when there is one. Each (fiscal offset, groups) key keeps the most
+    recently used ranges.
+    """
+    entries = _CALENDAR_CACHE.setdefault((fy_start_month, groups), [])
 
-    current_quarter = (today.month - 1) // 3 + 1
-    df["IsCurrentQuarter"] = ((df["Year"] == today.year) & (df["Quarter"] == current_quarter)).astype(int)
-    df["CurrentDayOffset"] = (df["Date"] - today).dt.days
-    
-    # date_cols = df.select_dtypes(include="datetime").columns
-    # df[date_cols] = df[date_cols].apply(lambda col: pd.to_datetime(col).dt.date)
+    for i, (lo, hi, frame) in enumerate(entries):
+        if lo <= first_day and last_day <= hi:
+            entries.append(entries.pop(i))
+            return frame.iloc[first_day - lo:last_day - lo + 1].reset_index(drop=True)
 
-    df = df[CALENDAR_COLUMNS + ISO_COLUMNS + FISCAL_COLUMNS]
-    return df
+    frame = _build_calendar(first_day, last_day, fy_start_month, groups)
+    entries.append((first_day, last_day, frame))
+    del entries[:-_CALENDAR_CACHE_ENTRIES]
+    return frame
+
+
+def _groups(columns):
+    groups = []
+    for name, group_cols in (
+        ("calendar", CALENDAR_COLUMNS),
+        ("iso", ISO_COLUMNS),
+        ("fiscal", FISCAL_COLUMNS),
+    ):
+        if any(c in columns for c in group_cols):
+            groups.append(name)
+    return tuple(groups)
+
+
+def generate_date_table(start_date, end_date, first_fy_month, columns=None):
+    """
+    Daily calendar from start_date to end_date (inclusive).
+
+    columns limits the output (and the work) to the given columns; all
+    calendar, ISO and fiscal columns by default.
+    """
+    start_date = start_date or "2020-01-01"
+    end_date = end_date or "2026-12-31"
+    fy_start_month = int(first_fy_month or 5)
+
+    if not 1 <= fy_start_month <= 12:
+        raise ValueError("dates.fiscal_month_offset must be a month number 1-12")
+
+    columns = list(columns or CALENDAR_COLUMNS + ISO_COLUMNS + FISCAL_COLUMNS)
+    groups = _groups(columns)
+    # Today-relative / business-day columns are derived from calendar ones
+    if "calendar" not in groups:
+        groups = ("calendar",) + groups
+
+    first_day = _day_number(start_date)
+    last_day = _day_number(end_date)
+    if last_day < first_day:
+        raise ValueError(f"Dates: end {end_date} is before start {start_date}")
+
+    df = _cached_calendar(first_day, last_day, fy_start_month, groups)
+    df = _finish(df, first_day, last_day, groups)
+    return df[columns]
 
 
 # ---------------------------------------------------------
@@ -253,8 +376,12 @@ def run_dates(cfg, parquet_folder: Path):
     fiscal_start_month = dates_cfg.get("fiscal_month_offset", 5)
 
     with stage("Generating Dates"):
-        df = generate_date_table(start_date, end_date, fiscal_start_month)
-        df = df[resolve_date_columns(dates_cfg)]
+        df = generate_date_table(
+            start_date,
+            end_date,
+            fiscal_start_month,
+            columns=resolve_date_columns(dates_cfg),
+        )
         df.to_parquet(out_path, index=False)
 
     save_version("dates", version_cfg, out_path)
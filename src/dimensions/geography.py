@@ -2,11 +2,13 @@
 #  GEOGRAPHY DIMENSION (PIPELINE READY)
 # ---------------------------------------------------------
 
-import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from pathlib import Path
 
 from src.utils.logging_utils import info, fail, skip, stage
+from src.utils.output_utils import write_batches
 from src.versioning.version_store import should_regenerate, save_version
 
 
@@ -42,73 +44,99 @@ CURATED_ROWS = [
 ]
 
 
+# Output column order (no SQL dependency)
+GEOGRAPHY_COLUMNS = ["City", "State", "Country", "Continent", "ISOCode"]
+
+GEOGRAPHY_SCHEMA = pa.schema(
+    [("GeographyKey", pa.int64())] + [(c, pa.string()) for c in GEOGRAPHY_COLUMNS]
+)
+
+# Rows per Parquet row group / Arrow batch
+CHUNK_ROWS = 1_000_000
+
+
 # =============================================================
-# ORIGINAL GENERATOR (unchanged, except no disk write)
+# GENERATOR
 # =============================================================
 
-def build_dim_geography(cfg):
+def _country_weights(countries, gcfg):
     """
-    Build curated + weighted geography dimension.
-    Filtering based on allowed currencies from exchange_rates config.
+    Sampling weight per curated row (normalized), resolved once per
+    curated row rather than per output row.
+    """
+    country_weights = dict(gcfg.get("country_weights", {}))
+
+    total_w = sum(country_weights.values())
+    if total_w > 0 and total_w != 1.0:
+        for k in country_weights:
+            country_weights[k] /= total_w
+
+    rest = country_weights.get("Rest", 0)
+    weights = np.array(
+        [country_weights.get(c, rest) for c in countries], dtype="float64"
+    )
+
+    wsum = weights.sum()
+    if wsum == 0:
+        raise ValueError("All country weights resolved to zero. Check config.")
+    return weights / wsum
+
+
+def sample_geography_rows(cfg):
     """
+    Curated rows allowed by exchange_rates.currencies, and the sampled
+    curated-row index for every output row.
 
+    Sampling matches DataFrame.sample(replace=True, weights=...,
+    random_state=42), so keys map to the same cities as before.
+    """
     allowed_iso = set(cfg["exchange_rates"]["currencies"])
     gcfg = cfg["geography"]
-    target_rows = gcfg.get("target_rows", 200)
-
-    # ----------------------------------------------
-    # Convert curated rows → DataFrame
-    # ----------------------------------------------
-    df = pd.DataFrame(
-        CURATED_ROWS,
-        columns=["City", "State", "Country", "Continent", "ISOCode"],
-    )
+    target_rows = int(gcfg.get("target_rows", 200))
 
-    # ----------------------------------------------
-    # Filter by allowed currency codes
-    # ----------------------------------------------
-    before = len(df)
-    df = df[df["ISOCode"].isin(allowed_iso)].reset_index(drop=True)
-    after = len(df)
+    curated = pa.Table.from_pylist(
+        [dict(zip(GEOGRAPHY_COLUMNS, row)) for row in CURATED_ROWS]
+    )
+    curated = curated.filter(
+        pc.is_in(curated["ISOCode"], value_set=pa.array(sorted(allowed_iso), pa.string()))
+    )
 
-    if after == 0:
+    if curated.num_rows == 0:
         raise ValueError(
             f"No geography rows remain after filtering by allowed currencies: {sorted(allowed_iso)}"
         )
 
-    # ----------------------------------------------
-    # Country weights
-    # ----------------------------------------------
-    country_weights = gcfg.get("country_weights", {})
-
-    total_w = sum(country_weights.values())
-    if total_w > 0 and total_w != 1.0:
-        for k in country_weights:
-            country_weights[k] /= total_w
+    weights = _country_weights(curated["Country"].to_pylist(), gcfg)
+    weights = weights / weights.sum()
 
-    df["Weight"] = df["Country"].apply(
-        lambda c: country_weights.get(c, country_weights.get("Rest", 0))
+    idx = np.random.RandomState(42).choice(
+        curated.num_rows, size=target_rows, replace=True, p=weights
     )
+    return curated, idx
 
-    wsum = df["Weight"].sum()
-    if wsum == 0:
-        raise ValueError("All country weights resolved to zero. Check config.")
-    df["Weight"] = df["Weight"] / wsum
 
-    # ----------------------------------------------
-    # Weighted sampling
-    # ----------------------------------------------
-    sampled = df.sample(
-        n=target_rows,
-        replace=True,
-        weights=df["Weight"],
-        random_state=42,
-    ).reset_index(drop=True)
+def iter_geography_batches(cfg, chunk_rows=CHUNK_ROWS):
+    """Yield the geography dimension as Arrow record batches."""
+    curated, idx = sample_geography_rows(cfg)
 
-    # Assign deterministic keys
-    sampled.insert(0, "GeographyKey", np.arange(1, target_rows + 1))
+    for lo in range(0, len(idx), chunk_rows):
+        part = idx[lo:lo + chunk_rows]
+        rows = curated.take(pa.array(part))
+        keys = pa.array(np.arange(lo + 1, lo + len(part) + 1, dtype="int64"))
+        yield pa.RecordBatch.from_arrays(
+            [keys] + [rows[c].combine_chunks() for c in GEOGRAPHY_COLUMNS],
+            schema=GEOGRAPHY_SCHEMA,
+        )
 
-    return sampled
+
+def build_dim_geography(cfg):
+    """
+    Build curated + weighted geography dimension.
+    Filtering based on allowed currencies from exchange_rates config.
+    """
+    return pa.Table.from_batches(
+        list(iter_geography_batches(cfg)), schema=GEOGRAPHY_SCHEMA
+    ).to_pandas()
 
 
 # =============================================================
@@ -121,7 +149,7 @@ def run_geography(cfg, parquet_folder: Path):
     Handles:
     - version check
     - logging
-    - writing parquet
+    - writing parquet (one row group per batch)
     - saving version
     """
     out_path = parquet_folder / "geography.parquet"
@@ -134,21 +162,7 @@ def run_geography(cfg, parquet_folder: Path):
         return
 
     with stage("Generating Geography"):
-        df = build_dim_geography(cfg)
-
-        # Explicit domain column order (no SQL dependency)
-        output_cols = [
-            "GeographyKey",
-            "City",
-            "State",
-            "Country",
-            "Continent",
-            "ISOCode",
-        ]
-
-        # Drop internal columns like Weight
-        df = df[output_cols]
-        df.to_parquet(out_path, index=False)
+        write_batches(out_path, iter_geography_batches(cfg), GEOGRAPHY_SCHEMA)
 
     save_version("geography", geo_cfg, out_path)
 
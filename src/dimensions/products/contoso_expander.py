@@ -1,89 +1,131 @@
-from pathlib import Path
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .pricing import writable_float64
+
+
+def _variant_index(base_keys: np.ndarray, copy_no: np.ndarray, base_row: np.ndarray):
+    """
+    Occurrence number of each output row's base ProductKey (as
+    groupby("BaseProductKey").cumcount() over the repeated catalog),
+    computed arithmetically: full copies before the row contribute one
+    occurrence per duplicate of the key.
+    """
+    keys = pd.Series(base_keys)
+    if keys.is_unique:
+        return copy_no
+
+    groups = keys.groupby(keys, sort=False)
+    dup_rank = groups.cumcount().to_numpy()
+    dup_count = groups.transform("size").to_numpy()
+    return copy_no * dup_count[base_row] + dup_rank[base_row]
+
+
+def _set_column(table: pa.Table, name: str, values) -> pa.Table:
+    i = table.schema.get_field_index(name)
+    if i < 0:
+        return table.append_column(name, values)
+    return table.set_column(i, name, values)
 
 
 def expand_contoso_products(
-    base_products: pd.DataFrame,
+    base_products,
     num_products: int,
     seed: int = 42,
     price_jitter_pct: float = 0.0,
-) -> pd.DataFrame:
+) -> pa.Table:
     """
     Expand Contoso products to a larger row count while
     preserving schema, hierarchy, and semantics.
 
     - Categories & Subcategories are untouched
     - Only Product identity fields are modified
-    """
 
-    base_products = base_products.reset_index(drop=True)
-    base_count = len(base_products)
+    Output row i is base row i % len(base): every column is gathered
+    once, so peak memory is about the size of the output.
+    """
+    if isinstance(base_products, pa.Table):
+        base = base_products
+    else:
+        base = pa.Table.from_pandas(
+            base_products.reset_index(drop=True), preserve_index=False
+        )
+    base_count = base.num_rows
 
     if num_products <= base_count:
-        return base_products.copy()
+        return base
 
     rng = np.random.default_rng(seed)
 
-    # Repeat base rows
-    repeat_factor = int(np.ceil(num_products / base_count))
-    expanded = (
-        pd.concat([base_products] * repeat_factor, ignore_index=True)
-        .iloc[:num_products]
-        .copy()
-    )
+    # Repeat base rows (one gather per column)
+    copy_no, base_row = np.divmod(np.arange(num_products, dtype="int64"), base_count)
+    base_keys = base["ProductKey"].to_numpy()
+
+    expanded = base.take(pa.array(base_row))
 
     # Preserve lineage
-    expanded["BaseProductKey"] = expanded["ProductKey"]
+    expanded = _set_column(expanded, "BaseProductKey", expanded["ProductKey"])
 
     # New surrogate ProductKey
-    expanded["ProductKey"] = np.arange(
-        1, num_products + 1, dtype="int64"
-    )
+    product_key = pa.array(np.arange(1, num_products + 1, dtype="int64"))
+    expanded = _set_column(expanded, "ProductKey", product_key)
 
     # Variant index per base product
-    expanded["VariantIndex"] = (
-        expanded.groupby("BaseProductKey").cumcount()
-    )
+    variant = _variant_index(base_keys, copy_no, base_row)
+    del copy_no, base_row
+    expanded = _set_column(expanded, "VariantIndex", pa.array(variant))
 
     # ProductCode (business friendly)
-    expanded["ProductCode"] = (
-        expanded["ProductKey"].astype(str).str.zfill(7)
+    expanded = _set_column(
+        expanded,
+        "ProductCode",
+        pc.utf8_lpad(pc.cast(product_key, pa.string()), width=7, padding="0"),
     )
 
     # Name suffix for uniqueness
-    expanded["ProductName"] = (
-        expanded["ProductName"]
-        + " - V"
-        + expanded["VariantIndex"].astype(str).str.zfill(3)
+    expanded = _set_column(
+        expanded,
+        "ProductName",
+        pc.binary_join_element_wise(
+            expanded["ProductName"],
+            " - V",
+            pc.utf8_lpad(pc.cast(pa.array(variant), pa.string()), width=3, padding="0"),
+            "",
+        ),
     )
+    del variant
 
     # Optional deterministic price jitter
     if price_jitter_pct > 0:
+        price = writable_float64(expanded["UnitPrice"])
+        cost = writable_float64(expanded["UnitCost"])
+
         price_jitter = rng.uniform(
             1 - price_jitter_pct,
             1 + price_jitter_pct,
-            size=len(expanded),
+            size=num_products,
         )
 
         cost_jitter = rng.uniform(
             1 - price_jitter_pct,
             1.0,
-            size=len(expanded),
+            size=num_products,
         )
 
-        expanded["UnitPrice"] = (
-            expanded["UnitPrice"] * price_jitter
-        ).round(2)
+        np.multiply(price, price_jitter, out=price)
+        np.multiply(cost, price_jitter, out=cost)
+        np.multiply(cost, cost_jitter, out=cost)
+        del price_jitter, cost_jitter
 
-        expanded["UnitCost"] = (
-            expanded["UnitCost"] * price_jitter * cost_jitter
-        ).round(2)
+        np.round(price, 2, out=price)
+        np.round(cost, 2, out=cost)
 
         # Hard safety
-        expanded["UnitCost"] = np.minimum(
-            expanded["UnitCost"],
-            expanded["UnitPrice"],
-        )
+        np.minimum(cost, price, out=cost)
+
+        expanded = _set_column(expanded, "UnitPrice", pa.array(price))
+        expanded = _set_column(expanded, "UnitCost", pa.array(cost))
 
     return expanded
@@ -2,23 +2,29 @@ import numpy as np
 import pandas as pd
 
 
-def apply_product_pricing(
-    df: pd.DataFrame,
+def writable_float64(column) -> np.ndarray:
+    """Writable float64 NumPy array for an Arrow column (copies only if needed)."""
+    return np.require(column.to_numpy(), dtype="float64", requirements=["W", "C"])
+
+
+def apply_pricing_inplace(
+    unit_price: np.ndarray,
+    unit_cost: np.ndarray,
     pricing_cfg: dict,
     seed: int | None = None,
-) -> pd.DataFrame:
+) -> None:
     """
-    Apply pricing rules to Products.
+    Apply pricing rules to float64 UnitPrice / UnitCost arrays in place.
 
     Products become the economic source of truth.
     Sales must never rescale or clamp prices again.
     """
 
     if not pricing_cfg:
-        return df
+        return
 
     rng = np.random.default_rng(seed)
-    out = df.copy()
+    n = len(unit_price)
 
     # -------------------------------------------------
     # 1. BASE PRICE SCALING
@@ -32,14 +38,14 @@ def apply_product_pricing(
     if value_scale <= 0:
         raise ValueError("products.pricing.base.value_scale must be > 0")
 
-    out["UnitPrice"] = out["UnitPrice"] * value_scale
+    np.multiply(unit_price, value_scale, out=unit_price)
 
     # Apply min / max AFTER scaling
     if min_price is not None:
-        out["UnitPrice"] = out["UnitPrice"].clip(lower=min_price)
+        np.maximum(unit_price, min_price, out=unit_price)
 
     if max_price is not None:
-        out["UnitPrice"] = out["UnitPrice"].clip(upper=max_price)
+        np.minimum(unit_price, max_price, out=unit_price)
 
     # -------------------------------------------------
     # 2. COST MODEL (MARGIN-BASED)
@@ -62,10 +68,12 @@ def apply_product_pricing(
         margin = rng.uniform(
             min_margin,
             max_margin,
-            size=len(out),
+            size=n,
         )
 
-        out["UnitCost"] = out["UnitPrice"] * (1 - margin)
+        np.subtract(1, margin, out=margin)
+        np.multiply(unit_price, margin, out=unit_cost)
+        del margin
 
     # -------------------------------------------------
     # 3. JITTER (OPTIONAL NOISE)
@@ -78,34 +86,55 @@ def apply_product_pricing(
         pj = rng.uniform(
             1 - price_jitter,
             1 + price_jitter,
-            size=len(out),
+            size=n,
         )
-        out["UnitPrice"] = out["UnitPrice"] * pj
+        np.multiply(unit_price, pj, out=unit_price)
+        del pj
 
     if cost_jitter > 0:
         cj = rng.uniform(
             1 - cost_jitter,
             1 + cost_jitter,
-            size=len(out),
+            size=n,
         )
-        out["UnitCost"] = out["UnitCost"] * cj
+        np.multiply(unit_cost, cj, out=unit_cost)
+        del cj
 
     # -------------------------------------------------
     # 4. HARD SAFETY RULES
     # -------------------------------------------------
-    out["UnitPrice"] = out["UnitPrice"].clip(lower=0)
-    out["UnitCost"] = out["UnitCost"].clip(lower=0)
+    np.maximum(unit_price, 0, out=unit_price)
+    np.maximum(unit_cost, 0, out=unit_cost)
 
     # Cost must never exceed price
-    out["UnitCost"] = np.minimum(
-        out["UnitCost"],
-        out["UnitPrice"],
-    )
+    np.minimum(unit_cost, unit_price, out=unit_cost)
 
     # -------------------------------------------------
     # 5. FINAL ROUNDING (STORAGE)
     # -------------------------------------------------
-    out["UnitPrice"] = out["UnitPrice"].round(2)
-    out["UnitCost"] = out["UnitCost"].round(2)
+    np.round(unit_price, 2, out=unit_price)
+    np.round(unit_cost, 2, out=unit_cost)
+
+
+def apply_product_pricing(
+    df: pd.DataFrame,
+    pricing_cfg: dict,
+    seed: int | None = None,
+) -> pd.DataFrame:
+    """
+    Apply pricing rules to Products (DataFrame wrapper around
+    apply_pricing_inplace).
+    """
+
+    if not pricing_cfg:
+        return df
+
+    out = df.copy()
+    unit_price = out["UnitPrice"].to_numpy(dtype="float64", copy=True)
+    unit_cost = out["UnitCost"].to_numpy(dtype="float64", copy=True)
+
+    apply_pricing_inplace(unit_price, unit_cost, pricing_cfg, seed)
 
+    out["UnitPrice"] = unit_price
+    out["UnitCost"] = unit_cost
     return out
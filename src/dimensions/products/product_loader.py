@@ -1,12 +1,13 @@
 from pathlib import Path
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from src.utils import info, skip
 from src.versioning import should_regenerate, save_version
 
 from .contoso_loader import load_contoso_products
 from .contoso_expander import expand_contoso_products
-from .pricing import apply_product_pricing
+from .pricing import apply_pricing_inplace, writable_float64
 
 
 def load_product_dimension(config, output_folder: Path):
@@ -14,7 +15,7 @@ def load_product_dimension(config, output_folder: Path):
     Product dimension loader.
 
     Returns:
-        (DataFrame, regenerated: bool)
+        (pyarrow.Table, regenerated: bool)
     """
 
     p = config["products"]
@@ -26,7 +27,7 @@ def load_product_dimension(config, output_folder: Path):
 
     if not force and not should_regenerate("products", version_key, parquet_path):
         skip("Products up-to-date; skipping regeneration")
-        return pd.read_parquet(parquet_path), False
+        return pq.read_table(parquet_path), False
 
     # ---------------- WORK ----------------
     base_df = load_contoso_products(output_folder)
@@ -40,22 +41,28 @@ def load_product_dimension(config, output_folder: Path):
 
     if p["use_contoso_products"]:
         info("USING CONTOSO PRODUCTS (AS-IS)")
-        df = base_df
+        table = pa.Table.from_pandas(base_df, preserve_index=False)
     else:
         info("EXPANDING CONTOSO PRODUCTS")
-        df = expand_contoso_products(
+        table = expand_contoso_products(
             base_products=base_df,
             num_products=int(p["num_products"]),
             seed=int(p.get("seed", 42)),
             price_jitter_pct=float(p.get("price_jitter_pct", 0.0)),
         )
 
-    # Apply pricing (authoritative)
-    df = apply_product_pricing(
-        df=df,
-        pricing_cfg=p.get("pricing"),
-        seed=p.get("seed"),
-    )
+    # Apply pricing (authoritative), in place on the price / cost arrays
+    pricing_cfg = p.get("pricing")
+    if pricing_cfg:
+        unit_price = writable_float64(table["UnitPrice"])
+        unit_cost = writable_float64(table["UnitCost"])
+
+        apply_pricing_inplace(unit_price, unit_cost, pricing_cfg, seed=p.get("seed"))
+
+        for name, values in (("UnitPrice", unit_price), ("UnitCost", unit_cost)):
+            i = table.schema.get_field_index(name)
+            table = table.set_column(i, name, pa.array(values))
+        del unit_price, unit_cost
 
     # Required minimal fields for Sales
     required = [
@@ -68,16 +75,16 @@ def load_product_dimension(config, output_folder: Path):
     ]
 
     for col in required:
-        if col not in df.columns:
+        if col not in table.column_names:
             raise ValueError(f"Missing required field in Products: {col}")
 
     # Write parquet
-    df.to_parquet(parquet_path, index=False)
+    pq.write_table(table, parquet_path)
 
     # Save version metadata
     save_version("products", version_key, parquet_path)
 
-    return df, True
+    return table, True
 
 
 # ---------------------------------------------------------
@@ -4,13 +4,137 @@
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date
 from pathlib import Path
 
 from src.utils.logging_utils import info, skip, stage
 from src.versioning.version_store import should_regenerate, save_version
 
 
+# ---------------------------------------------------------
+#  PROMOTION METADATA
+# ---------------------------------------------------------
+
+PROMO_TYPES = {
+    "Holiday": "Holiday Discount",
+    "Seasonal": "Seasonal Discount",
+    "Clearance": "Clearance",
+    "Limited": "Limited Time",
+    "NoDiscount": "No Discount"
+}
+
+CATEGORIES = ["Store", "Online", "Region"]
+
+# (name, start mm-dd, end mm-dd, min discount, max discount)
+# An end month before the start month falls in the next year.
+HOLIDAYS = [
+    ("Black Friday",   "11-25", "11-30", 0.20, 0.70),
+    ("Cyber Monday",   "11-28", "12-02", 0.15, 0.50),
+    ("Christmas",      "12-10", "12-31", 0.20, 0.60),
+    ("New Year",       "12-26", "01-05", 0.10, 0.40),
+    ("Back-to-School", "07-01", "09-15", 0.05, 0.25),
+    ("Easter",         "03-20", "04-10", 0.05, 0.30),
+    ("Diwali",         "10-01", "11-15", 0.10, 0.50),
+]
+
+# name -> (first month, last month); wraps into the next year when last < first
+SEASON_WINDOWS = {
+    "Spring Clearance": (2, 4),
+    "Summer Sale": (5, 8),
+    "Autumn Sale": (9, 10),
+    "Winter Sale": (11, 1),
+    "Mid-Season Discount": (3, 9),
+}
+
+# TypeGroup -> (SeasonType, min days, max days (exclusive), min discount, max discount)
+RANDOM_WINDOWS = {
+    "Clearance": ("Clearance", 3, 25, 0.30, 0.70),
+    "Limited": ("Limited Time", 1, 15, 0.05, 0.35),
+}
+
+
+# ---------------------------------------------------------
+#  HELPERS (dates as day numbers since 1970-01-01)
+# ---------------------------------------------------------
+
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def _day(year, month, day):
+    return date(int(year), int(month), int(day)).toordinal() - _EPOCH
+
+
+def _year_of(day):
+    return date.fromordinal(int(day) + _EPOCH).year
+
+
+class _YearWindows:
+    """Per-year clamp bounds (day numbers) for the configured years."""
+
+    def __init__(self, year_windows):
+        self.bounds = {
+            y: (
+                _day(*pd.Timestamp(ws).timetuple()[:3]),
+                _day(*pd.Timestamp(we).timetuple()[:3]),
+            )
+            for y, (ws, we) in year_windows.items()
+        }
+
+    def clamp(self, day):
+        """Clamp a day into its own year's window (None: year not configured)."""
+        bounds = self.bounds.get(_year_of(day))
+        if bounds is None:
+            return None
+        return min(max(day, bounds[0]), bounds[1])
+
+    def window(self, start, end):
+        """Clamped (start, end), or None when empty / outside the years."""
+        s, e = self.clamp(start), self.clamp(end)
+        if s is None or e is None or s >= e:
+            return None
+        return s, e
+
+
+def _block(type_group, season_type, year, start, end, discount, category):
+    return pd.DataFrame({
+        "TypeGroup": type_group,
+        "SeasonType": np.asarray(season_type, dtype=object),
+        "Year": np.asarray(year, dtype=np.int64),
+        "DiscountPct": np.round(np.asarray(discount, dtype=np.float64), 2),
+        "PromotionType": PROMO_TYPES[type_group],
+        "PromotionCategory": np.asarray(category, dtype=object),
+        "StartDate": np.asarray(start, dtype="datetime64[D]").astype("datetime64[ns]"),
+        "EndDate": np.asarray(end, dtype="datetime64[D]").astype("datetime64[ns]"),
+    })
+
+
+def _pick(rs, seq):
+    """rs.choice(seq) for a list: the same draw, without the array copy."""
+    return seq[rs.randint(0, len(seq))]
+
+
+def _draw_windows(rs, n, windows, draw_start, durations, discount):
+    """
+    Draw n candidate windows in the legacy per-row order: the window
+    (draw_start, then its duration), then, only for a window that
+    survives clamping, its discount and category.
+    Returns column lists (season, year, start, end, discount, category).
+    """
+    cols = ([], [], [], [], [], [])
+    lo, hi = discount
+    for _ in range(int(n)):
+        season, y, start = draw_start()
+        win = windows.window(start, start + int(rs.randint(*durations)))
+        if win is None:
+            continue
+        for col, v in zip(cols, (
+            season, y, win[0], win[1],
+            round(rs.uniform(lo, hi), 2), _pick(rs, CATEGORIES),
+        )):
+            col.append(v)
+    return cols
+
+
 # ---------------------------------------------------------
 #  PROMOTION GENERATOR (SEMANTIC + SCALABLE)
 # ---------------------------------------------------------
@@ -23,201 +147,115 @@ def generate_promotions_catalog(
     num_limited=12,
     seed=42
 ):
+    """
+    Build the promotions catalog. Windows whose start or end falls
+    outside the configured years, or that are empty after clamping,
+    are dropped.
+
+    Draws follow the original generator's order on a legacy
+    RandomState, so a seed yields the same catalog as before; holiday
+    windows, naming and key assignment are vectorized. "No Discount" is
+    always PromotionKey 1 (the sales engine's no_discount_key).
+    """
     if not years:
         raise ValueError("Promotions: No years provided.")
 
-    np.random.seed(seed)
+    rs = np.random.RandomState(seed)
+    windows = _YearWindows(year_windows)
+    years_list = list(years)
 
-    # -----------------------------------------------------
-    # Helpers
-    # -----------------------------------------------------
-    def clamp(dt):
-        ws, we = year_windows.get(dt.year, (None, None))
-        if ws is None:
-            return None
-        return max(ws, min(dt, we))
-
-    def valid(s, e):
-        return s is not None and e is not None and s < e
-
-    def mmdd(mmdd, y):
-        m, d = map(int, mmdd.split("-"))
-        return datetime(y, m, d)
-
-    # -----------------------------------------------------
-    # Promotion Metadata
-    # -----------------------------------------------------
-    PROMO_TYPES = {
-        "Holiday": "Holiday Discount",
-        "Seasonal": "Seasonal Discount",
-        "Clearance": "Clearance",
-        "Limited": "Limited Time",
-        "NoDiscount": "No Discount"
-    }
-
-    CATEGORIES = ["Store", "Online", "Region"]
+    blocks = []
 
     # -----------------------------------------------------
     # HOLIDAYS (DETERMINISTIC – ONE PER YEAR)
     # -----------------------------------------------------
-    HOLIDAYS = [
-        ("Black Friday",   "11-25", "11-30", 0.20, 0.70),
-        ("Cyber Monday",   "11-28", "12-02", 0.15, 0.50),
-        ("Christmas",      "12-10", "12-31", 0.20, 0.60),
-        ("New Year",       "12-26", "01-05", 0.10, 0.40),
-        ("Back-to-School", "07-01", "09-15", 0.05, 0.25),
-        ("Easter",         "03-20", "04-10", 0.05, 0.30),
-        ("Diwali",         "10-01", "11-15", 0.10, 0.50),
-    ]
-
-    holiday_rows = []
-
-    for y in years:
+    h_rows = []
+    for y in years_list:
         for name, s_mmdd, e_mmdd, dmin, dmax in HOLIDAYS:
-            s = mmdd(s_mmdd, y)
-            e_month = int(e_mmdd.split("-")[0])
-            e_year = y + 1 if e_month < s.month else y
-            e = mmdd(e_mmdd, e_year)
-
-            s, e = clamp(s), clamp(e)
-            if not valid(s, e):
-                continue
-
-            holiday_rows.append({
-                "TypeGroup": "Holiday",
-                "SeasonType": name,
-                "Year": y,
-                "PromotionName": f"{name} {y}",
-                "PromotionDescription": f"{name} {y} Promotion",
-                "DiscountPct": round(np.random.uniform(dmin, dmax), 2),
-                "PromotionType": PROMO_TYPES["Holiday"],
-                "PromotionCategory": np.random.choice(CATEGORIES),
-                "StartDate": pd.Timestamp(s),
-                "EndDate": pd.Timestamp(e),
-            })
+            sm, sd = map(int, s_mmdd.split("-"))
+            em, ed = map(int, e_mmdd.split("-"))
+            win = windows.window(_day(y, sm, sd), _day(y + (em < sm), em, ed))
+            if win is not None:
+                h_rows.append((name, y, *win,
+                               round(rs.uniform(dmin, dmax), 2),
+                               _pick(rs, CATEGORIES)))
+
+    holidays = _block("Holiday", *(zip(*h_rows) if h_rows else [()] * 6))
+    holidays["PromotionName"] = holidays["SeasonType"] + " " + holidays["Year"].astype(str)
+    holidays["PromotionDescription"] = holidays["PromotionName"] + " Promotion"
 
     # -----------------------------------------------------
     # SEASONAL (BOUNDED RANDOMNESS)
     # -----------------------------------------------------
-    SEASON_WINDOWS = {
-        "Spring Clearance": (2, 4),
-        "Summer Sale": (5, 8),
-        "Autumn Sale": (9, 10),
-        "Winter Sale": (11, 1),
-        "Mid-Season Discount": (3, 9),
-    }
-
-    def seasonal_window(y, start_m, end_m):
-        if start_m <= end_m:
-            m = np.random.randint(start_m, end_m + 1)
-            year = y
-        else:
-            m = np.random.choice([*range(start_m, 13), *range(1, end_m + 1)])
-            year = y if m >= start_m else y + 1
-
-        start = datetime(year, m, np.random.randint(1, 25))
-        end = start + timedelta(days=np.random.randint(10, 60))
-        return clamp(start), clamp(end)
-
-    seasonal_rows = []
+    season_names = list(SEASON_WINDOWS)
 
-    for _ in range(num_seasonal):
-        y = np.random.choice(years)
-        name = np.random.choice(list(SEASON_WINDOWS.keys()))
+    def seasonal_start():
+        y = _pick(rs, years_list)
+        name = _pick(rs, season_names)
         sm, em = SEASON_WINDOWS[name]
-        s, e = seasonal_window(y, sm, em)
-        if valid(s, e):
-            seasonal_rows.append({
-                "TypeGroup": "Seasonal",
-                "SeasonType": name,
-                "Year": y,
-                "StartDate": pd.Timestamp(s),
-                "EndDate": pd.Timestamp(e),
-                "DiscountPct": round(np.random.uniform(0.05, 0.30), 2),
-                "PromotionType": PROMO_TYPES["Seasonal"],
-                "PromotionCategory": np.random.choice(CATEGORIES),
-            })
+        if sm <= em:
+            m, year = rs.randint(sm, em + 1), y
+        else:
+            m = _pick(rs, [*range(sm, 13), *range(1, em + 1)])
+            year = y if m >= sm else y + 1
+        return name, y, _day(year, m, rs.randint(1, 25))
+
+    blocks.append(_block(
+        "Seasonal",
+        *_draw_windows(rs, num_seasonal, windows, seasonal_start, (10, 60), (0.05, 0.30)),
+    ))
 
     # -----------------------------------------------------
     # CLEARANCE / LIMITED (FREE RANDOMNESS)
     # -----------------------------------------------------
-    def random_window(y, min_d, max_d):
-        start = datetime(y, np.random.randint(1, 13), np.random.randint(1, 25))
-        end = start + timedelta(days=np.random.randint(min_d, max_d))
-        return clamp(start), clamp(end)
-
-    clearance_rows, limited_rows = [], []
-
-    for _ in range(num_clearance):
-        y = np.random.choice(years)
-        s, e = random_window(y, 3, 25)
-        if valid(s, e):
-            clearance_rows.append({
-                "TypeGroup": "Clearance",
-                "SeasonType": "Clearance",
-                "Year": y,
-                "StartDate": pd.Timestamp(s),
-                "EndDate": pd.Timestamp(e),
-                "DiscountPct": round(np.random.uniform(0.30, 0.70), 2),
-                "PromotionType": PROMO_TYPES["Clearance"],
-                "PromotionCategory": np.random.choice(CATEGORIES),
-            })
-
-    for _ in range(num_limited):
-        y = np.random.choice(years)
-        s, e = random_window(y, 1, 15)
-        if valid(s, e):
-            limited_rows.append({
-                "TypeGroup": "Limited",
-                "SeasonType": "Limited Time",
-                "Year": y,
-                "StartDate": pd.Timestamp(s),
-                "EndDate": pd.Timestamp(e),
-                "DiscountPct": round(np.random.uniform(0.05, 0.35), 2),
-                "PromotionType": PROMO_TYPES["Limited"],
-                "PromotionCategory": np.random.choice(CATEGORIES),
-            })
+    for type_group, n in (("Clearance", num_clearance), ("Limited", num_limited)):
+        season_type, min_d, max_d, lo, hi = RANDOM_WINDOWS[type_group]
+
+        def random_start():
+            y = _pick(rs, years_list)
+            return season_type, y, _day(y, rs.randint(1, 13), rs.randint(1, 25))
+
+        blocks.append(_block(
+            type_group,
+            *_draw_windows(rs, n, windows, random_start, (min_d, max_d), (lo, hi)),
+        ))
 
     # -----------------------------------------------------
-    # FINAL ASSEMBLY
+    # NUMBERING (#1.. per year / type / season, by start date)
     # -----------------------------------------------------
-    df = pd.DataFrame(
-        holiday_rows + seasonal_rows + clearance_rows + limited_rows
-    )
-
+    # Default (quicksort) StartDate sorts, as the original generator
+    # did, so ties keep their original order and keys
     numbered = []
-    for (y, tg, st), g in df[df["TypeGroup"] != "Holiday"].groupby(
-        ["Year", "TypeGroup", "SeasonType"]
-    ):
-        g = g.sort_values("StartDate").copy()
-        g["LocalIndex"] = range(1, len(g) + 1)
-        g["PromotionName"] = f"{st} {y} #" + g["LocalIndex"].astype(str)
-        g["PromotionDescription"] = f"{st} for {y}"
-        numbered.append(g)
-
-    holidays = df[df["TypeGroup"] == "Holiday"].copy()
-    holidays["LocalIndex"] = None
-
-    final = pd.concat([holidays] + numbered, ignore_index=True)
-
-    final = pd.concat([
-        final,
-        pd.DataFrame([{
-            "TypeGroup": "NoDiscount",
-            "SeasonType": "NoDiscount",
-            "Year": min(years),
-            "PromotionName": "No Discount",
-            "PromotionDescription": "No Discount",
-            "DiscountPct": 0.0,
-            "PromotionType": PROMO_TYPES["NoDiscount"],
-            "PromotionCategory": "No Discount",
-            "StartDate": year_windows[min(years)][0],
-            "EndDate": year_windows[max(years)][1],
-            "LocalIndex": None,
-        }])
-    ], ignore_index=True)
+    drawn = pd.concat(blocks, ignore_index=True)
+    for (y, _, st), g in drawn.groupby(["Year", "TypeGroup", "SeasonType"]):
+        g = g.sort_values("StartDate")
+        local = np.arange(1, len(g) + 1).astype(str)
+        numbered.append(g.assign(
+            PromotionName=f"{st} {y} #" + pd.Series(local, index=g.index),
+            PromotionDescription=f"{st} for {y}",
+        ))
 
+    # -----------------------------------------------------
+    # FINAL ASSEMBLY ("No Discount" is always PromotionKey 1)
+    # -----------------------------------------------------
+    no_discount = pd.DataFrame([{
+        "TypeGroup": "NoDiscount",
+        "SeasonType": "NoDiscount",
+        "Year": min(years),
+        "PromotionName": "No Discount",
+        "PromotionDescription": "No Discount",
+        "DiscountPct": 0.0,
+        "PromotionType": PROMO_TYPES["NoDiscount"],
+        "PromotionCategory": "No Discount",
+        "StartDate": pd.Timestamp(year_windows[min(years)][0]),
+        "EndDate": pd.Timestamp(year_windows[max(years)][1]),
+    }])
+
+    final = pd.concat([holidays, *numbered, no_discount], ignore_index=True)
     final = final.sort_values("StartDate").reset_index(drop=True)
+
+    is_none = (final["TypeGroup"] == "NoDiscount").to_numpy()
+    final = pd.concat([final[is_none], final[~is_none]], ignore_index=True)
     final["PromotionKey"] = final.index + 1
     final["PromotionLabel"] = final["PromotionKey"]
 
@@ -4,112 +4,187 @@
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from pathlib import Path
 
 from src.utils.logging_utils import info, fail, skip, stage
+from src.utils.output_utils import write_batches
 from src.versioning.version_store import should_regenerate, save_version
-from src.engine.dimension_loader import load_dimension
+from src.engine.dimension_loader import DimensionHandle
 
 
 # ---------------------------------------------------------
-# ORIGINAL GENERATOR  (unchanged) :contentReference[oaicite:0]{index=0}
+# GENERATOR
 # ---------------------------------------------------------
 
-def generate_store_table(
-    geography_parquet_path="./data/parquet_dims/geography.parquet",
-    num_stores=200,
-    opening_start="2018-01-01",
-    opening_end="2023-01-31",
-    closing_end="2025-12-31",
-    seed=42
+STORE_TYPES = ["Supermarket", "Convenience", "Online", "Hypermarket"]
+STORE_TYPE_P = [0.5, 0.3, 0.1, 0.1]
+STORE_STATUS = ["Open", "Closed", "Renovating"]
+STORE_STATUS_P = [0.85, 0.10, 0.05]
+CLOSE_REASONS = ["Low Sales", "Lease Ended", "Renovation", "Moved Location"]
+
+STORE_SCHEMA = pa.schema([
+    ("StoreKey", pa.int64()),
+    ("StoreName", pa.string()),
+    ("StoreType", pa.string()),
+    ("Status", pa.string()),
+    ("GeographyKey", pa.int64()),
+    ("OpeningDate", pa.timestamp("ns")),
+    ("ClosingDate", pa.timestamp("ns")),
+    ("OpenFlag", pa.int64()),
+    ("SquareFootage", pa.int64()),
+    ("EmployeeCount", pa.int64()),
+    ("StoreManager", pa.string()),
+    ("Phone", pa.string()),
+    ("StoreDescription", pa.string()),
+    ("CloseReason", pa.string()),
+])
+
+# Rows per Parquet row group / Arrow batch
+CHUNK_ROWS = 1_000_000
+
+
+def _padded(values, width=4):
+    """f"{x:0{width}d}" for a non-negative integer array."""
+    return pc.utf8_lpad(pc.cast(pa.array(values), pa.string()), width=width, padding="0")
+
+
+def draw_store_attributes(
+    geo_keys,
+    num_stores,
+    opening_start,
+    opening_end,
+    closing_end,
+    seed,
 ):
     """
-    Generate synthetic store dimension table.
-    GeographyKey comes from final DimGeography (parquet).
+    All random store attributes as NumPy arrays, drawn in one pass in
+    the original draw order (so a seed gives the same stores as before).
+    Categorical columns are returned as indices into the label lists.
     """
     rng = np.random.default_rng(seed)
 
-    # --------------------------------------------------------
-    # Load Geography
-    # --------------------------------------------------------
-    geo = pd.read_parquet(geography_parquet_path)
-
-    if "GeographyKey" not in geo.columns:
-        raise ValueError(
-            f"'GeographyKey' missing in geography parquet. "
-            f"Found: {list(geo.columns)}"
-        )
-
-    geo_keys = geo["GeographyKey"].astype(int).to_numpy()
-
-    # --------------------------------------------------------
-    # Base structure
-    # --------------------------------------------------------
-    df = pd.DataFrame({"StoreKey": np.arange(1, num_stores + 1)})
-
-    df["StoreName"] = df["StoreKey"].map(lambda x: f"Store #{x:04d}")
+    # choice(len(labels)) draws exactly the indices choice(labels) takes
+    store_type = rng.choice(len(STORE_TYPES), num_stores, p=STORE_TYPE_P)
+    status = rng.choice(len(STORE_STATUS), num_stores, p=STORE_STATUS_P)
 
-    store_types = ["Supermarket", "Convenience", "Online", "Hypermarket"]
-    store_status = ["Open", "Closed", "Renovating"]
-    close_reasons = ["Low Sales", "Lease Ended", "Renovation", "Moved Location"]
+    geography_key = rng.choice(geo_keys, size=num_stores, replace=True)
 
-    df["StoreType"] = rng.choice(store_types, num_stores, p=[0.5, 0.3, 0.1, 0.1])
-    df["Status"] = rng.choice(store_status, num_stores, p=[0.85, 0.10, 0.05])
-
-    # --------------------------------------------------------
-    # GeographyKey assignment
-    # --------------------------------------------------------
-    df["GeographyKey"] = rng.choice(geo_keys, size=num_stores, replace=True)
-
-    # --------------------------------------------------------
-    # Opening Date
-    # --------------------------------------------------------
     open_start_ts = pd.Timestamp(opening_start).value // 10**9
     open_end_ts   = pd.Timestamp(opening_end).value   // 10**9
+    opening_s = rng.integers(open_start_ts, open_end_ts, num_stores)
 
-    df["OpeningDate"] = pd.to_datetime(
-        rng.integers(open_start_ts, open_end_ts, num_stores),
-        unit="s"
-    )
-
-    # --------------------------------------------------------
-    # Closing Date (vectorized, schema-safe)
-    # --------------------------------------------------------
     closing_cutoff_ts = pd.Timestamp(closing_end).value // 10**9
+    closed = status == STORE_STATUS.index("Closed")
+    closing_s = np.zeros(num_stores, dtype="int64")
+    if closed.any():
+        closing_s[closed] = rng.integers(opening_s[closed], closing_cutoff_ts)
+
+    return {
+        "store_type": store_type,
+        "status": status,
+        "geography_key": geography_key.astype("int64"),
+        "opening_s": opening_s.astype("int64"),
+        "closing_s": closing_s,
+        "closed": closed,
+        "square_footage": rng.integers(2000, 10000, num_stores),
+        "employee_count": rng.integers(10, 120, num_stores),
+        "close_reason": rng.choice(len(CLOSE_REASONS), size=num_stores),
+    }
+
+
+def build_store_batch(attrs, lo, hi) -> pa.RecordBatch:
+    """Arrow record batch for stores lo..hi-1 (0-based) of draw_store_attributes."""
+    a = {k: v[lo:hi] for k, v in attrs.items()}
+    keys = np.arange(lo + 1, hi + 1, dtype="int64")
+
+    store_type = pa.array(STORE_TYPES).take(a["store_type"])
+    status = pa.array(STORE_STATUS).take(a["status"])
+    closed = pa.array(a["closed"])
+
+    to_ns = lambda secs: pa.array(secs * 10**9, pa.timestamp("ns"))
+    join = lambda *parts: pc.binary_join_element_wise(*parts, "")
+
+    padded = _padded(keys)
+
+    columns = {
+        "StoreKey": pa.array(keys),
+        "StoreName": join("Store #", padded),
+        "StoreType": store_type,
+        "Status": status,
+        "GeographyKey": pa.array(a["geography_key"]),
+        "OpeningDate": to_ns(a["opening_s"]),
+        "ClosingDate": pc.if_else(closed, to_ns(a["closing_s"]), None),
+        "OpenFlag": pa.array(
+            (a["status"] == STORE_STATUS.index("Open")).astype("int64")
+        ),
+        "SquareFootage": pa.array(a["square_footage"].astype("int64")),
+        "EmployeeCount": pa.array(a["employee_count"].astype("int64")),
+        "StoreManager": join("Manager ", padded),
+        "Phone": join(
+            "(555) ",
+            pc.cast(pa.array(keys % 900 + 100), pa.string()),
+            "-",
+            _padded(keys % 10000),
+        ),
+        "StoreDescription": join(
+            store_type,
+            " located in GeographyKey ",
+            pc.cast(pa.array(a["geography_key"]), pa.string()),
+        ),
+        "CloseReason": pc.if_else(
+            closed, pa.array(CLOSE_REASONS).take(a["close_reason"]), ""
+        ),
+    }
+
+    return pa.RecordBatch.from_arrays(
+        [columns[f.name] for f in STORE_SCHEMA], schema=STORE_SCHEMA
+    )
 
-    df["ClosingDate"] = pd.NaT
-    closed_mask = df["Status"] == "Closed"
 
-    if closed_mask.any():
-        open_ts = df.loc[closed_mask, "OpeningDate"].astype("int64") // 10**9
-        df.loc[closed_mask, "ClosingDate"] = pd.to_datetime(
-            rng.integers(open_ts, closing_cutoff_ts),
-            unit="s"
-        )
+def iter_store_batches(
+    geography_parquet_path="./data/parquet_dims/geography.parquet",
+    num_stores=200,
+    opening_start="2018-01-01",
+    opening_end="2023-01-31",
+    closing_end="2025-12-31",
+    seed=42,
+    chunk_rows=CHUNK_ROWS,
+):
+    """
+    Yield the store dimension as Arrow record batches.
+    GeographyKey comes from final DimGeography (parquet).
+    """
+    geo = DimensionHandle("geography", geography_parquet_path)
 
-    # --------------------------------------------------------
-    # Additional attributes
-    # --------------------------------------------------------
-    df["OpenFlag"] = (df["Status"] == "Open").astype(int)
-    df["SquareFootage"] = rng.integers(2000, 10000, num_stores)
-    df["EmployeeCount"] = rng.integers(10, 120, num_stores)
+    # Only the key column is read (raises ValueError when missing)
+    geo_keys = geo.numpy("GeographyKey").astype(int)
 
-    df["StoreManager"] = df["StoreKey"].map(lambda x: f"Manager {x:04d}")
-    df["Phone"] = df["StoreKey"].map(
-        lambda x: f"(555) {x % 900 + 100}-{x % 10000:04d}"
+    attrs = draw_store_attributes(
+        geo_keys, num_stores, opening_start, opening_end, closing_end, seed
     )
+    for lo in range(0, num_stores, chunk_rows):
+        yield build_store_batch(attrs, lo, min(lo + chunk_rows, num_stores))
 
-    df["StoreDescription"] = (
-        df["StoreType"] + " located in GeographyKey " + df["GeographyKey"].astype(str)
-    )
 
-    df["CloseReason"] = np.where(
-        df["Status"] == "Closed",
-        rng.choice(close_reasons, size=num_stores),
-        ""
+def generate_store_table(
+    geography_parquet_path="./data/parquet_dims/geography.parquet",
+    num_stores=200,
+    opening_start="2018-01-01",
+    opening_end="2023-01-31",
+    closing_end="2025-12-31",
+    seed=42
+):
+    """
+    Generate synthetic store dimension table.
+    GeographyKey comes from final DimGeography (parquet).
+    """
+    batches = iter_store_batches(
+        geography_parquet_path, num_stores, opening_start, opening_end,
+        closing_end, seed,
     )
-
-    return df
+    return pa.Table.from_batches(list(batches), schema=STORE_SCHEMA).to_pandas()
 
 
 # ---------------------------------------------------------
@@ -123,7 +198,7 @@ def run_stores(cfg, parquet_folder: Path):
     - version checks
     - logging
     - geography dim loading
-    - writing parquet
+    - writing parquet (one row group per batch)
     - version saving
     """
 
@@ -139,7 +214,7 @@ def run_stores(cfg, parquet_folder: Path):
     geo_path = parquet_folder / "geography.parquet"
 
     with stage("Generating Stores"):
-        df = generate_store_table(
+        batches = iter_store_batches(
             geography_parquet_path=geo_path,
             num_stores=store_cfg.get("num_stores", 200),
             opening_start=store_cfg.get("opening", {}).get("start", "1995-01-01"),
@@ -147,7 +222,7 @@ def run_stores(cfg, parquet_folder: Path):
             closing_end=store_cfg.get("closing_end", "2025-12-31"),
             seed=store_cfg.get("override", {}).get("seed", 42),
         )
-        df.to_parquet(out_path, index=False)
+        write_batches(out_path, batches, STORE_SCHEMA)
 
     save_version("stores", store_cfg, out_path)
     
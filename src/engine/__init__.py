@@ -1,7 +1,8 @@
-from .dimension_loader import load_dimension
+from .dimension_loader import load_dimension, DimensionHandle
 from .packaging import create_final_output_folder
 
 __all__ = [
     "load_dimension",
+    "DimensionHandle",
     "create_final_output_folder",
 ]
@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+from src.versioning.version_store import load_version
+
+# Written at the root of every packaged dataset folder
+DATASET_INFO_FILE = "dataset_info.json"
+
+
+def _resolve_sales_dates(cfg):
+    """
+    Resolve the global sales date window exactly like generate_sales_fact.
+    """
+    defaults_section = cfg.get("defaults") or cfg.get("_defaults")
+    if not defaults_section or "dates" not in defaults_section:
+        raise KeyError("Missing defaults.dates in config")
+    dates = defaults_section["dates"]
+    return str(dates["start"]), str(dates["end"])
+
+
+def dimension_versions(parquet_dims: Path) -> dict:
+    """
+    Return {dimension_name: config_hash} for every dimension parquet
+    that has version metadata.
+    """
+    versions = {}
+    for f in sorted(Path(parquet_dims).glob("*.parquet")):
+        v = load_version(f.stem)
+        if v is not None and v.get("config_hash"):
+            versions[f.stem] = v["config_hash"]
+    return versions
+
+
+def write_dataset_info(final_folder: Path, cfg, sales_cfg, parquet_dims: Path):
+    """
+    Record what a packaged dataset was generated from.
+
+    Used by append mode to extend the dataset with new dates and
+    to verify that no upstream dimension changed in between.
+    """
+    start, end = _resolve_sales_dates(cfg)
+
+    data = {
+        "file_format": sales_cfg["file_format"].lower(),
+        "skip_order_cols": bool(sales_cfg.get("skip_order_cols", False)),
+        "start_date": start,
+        "end_date": end,
+        "total_rows": int(sales_cfg["total_rows"]),
+        "dimensions": dimension_versions(parquet_dims),
+    }
+
+    path = Path(final_folder) / DATASET_INFO_FILE
+    path.write_text(json.dumps(data, indent=2))
+    return path
+
+
+def load_dataset_info(final_folder: Path):
+    """Load dataset_info.json from a packaged dataset (None if missing)."""
+    path = Path(final_folder) / DATASET_INFO_FILE
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text())
+    except Exception:
+        return None
+
+
+def save_dataset_info(final_folder: Path, data: dict):
+    path = Path(final_folder) / DATASET_INFO_FILE
+    path.write_text(json.dumps(data, indent=2))
+    return path
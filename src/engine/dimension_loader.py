@@ -1,20 +1,81 @@
 import os
+import numpy as np
+import pyarrow as pa
 import pyarrow.parquet as pq
 
 from src.utils.logging_utils import info
-from src.versioning.version_store import load_version
+from src.versioning.version_store import load_version, _compute_hash
+
+
+class DimensionHandle:
+    """
+    Lazy reference to a dimension parquet file.
+
+    Only the footer is read up front (schema, row count); column data is
+    read on request, projected to the requested columns.
+    """
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = str(path)
+        self._pf = None
+
+    @property
+    def parquet_file(self) -> pq.ParquetFile:
+        if self._pf is None:
+            self._pf = pq.ParquetFile(self.path)
+        return self._pf
+
+    @property
+    def schema(self) -> pa.Schema:
+        return self.parquet_file.schema_arrow
+
+    @property
+    def columns(self):
+        return self.schema.names
+
+    @property
+    def num_rows(self) -> int:
+        return self.parquet_file.metadata.num_rows
+
+    def _require(self, columns):
+        missing = [c for c in columns if c not in self.columns]
+        if missing:
+            raise ValueError(
+                f"{missing} missing in {self.name} parquet. "
+                f"Found: {self.columns}"
+            )
+
+    def arrow(self, columns=None) -> pa.Table:
+        """Read the given columns (all when None) as an Arrow table."""
+        if columns is not None:
+            columns = list(columns)
+            self._require(columns)
+        return pq.read_table(self.path, columns=columns)
+
+    def numpy(self, column, dtype=None) -> np.ndarray:
+        """Read one column as a NumPy array."""
+        arr = self.arrow([column]).column(0).to_numpy()
+        return arr if dtype is None else arr.astype(dtype, copy=False)
+
+    def pandas(self, columns=None):
+        """Read the given columns (all when None) as a pandas DataFrame."""
+        return self.arrow(columns).to_pandas()
+
+    def __repr__(self):
+        return f"DimensionHandle({self.name!r}, {self.path!r})"
 
 
 def load_dimension(name, parquet_dims_path, expected_config):
     """
-    Loads a dimension parquet file and returns:
-        (pandas_dataframe, changed_flag)
+    Returns (DimensionHandle, changed_flag) without reading column data.
 
     Rules:
-    - If parquet is missing → changed_flag = True
+    - If parquet is missing → (None, True)
+    - If the parquet footer cannot be read → (None, True)
     - If version file is missing → changed_flag = True
     - If expected_config is None (static dimension) → changed_flag = False
-    - Otherwise → changed_flag = version mismatch
+    - Otherwise → changed_flag = stored config hash != hash(expected_config)
     """
 
     path = os.path.join(str(parquet_dims_path), f"{name}.parquet")
@@ -24,8 +85,14 @@ def load_dimension(name, parquet_dims_path, expected_config):
         info(f"{name.title()} missing — will regenerate.")
         return None, True
 
-    # Load the dimension as Pandas DataFrame (NOT PyArrow Table)
-    df = pq.read_table(path).to_pandas()
+    handle = DimensionHandle(name, path)
+
+    # Footer only: a truncated / partial write fails here
+    try:
+        handle.parquet_file
+    except (OSError, pa.ArrowInvalid):
+        info(f"{name.title()} parquet unreadable — will regenerate.")
+        return None, True
 
     # Version check
     prev_version = load_version(name)
@@ -37,6 +104,8 @@ def load_dimension(name, parquet_dims_path, expected_config):
         # static dimension: version existence is enough
         changed_flag = False
     else:
-        changed_flag = prev_version != expected_config
+        changed_flag = (
+            prev_version.get("config_hash") != _compute_hash(expected_config)
+        )
 
-    return df, changed_flag
+    return handle, changed_flag
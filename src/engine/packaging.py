@@ -3,16 +3,22 @@ from pathlib import Path
 from urllib.parse import unquote
 
 from src.utils.output_utils import create_final_output_folder
-from src.tools.sql.generate_bulk_insert_sql import generate_bulk_insert_script
+from src.engine.dataset_info import write_dataset_info
+from src.tools.sql.generate_bulk_insert_sql import (
+    generate_bulk_insert_script,
+    generate_bulk_insert_manifest,
+)
 from src.tools.sql.generate_create_table_scripts import generate_all_create_tables
 from src.utils.logging_utils import stage, info, skip, done
+from src.utils.file_transfer import transfer_file, transfer_files, tree_pairs
 
 
 def package_output(cfg, sales_cfg, parquet_dims: Path, fact_out: Path):
     """
     Handles:
     - Creating final packaged folder (dims + facts)
-    - Copying Sales fact (Delta / Parquet / CSV)
+    - Moving Sales fact out of scratch (Delta / Parquet / CSV / Arrow / ORC)
+    - Building a DuckDB database (duckdb)
     - Generating SQL scripts (CSV only)
     - Cleaning stale output
 
@@ -22,6 +28,9 @@ def package_output(cfg, sales_cfg, parquet_dims: Path, fact_out: Path):
     file_format = sales_cfg["file_format"].lower()
     is_csv = file_format == "csv"
 
+    # Sales-side tables packaged with the dimensions (ProductPriceHistory)
+    extra_dims = sorted((fact_out / "price_history").glob("*.parquet"))
+
     # ============================================================
     # Normalize final output root ONCE
     # ============================================================
@@ -39,6 +48,7 @@ def package_output(cfg, sales_cfg, parquet_dims: Path, fact_out: Path):
             file_format=file_format,
             sales_rows_expected=sales_cfg["total_rows"],
             cfg=cfg,
+            extra_dims=extra_dims,
         )
 
         # ---------------------------------------------------------
@@ -85,15 +95,75 @@ def package_output(cfg, sales_cfg, parquet_dims: Path, fact_out: Path):
             if not src_file.exists():
                 raise RuntimeError(f"Expected parquet file not found: {src_file}")
 
-            if dst_file.exists():
-                dst_file.unlink()
+            # fact_out is scratch: rename / link instead of copying
+            transfer_files(
+                [(src_file, dst_file)],
+                move=True,
+                label="Sales fact packaged (single parquet file)",
+            )
 
-            shutil.copy2(src_file, dst_file)
-            done("Sales fact copied (single parquet file).")
+            write_dataset_info(final_folder, cfg, sales_cfg, parquet_dims)
 
             # Parquet never generates SQL scripts
             return final_folder
 
+        # ============================================================
+        # DUCKDB MODE — move the database and import dimensions
+        # ============================================================
+        if file_format == "duckdb":
+            from src.tools.sql.duckdb_loader import (
+                DUCKDB_FILE,
+                load_dimensions_into_duckdb,
+            )
+
+            src_db = fact_out / "duckdb" / "sales.duckdb"
+            if not src_db.exists():
+                raise RuntimeError(f"Expected DuckDB file not found: {src_db}")
+
+            dst_db = final_folder / DUCKDB_FILE
+            transfer_file(src_db, dst_db, move=True)
+
+            duckdb_cfg = sales_cfg.get("duckdb") or {}
+            load_dimensions_into_duckdb(
+                dst_db,
+                parquet_dims,
+                cfg,
+                primary_keys=bool(duckdb_cfg.get("primary_keys", False)),
+                extra_dims=extra_dims,
+            )
+
+            # Everything lives in the database file
+            shutil.rmtree(dims_out, ignore_errors=True)
+            shutil.rmtree(facts_out, ignore_errors=True)
+
+            done(f"DuckDB database created: {DUCKDB_FILE}")
+
+            write_dataset_info(final_folder, cfg, sales_cfg, parquet_dims)
+            return final_folder
+
+        # ============================================================
+        # ARROW / ORC MODE — copy chunk or merged files and exit early
+        # ============================================================
+        if file_format in ("arrow", "orc"):
+            src_sales = fact_out / file_format
+            files = sorted(src_sales.glob(f"*.{file_format}"))
+
+            if not files:
+                raise RuntimeError(
+                    f"No {file_format} sales files found in: {src_sales}"
+                )
+
+            transfer_files(
+                [(f, facts_out / f.name) for f in files],
+                move=True,
+                label=f"Sales fact packaged ({file_format})",
+            )
+
+            write_dataset_info(final_folder, cfg, sales_cfg, parquet_dims)
+
+            # Arrow / ORC never generate SQL scripts
+            return final_folder
+
         # ============================================================
         # Determine source sales folder
         # ============================================================
@@ -109,8 +179,9 @@ def package_output(cfg, sales_cfg, parquet_dims: Path, fact_out: Path):
         # CSV MODE — flat copy (schema already resolved upstream)
         # ============================================================
         if is_csv:
-            csv_files = list(src_sales.glob("*.csv"))
-            info(f"Copying {len(csv_files)} CSV sales files from: {src_sales}")
+            # plain, .csv.gz and .csv.zst chunk files
+            csv_files = list(src_sales.glob("*.csv*"))
+            info(f"Packaging {len(csv_files)} CSV sales files from: {src_sales}")
 
             for csv_file in csv_files:
                 target = dst_sales / csv_file.name
@@ -119,27 +190,24 @@ def package_output(cfg, sales_cfg, parquet_dims: Path, fact_out: Path):
                         f"Duplicate CSV filename detected during packaging: "
                         f"{csv_file.name}"
                     )
-                shutil.copy2(csv_file, target)
 
-            done("Sales fact copied (CSV flat).")
+            transfer_files(
+                [(f, dst_sales / f.name) for f in csv_files],
+                move=True,
+                label="Sales fact packaged (CSV flat)",
+            )
 
         # ============================================================
         # DELTA MODE — directory snapshot copy
         # ============================================================
         else:
-            info(f"Copying sales fact from: {src_sales}")
-
-            for item in src_sales.iterdir():
-                if item.name == "_tmp_parts":
-                    continue
+            info(f"Packaging sales fact from: {src_sales}")
 
-                target = dst_sales / item.name
-                if item.is_dir():
-                    shutil.copytree(item, target, dirs_exist_ok=True)
-                else:
-                    shutil.copy2(item, target)
-
-            done("Sales fact copied (Delta snapshot).")
+            transfer_files(
+                tree_pairs(src_sales, dst_sales, ignore=("_tmp_parts",)),
+                move=True,
+                label="Sales fact packaged (Delta snapshot)",
+            )
 
     # ============================================================
     # SQL SCRIPT GENERATION — CSV ONLY (correct & reachable)
@@ -147,7 +215,7 @@ def package_output(cfg, sales_cfg, parquet_dims: Path, fact_out: Path):
     if is_csv:
         with stage("Generating BULK INSERT Scripts"):
             dims_csv = sorted(dims_out.glob("*.csv"))
-            facts_csv = sorted(facts_out.glob("*.csv"))
+            facts_csv = sorted(facts_out.glob("*.csv*"))
 
             if not dims_csv and not facts_csv:
                 skip("No CSV files found — skipping BULK INSERT scripts.")
@@ -165,6 +233,11 @@ def package_output(cfg, sales_cfg, parquet_dims: Path, fact_out: Path):
                     mode="legacy",
                     row_terminator="0x0a",
                 )
+                generate_bulk_insert_manifest(
+                    csv_folder=str(facts_out),
+                    table_name="Sales",
+                    output_file=str(final_folder / "bulk_insert_facts_manifest.json"),
+                )
 
         with stage("Generating CREATE TABLE Scripts"):
             generate_all_create_tables(
@@ -173,8 +246,13 @@ def package_output(cfg, sales_cfg, parquet_dims: Path, fact_out: Path):
                 output_folder=final_folder,
                 cfg=cfg,
                 skip_order_cols=sales_cfg.get("skip_order_cols", False),
+                local_currency=bool(
+                    (sales_cfg.get("local_currency") or {}).get("enabled", False)
+                ),
             )
     else:
         info("Skipping SQL script generation for non-CSV format.")
 
+    write_dataset_info(final_folder, cfg, sales_cfg, parquet_dims)
+
     return final_folder
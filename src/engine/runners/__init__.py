@@ -1,7 +1,9 @@
 from .dimensions_runner import generate_dimensions
 from .sales_runner import run_sales_pipeline
+from .append_runner import run_sales_append
 
 __all__ = [
     "generate_dimensions",
     "run_sales_pipeline",
+    "run_sales_append",
 ]
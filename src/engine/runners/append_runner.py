@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+import json
+import time
+import shutil
+from pathlib import Path
+from urllib.parse import unquote
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.utils.logging_utils import stage, info, skip, done
+from src.engine.dataset_info import (
+    DATASET_INFO_FILE,
+    load_dataset_info,
+    save_dataset_info,
+    dimension_versions,
+)
+from src.facts.sales.sales_logic.globals import bind_globals
+
+
+# =========================================================
+# Helpers
+# =========================================================
+
+def _find_latest_dataset(final_root: Path, file_format: str):
+    """
+    Return the most recently packaged dataset folder for file_format.
+    """
+    if not final_root.exists():
+        return None
+
+    candidates = []
+    for d in final_root.iterdir():
+        if not d.is_dir() or not (d / DATASET_INFO_FILE).exists():
+            continue
+        data = load_dataset_info(d)
+        if data and data.get("file_format") == file_format:
+            candidates.append(d)
+
+    if not candidates:
+        return None
+
+    return max(candidates, key=lambda d: (d / DATASET_INFO_FILE).stat().st_mtime)
+
+
+def _parquet_max_order_date(files):
+    """
+    Max OrderDate from Parquet row-group statistics (footer only).
+    Falls back to reading the column when statistics are missing.
+    """
+    best = None
+
+    for f in files:
+        pf = pq.ParquetFile(f)
+        idx = pf.schema_arrow.get_field_index("OrderDate")
+        if idx < 0:
+            raise RuntimeError(f"OrderDate missing from sales file: {f}")
+
+        md = pf.metadata
+        for rg in range(md.num_row_groups):
+            stats = md.row_group(rg).column(idx).statistics
+            if stats is not None and stats.has_min_max:
+                value = stats.max
+            else:
+                col = pf.read_row_group(rg, columns=["OrderDate"])["OrderDate"]
+                value = pc.max(col).as_py()
+
+            if value is not None and (best is None or value > best):
+                best = value
+
+    return best
+
+
+def _delta_active_files(table_path: Path):
+    """
+    Replay the JSON commit log of a Delta table and return its live files.
+
+    deltalake's DeltaTable cannot open tables under paths containing
+    spaces (packaged dataset names always do), so the log is read directly.
+    """
+    log_dir = table_path / "_delta_log"
+    if not log_dir.exists():
+        raise RuntimeError(f"Not a Delta table: {table_path}")
+
+    active = set()
+    for commit in sorted(log_dir.glob("*.json")):
+        for line in commit.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            action = json.loads(line)
+            if "add" in action:
+                active.add(unquote(action["add"]["path"]))
+            elif "remove" in action:
+                active.discard(unquote(action["remove"]["path"]))
+
+    return [table_path / p for p in sorted(active)]
+
+
+def _csv_max_order_date(files):
+    import pyarrow.csv as pacsv
+
+    best = None
+    for f in files:
+        # input_stream detects .gz / .zst chunk files
+        reader = pacsv.open_csv(
+            pa.input_stream(str(f)),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=["OrderDate"],
+                column_types={"OrderDate": pa.date32()},
+            ),
+        )
+        for batch in reader:
+            value = pc.max(batch.column(0)).as_py()
+            if value is not None and (best is None or value > best):
+                best = value
+
+    return best
+
+
+def _arrow_max_order_date(files):
+    best = None
+    for f in files:
+        with pa.memory_map(str(f)) as src:
+            reader = pa.ipc.open_file(src)
+            for i in range(reader.num_record_batches):
+                value = pc.max(reader.get_batch(i).column("OrderDate")).as_py()
+                if value is not None and (best is None or value > best):
+                    best = value
+    return best
+
+
+def _orc_max_order_date(files):
+    from pyarrow import orc
+
+    best = None
+    for f in files:
+        col = orc.read_table(str(f), columns=["OrderDate"])["OrderDate"]
+        value = pc.max(col).as_py()
+        if value is not None and (best is None or value > best):
+            best = value
+    return best
+
+
+def dataset_max_order_date(facts_folder: Path, file_format: str):
+    """
+    Return the current max OrderDate of a packaged Sales fact
+    as numpy datetime64[D] (None if the fact is empty).
+    """
+    facts_folder = Path(facts_folder)
+
+    if file_format == "parquet":
+        files = sorted(facts_folder.glob("*.parquet"))
+        files += sorted((facts_folder / "sales").rglob("*.parquet"))
+        value = _parquet_max_order_date(files)
+
+    elif file_format == "deltaparquet":
+        files = _delta_active_files(facts_folder / "sales")
+        value = _parquet_max_order_date(files)
+
+    elif file_format == "csv":
+        value = _csv_max_order_date(sorted(facts_folder.glob("*.csv*")))
+
+    elif file_format == "arrow":
+        value = _arrow_max_order_date(sorted(facts_folder.glob("*.arrow")))
+
+    elif file_format == "orc":
+        value = _orc_max_order_date(sorted(facts_folder.glob("*.orc")))
+
+    else:
+        raise ValueError(f"Unknown file_format: {file_format}")
+
+    if value is None:
+        return None
+    return np.datetime64(value, "D")
+
+
+def _check_dimensions_unchanged(dataset_info: dict, parquet_dims: Path):
+    """
+    Fail unless every dimension recorded for the dataset still has
+    the same version hash.
+    """
+    recorded = dataset_info.get("dimensions") or {}
+    current = dimension_versions(parquet_dims)
+
+    changed = sorted(
+        name for name, h in recorded.items()
+        if current.get(name) != h
+    )
+    if changed:
+        raise RuntimeError(
+            "Dimensions changed since the dataset was generated: "
+            f"{changed}. Regenerate the full dataset instead of appending."
+        )
+
+
+# =========================================================
+# Main Runner
+# =========================================================
+
+def run_sales_append(
+    sales_cfg,
+    fact_out,
+    parquet_dims,
+    cfg,
+    append_until,
+    dataset_folder=None,
+):
+    """
+    Extend an existing packaged Sales fact with new order dates.
+
+    Invariants:
+    - Only dates after the dataset's current max OrderDate are generated
+    - Seasonality and row density follow the original date window
+    - Upstream dimensions must be unchanged (version hash check)
+    - Existing files are never rewritten; new data is added as new
+      Parquet / CSV files or Delta commits
+    """
+    from src.facts.sales.sales import (
+        generate_sales_fact,
+        build_weighted_date_pool,
+    )
+
+    fact_out = Path(fact_out).resolve()
+    parquet_dims = Path(parquet_dims).resolve()
+    fmt = sales_cfg["file_format"].lower()
+
+    if fmt == "duckdb":
+        raise RuntimeError("Append is not supported for duckdb datasets")
+
+    # ------------------------------------------------------------
+    # Locate dataset
+    # ------------------------------------------------------------
+    if dataset_folder is None:
+        final_root = Path(unquote(str(cfg["final_output_folder"]))).resolve()
+        dataset_folder = _find_latest_dataset(final_root, fmt)
+        if dataset_folder is None:
+            raise RuntimeError(
+                f"No packaged {fmt} dataset found under {final_root} to append to"
+            )
+
+    dataset_folder = Path(dataset_folder).resolve()
+    dataset_info = load_dataset_info(dataset_folder)
+    if dataset_info is None:
+        raise RuntimeError(
+            f"{DATASET_INFO_FILE} not found in dataset: {dataset_folder}"
+        )
+
+    info(f"Appending to dataset: {dataset_folder}")
+
+    # ------------------------------------------------------------
+    # Validate compatibility
+    # ------------------------------------------------------------
+    if dataset_info["file_format"] != fmt:
+        raise RuntimeError(
+            f"Dataset format is {dataset_info['file_format']}, "
+            f"but sales.file_format is {fmt}"
+        )
+
+    skip_order_cols = bool(sales_cfg["skip_order_cols"])
+    if bool(dataset_info["skip_order_cols"]) != skip_order_cols:
+        raise RuntimeError(
+            "sales.skip_order_cols differs from the dataset being appended to"
+        )
+
+    _check_dimensions_unchanged(dataset_info, parquet_dims)
+
+    # ------------------------------------------------------------
+    # Resolve append window
+    # ------------------------------------------------------------
+    facts_folder = dataset_folder / "facts"
+    max_date = dataset_max_order_date(facts_folder, fmt)
+    if max_date is None:
+        raise RuntimeError(f"Dataset has no sales rows: {facts_folder}")
+
+    until = np.datetime64(str(append_until), "D")
+    window_start = max_date + np.timedelta64(1, "D")
+
+    if until < window_start:
+        skip(f"Dataset already covers {max_date}; nothing to append.")
+        return None
+
+    # ------------------------------------------------------------
+    # Row budget: keep the dataset's rows-per-weight density
+    # ------------------------------------------------------------
+    base_start = dataset_info["start_date"]
+
+    # Weights of the originally generated days must not move, so the
+    # pool is extended from the original end date (kept across appends)
+    base_end = dataset_info.get("base_end_date", dataset_info["end_date"])
+    date_pool, date_prob = build_weighted_date_pool(
+        base_start, str(until), base_end=base_end
+    )
+
+    covered = date_prob[date_pool <= max_date].sum()
+    window = date_prob[date_pool >= window_start].sum()
+
+    if covered <= 0:
+        raise RuntimeError("Dataset date window has no sales weight")
+
+    new_rows = int(round(dataset_info["total_rows"] * window / covered))
+
+    info(
+        f"Append window {window_start} .. {until}: "
+        f"{new_rows:,} new sales rows"
+    )
+
+    if new_rows <= 0:
+        skip("No sales rows fall into the append window.")
+        return None
+
+    # ------------------------------------------------------------
+    # Generate the window
+    # ------------------------------------------------------------
+    tag = (
+        f"{str(window_start).replace('-', '')}_"
+        f"{str(until).replace('-', '')}"
+    )
+    merged_file = f"sales_{tag}.parquet"
+
+    if fmt in ("csv", "parquet", "arrow", "orc"):
+        sales_out_folder = fact_out / fmt
+    else:  # deltaparquet: commit straight into the packaged table
+        sales_out_folder = facts_folder / "sales"
+
+    if fmt != "deltaparquet" and sales_out_folder.exists():
+        shutil.rmtree(sales_out_folder, ignore_errors=True)
+    sales_out_folder.mkdir(parents=True, exist_ok=True)
+
+    stage("Generating Sales (append)")
+    t0 = time.time()
+
+    bind_globals({
+        "skip_order_cols": skip_order_cols,
+    })
+
+    generate_sales_fact(
+        cfg,
+        parquet_folder=str(parquet_dims),
+        out_folder=str(sales_out_folder),
+        total_rows=new_rows,
+        file_format=fmt,
+        start_date=base_start,
+        end_date=str(until),
+        date_window=(window_start, until),
+        base_end_date=base_end,
+        # distinct, deterministic chunk seeds per append window
+        chunk_seed=int(window_start.astype("int64")) + 1,
+        delta_mode="append",
+        merge_parquet=True,
+        merged_file=merged_file,
+        row_group_size=sales_cfg.get("row_group_size", 2_000_000),
+        compression=sales_cfg.get("compression", "snappy"),
+        ipc_compression=sales_cfg.get("ipc_compression"),
+        csv_compression=sales_cfg.get("csv_compression"),
+        csv_target_size_mb=sales_cfg.get("csv_target_size_mb"),
+        chunk_size=sales_cfg.get("chunk_size", 1_000_000),
+        workers=sales_cfg.get("workers"),
+        partition_enabled=sales_cfg.get("partition_enabled", False),
+        partition_cols=sales_cfg.get("partition_cols", ["Year", "Month"]),
+        delta_output_folder=str(sales_out_folder),
+        skip_order_cols=skip_order_cols,
+    )
+
+    done(f"Generating Sales (append) completed in {time.time() - t0:.1f}s")
+
+    # ------------------------------------------------------------
+    # Add new files to the dataset
+    # ------------------------------------------------------------
+    with stage("Appending to Final Output Folder"):
+        if fmt in ("parquet", "arrow", "orc"):
+            # merged output keeps the merged_file stem with the format suffix
+            merged_name = Path(merged_file).with_suffix(f".{fmt}").name
+            src_file = sales_out_folder / merged_name
+            if not src_file.exists():
+                raise RuntimeError(f"Expected {fmt} file not found: {src_file}")
+            shutil.move(str(src_file), str(facts_folder / merged_name))
+            done(f"Sales fact appended: {merged_name}")
+
+        elif fmt == "csv":
+            csv_files = sorted(sales_out_folder.glob("*.csv*"))
+            for csv_file in csv_files:
+                target = facts_folder / f"sales_{tag}_{csv_file.name}"
+                if target.exists():
+                    raise RuntimeError(
+                        f"Duplicate CSV filename detected during append: "
+                        f"{target.name}"
+                    )
+                shutil.move(str(csv_file), str(target))
+            done(f"Sales fact appended: {len(csv_files)} CSV files")
+
+            from src.tools.sql.generate_bulk_insert_sql import (
+                generate_bulk_insert_script,
+                generate_bulk_insert_manifest,
+            )
+            generate_bulk_insert_script(
+                csv_folder=str(facts_folder),
+                table_name="Sales",
+                output_sql_file=str(dataset_folder / "bulk_insert_facts.sql"),
+                mode="legacy",
+                row_terminator="0x0a",
+            )
+            generate_bulk_insert_manifest(
+                csv_folder=str(facts_folder),
+                table_name="Sales",
+                output_file=str(dataset_folder / "bulk_insert_facts_manifest.json"),
+            )
+
+        else:
+            # deltalake leaves an empty URL-encoded twin (%20) next to
+            # dataset folders with spaces; remove it like packaging does
+            for sibling in dataset_folder.parent.iterdir():
+                if (
+                    sibling.is_dir()
+                    and "%20" in sibling.name
+                    and unquote(sibling.name) == dataset_folder.name
+                ):
+                    shutil.rmtree(sibling)
+
+            done("Sales fact appended (Delta commit).")
+
+        dataset_info["base_end_date"] = base_end
+        dataset_info["end_date"] = str(until)
+        dataset_info["total_rows"] = int(dataset_info["total_rows"]) + new_rows
+        save_dataset_info(dataset_folder, dataset_info)
+
+    return dataset_folder
@@ -1,6 +1,10 @@
 # ---------------------------------------------------------
 #  DIMENSIONS ORCHESTRATOR (CLEAN + DATE-AWARE)
 # ---------------------------------------------------------
+import time
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Set, Optional
 
@@ -15,7 +19,13 @@ from src.dimensions.products.products import (
     generate_product_dimension as run_products
 )
 
-from src.utils.logging_utils import done, skip
+from src.versioning.dimension_cache import (
+    DimensionCache,
+    code_version,
+    dimension_key,
+)
+from src.utils.logging_utils import done, skip, fmt_sec
+from src.utils.mp_utils import set_thread_idle, thread_idle
 
 
 # =========================================================
@@ -76,57 +86,80 @@ def _should_force(dim: str, force_regenerate: Set[str]) -> bool:
 
 
 # =========================================================
-# Main Orchestrator
+# Dependency graph
 # =========================================================
 
-def generate_dimensions(
-    cfg: Dict[str, Any],
-    parquet_dims_folder: Path,
-    force_regenerate: Optional[Set[str]] = None,
-):
-    """
-    Orchestrates dimension generation in correct dependency order.
+# name -> dimensions whose parquet must exist before it runs
+DIMENSION_DEPENDENCIES = {
+    "geography": (),
+    "customers": ("geography",),
+    "stores": ("geography",),
+    "promotions": (),
+    "products": (),
+    "dates": (),
+    "currency": (),
+    "exchange_rates": (),
+}
 
-    Guarantees:
-    - Date-dependent dimensions regenerate when defaults.dates change
-    - Non-date-dependent dimensions are isolated from date changes
-    - Dependency order is strictly preserved
-    - Forced regeneration is runtime-only (no config mutation)
-    """
-    force_regenerate = force_regenerate or set()
+# Config sections each generator reads (hashed into its cache key)
+DIMENSION_CONFIG_SECTIONS = {
+    "geography": ("geography",),
+    "customers": ("customers",),
+    "stores": ("stores",),
+    "promotions": ("promotions",),
+    "products": ("products",),
+    "dates": ("dates",),
+    "currency": ("currency", "exchange_rates"),
+    "exchange_rates": ("exchange_rates",),
+}
 
-    parquet_dims_folder = Path(parquet_dims_folder).resolve()
-    parquet_dims_folder.mkdir(parents=True, exist_ok=True)
+# Generators that also depend on defaults.dates
+DATE_DEPENDENT = {"stores", "promotions", "dates", "currency", "exchange_rates"}
 
-    global_dates = _get_defaults_dates(cfg)
+# Parquet files written per generator (stems in parquet_dims)
+DIMENSION_OUTPUTS = {
+    "products": ("products", "product_category", "product_subcategory"),
+}
+
+# Dimensions read by the sales fact generator (load_sales_dimensions)
+SALES_DIMENSIONS = (
+    "geography",
+    "customers",
+    "stores",
+    "promotions",
+    "products",
+    "currency",
+)
 
-    # -----------------------------------------------------
-    # 1. Geography
-    # -----------------------------------------------------
+
+# =========================================================
+# Steps
+# =========================================================
+
+def _run_geography(cfg, folder, force_regenerate, global_dates):
     run_geography(
         _cfg_for_dimension(
             cfg,
             "geography",
             _should_force("geography", force_regenerate),
         ),
-        parquet_dims_folder,
+        folder,
     )
 
-    # -----------------------------------------------------
-    # 2. Customers  ✅ FIXED
-    # -----------------------------------------------------
+
+def _run_customers(cfg, folder, force_regenerate, global_dates):
     run_customers(
         _cfg_for_dimension(
             cfg,
             "customers",
             _should_force("customers", force_regenerate),
         ),
-        parquet_dims_folder,
+        folder,
     )
 
-    # -----------------------------------------------------
-    # 3. Stores (date-dependent)
-    # -----------------------------------------------------
+
+def _run_stores(cfg, folder, force_regenerate, global_dates):
+    # date-dependent
     cfg_stores = _cfg_with_global_dates(cfg, "stores", global_dates)
     run_stores(
         _cfg_for_dimension(
@@ -134,12 +167,12 @@ def generate_dimensions(
             "stores",
             _should_force("stores", force_regenerate),
         ),
-        parquet_dims_folder,
+        folder,
     )
 
-    # -----------------------------------------------------
-    # 4. Promotions (date-dependent)
-    # -----------------------------------------------------
+
+def _run_promotions(cfg, folder, force_regenerate, global_dates):
+    # date-dependent
     cfg_promotions = _cfg_with_global_dates(cfg, "promotions", global_dates)
     run_promotions(
         _cfg_for_dimension(
@@ -147,19 +180,19 @@ def generate_dimensions(
             "promotions",
             _should_force("promotions", force_regenerate),
         ),
-        parquet_dims_folder,
+        folder,
     )
 
-    # -----------------------------------------------------
-    # 5. Products (static)
-    # -----------------------------------------------------
+
+def _run_products(cfg, folder, force_regenerate, global_dates):
+    # static
     products = run_products(
         _cfg_for_dimension(
             cfg,
             "products",
             _should_force("products", force_regenerate),
         ),
-        parquet_dims_folder,
+        folder,
     )
 
     if products.get("_regenerated"):
@@ -167,9 +200,9 @@ def generate_dimensions(
     else:
         skip("Product Dimension up-to-date; skipping.")
 
-    # -----------------------------------------------------
-    # 6. Dates (date-dependent)
-    # -----------------------------------------------------
+
+def _run_dates(cfg, folder, force_regenerate, global_dates):
+    # date-dependent
     cfg_dates = _cfg_with_global_dates(cfg, "dates", global_dates)
     run_dates(
         _cfg_for_dimension(
@@ -177,12 +210,12 @@ def generate_dimensions(
             "dates",
             _should_force("dates", force_regenerate),
         ),
-        parquet_dims_folder,
+        folder,
     )
 
-    # -----------------------------------------------------
-    # 7. Currency (date-dependent)
-    # -----------------------------------------------------
+
+def _run_currency(cfg, folder, force_regenerate, global_dates):
+    # date-dependent
     cfg_currency = _cfg_with_global_dates(cfg, "currency", global_dates)
     run_currency(
         _cfg_for_dimension(
@@ -190,12 +223,12 @@ def generate_dimensions(
             "currency",
             _should_force("currency", force_regenerate),
         ),
-        parquet_dims_folder,
+        folder,
     )
 
-    # -----------------------------------------------------
-    # 8. Exchange Rates (date-dependent)
-    # -----------------------------------------------------
+
+def _run_exchange_rates(cfg, folder, force_regenerate, global_dates):
+    # date-dependent
     cfg_fx = _cfg_with_global_dates(cfg, "exchange_rates", global_dates)
     run_exchange_rates(
         _cfg_for_dimension(
@@ -203,5 +236,275 @@ def generate_dimensions(
             "exchange_rates",
             _should_force("exchange_rates", force_regenerate),
         ),
-        parquet_dims_folder,
+        folder,
     )
+
+
+_DIMENSION_STEPS = {
+    "geography": _run_geography,
+    "customers": _run_customers,
+    "stores": _run_stores,
+    "promotions": _run_promotions,
+    "products": _run_products,
+    "dates": _run_dates,
+    "currency": _run_currency,
+    "exchange_rates": _run_exchange_rates,
+}
+
+
+# Generator entry points (their source is the "code version" of the cache key)
+_GENERATORS = {
+    "geography": run_geography,
+    "customers": run_customers,
+    "stores": run_stores,
+    "promotions": run_promotions,
+    "products": run_products,
+    "dates": run_dates,
+    "currency": run_currency,
+    "exchange_rates": run_exchange_rates,
+}
+
+
+def _generator_sources(name):
+    path = Path(inspect.getsourcefile(_GENERATORS[name]))
+    if path.parent.name == "dimensions":
+        return [path]
+    # package-based generators (products): every module in the package
+    return sorted(path.parent.glob("*.py"))
+
+
+def _dimension_keys(cfg, global_dates, order):
+    keys = {}
+    for name in order:
+        sections = {sec: cfg.get(sec, {}) for sec in DIMENSION_CONFIG_SECTIONS[name]}
+        # Parallelism settings never change a variant's content
+        sections = {
+            sec: {k: v for k, v in val.items() if k != "workers"}
+            if isinstance(val, dict) else val
+            for sec, val in sections.items()
+        }
+        if name in DATE_DEPENDENT:
+            sections["global_dates"] = global_dates
+        keys[name] = dimension_key(
+            name,
+            sections,
+            {dep: keys[dep] for dep in DIMENSION_DEPENDENCIES[name]},
+            code_version(_generator_sources(name)),
+        )
+    return keys
+
+
+def _cached_step(name, step, cache, key, cfg, folder, force_regenerate, global_dates):
+    """
+    Resolve a dimension from the cache, or generate and cache it.
+
+    A miss regenerates even if the generator's own version file says
+    the parquet is current when parquet_dims holds a different variant
+    (e.g. its upstream geography changed).
+    """
+    outputs = DIMENSION_OUTPUTS.get(name, (name,))
+    forced = _should_force(name, force_regenerate)
+
+    if not forced:
+        current = cache.current_key(folder, name)
+        if current == key and all(
+            (folder / f"{stem}.parquet").exists() for stem in outputs
+        ):
+            cache.touch(name, key)
+            skip(f"{name}: cached variant {key[:12]} already in place")
+            return
+        if cache.restore(name, key, folder, outputs):
+            done(f"{name}: restored cached variant {key[:12]}")
+            return
+        if current is not None:
+            force_regenerate = set(force_regenerate) | {name}
+
+    step(cfg, folder, force_regenerate, global_dates)
+    cache.store(name, key, folder, outputs)
+
+
+def _topological_order(dependencies):
+    order, seen = [], set()
+
+    def visit(name, path=()):
+        if name in seen:
+            return
+        if name in path:
+            raise RuntimeError(f"Dimension dependency cycle: {' -> '.join(path + (name,))}")
+        for dep in dependencies[name]:
+            visit(dep, path + (name,))
+        seen.add(name)
+        order.append(name)
+
+    for name in dependencies:
+        visit(name)
+    return order
+
+
+# =========================================================
+# Scheduler
+# =========================================================
+
+class DimensionScheduler:
+    """
+    Runs dimension generators on a thread pool, each as soon as its
+    dependencies have finished.
+
+    Tasks are submitted in topological order and a task waits on its
+    dependencies' futures, so a pool of any size cannot deadlock: every
+    dependency is dequeued before its dependents.
+
+    Worker threads are marked idle (see mp_utils.pool_context) whenever
+    they are not running a generator, and the thread pool is shut down
+    as soon as the last dimension finishes, so process pools started
+    meanwhile (customers shards, overlapped Sales) can still fork.
+    """
+
+    def __init__(self, steps, dependencies, workers=None):
+        self._t0 = time.time()
+        self._futures = {}
+        self._elapsed = {}
+        self._finished = {}
+        self._dependencies = dependencies
+        self._closed = False
+        self._ready = None
+
+        order = _topological_order(dependencies)
+        self._remaining = len(order)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, int(workers or len(order))),
+            thread_name_prefix="dimension",
+        )
+
+        for name in order:
+            deps = [self._futures[d] for d in dependencies[name]]
+            self._futures[name] = self._pool.submit(
+                self._run, name, steps[name], deps
+            )
+
+        for future in self._futures.values():
+            future.add_done_callback(self._on_done)
+
+    def _run(self, name, step, deps):
+        with thread_idle():
+            for dep in deps:
+                dep.result()  # re-raises a failed dependency
+        t0 = time.time()
+        try:
+            step()
+        finally:
+            # Back to the executor queue: parked until the next task
+            set_thread_idle(True)
+        self._elapsed[name] = time.time() - t0
+        self._finished[name] = time.time() - self._t0
+
+    def _on_done(self, future):
+        with self._lock:
+            self._remaining -= 1
+            if self._remaining:
+                return
+            self._ready = time.time()
+
+        # Let the idle worker threads exit now instead of at wait_all()
+        self._pool.shutdown(wait=False)
+
+    def wait(self, names):
+        """Block until the named dimensions exist; re-raise the first failure."""
+        with thread_idle():
+            for name in names:
+                self._futures[name].result()
+
+    def wait_all(self):
+        if self._closed:
+            return
+        try:
+            self.wait(self._futures)
+        finally:
+            self._pool.shutdown(wait=True)
+            self._closed = True
+
+        done(
+            f"Dimensions ready in {fmt_sec(self._ready - self._t0)} "
+            f"({fmt_sec(sum(self._elapsed.values()))} of generator time; "
+            f"critical path: {' -> '.join(self.critical_path())})"
+        )
+
+    def critical_path(self):
+        """Chain of dimensions that finished last, following latest dependencies."""
+        if not self._finished:
+            return []
+        path = [max(self._finished, key=self._finished.get)]
+        while self._dependencies[path[-1]]:
+            path.append(
+                max(self._dependencies[path[-1]], key=self._finished.get)
+            )
+        return path[::-1]
+
+
+# =========================================================
+# Main Orchestrator
+# =========================================================
+
+def generate_dimensions(
+    cfg: Dict[str, Any],
+    parquet_dims_folder: Path,
+    force_regenerate: Optional[Set[str]] = None,
+    workers: Optional[int] = None,
+    wait: bool = True,
+):
+    """
+    Orchestrates dimension generation along DIMENSION_DEPENDENCIES.
+
+    Guarantees:
+    - Date-dependent dimensions regenerate when defaults.dates change
+    - Non-date-dependent dimensions are isolated from date changes
+    - A dimension only starts after its dependencies; independent
+      generators run concurrently (workers=1 runs them one by one)
+    - Forced regeneration is runtime-only (no config mutation)
+    - With dimension_cache.enabled, known variants are restored from the
+      cache instead of regenerated
+
+    wait=False returns the running DimensionScheduler, so callers can
+    start on a subset (scheduler.wait(SALES_DIMENSIONS)) and call
+    scheduler.wait_all() before using the rest.
+    """
+    force_regenerate = force_regenerate or set()
+
+    parquet_dims_folder = Path(parquet_dims_folder).resolve()
+    parquet_dims_folder.mkdir(parents=True, exist_ok=True)
+
+    global_dates = _get_defaults_dates(cfg)
+
+    cache = DimensionCache.from_config(cfg)
+
+    if cache is None:
+        steps = {
+            name: (
+                lambda step=step: step(
+                    cfg, parquet_dims_folder, force_regenerate, global_dates
+                )
+            )
+            for name, step in _DIMENSION_STEPS.items()
+        }
+    else:
+        keys = _dimension_keys(
+            cfg, global_dates, _topological_order(DIMENSION_DEPENDENCIES)
+        )
+        steps = {
+            name: (
+                lambda name=name, step=step: _cached_step(
+                    name, step, cache, keys[name],
+                    cfg, parquet_dims_folder, force_regenerate, global_dates,
+                )
+            )
+            for name, step in _DIMENSION_STEPS.items()
+        }
+
+    scheduler = DimensionScheduler(steps, DIMENSION_DEPENDENCIES, workers=workers)
+
+    if not wait:
+        return scheduler
+
+    scheduler.wait_all()
+    return None
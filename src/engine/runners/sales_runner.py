@@ -9,10 +9,14 @@ from src.engine.packaging import package_output
 from src.facts.sales.sales_logic.globals import bind_globals
 
 
-def run_sales_pipeline(sales_cfg, fact_out, parquet_dims, cfg):
+def run_sales_pipeline(sales_cfg, fact_out, parquet_dims, cfg, dimensions=None):
     """
     Run the sales fact pipeline.
 
+    dimensions: optional running DimensionScheduler. Sales starts once
+    SALES_DIMENSIONS are ready; the remaining dimensions (dates,
+    exchange rates) are awaited before packaging.
+
     Invariants:
     - Sales schema is determined entirely by sales_cfg
     - No implicit defaults override config
@@ -35,23 +39,27 @@ def run_sales_pipeline(sales_cfg, fact_out, parquet_dims, cfg):
     # ------------------------------------------------------------
     fmt = sales_cfg["file_format"].lower()
 
-    if fmt == "csv":
-        sales_out_folder = fact_out / "csv"
-    elif fmt == "parquet":
-        sales_out_folder = fact_out / "parquet"
+    if fmt in ("csv", "parquet", "arrow", "orc", "duckdb"):
+        sales_out_folder = fact_out / fmt
     else:  # deltaparquet
         sales_out_folder = fact_out / "sales"
 
     # ------------------------------------------------------------
     # IMPORTANT: clean output folders ONLY where safe
     # ------------------------------------------------------------
-    # CSV and Delta must be regenerated every run
+    # CSV / Delta / Arrow / ORC / DuckDB must be regenerated every run
     # Parquet must NOT be deleted before packaging
     if fmt != "parquet" and sales_out_folder.exists():
         shutil.rmtree(sales_out_folder, ignore_errors=True)
 
     sales_out_folder.mkdir(parents=True, exist_ok=True)
 
+    # ProductPriceHistory is a sales-side output packaged with the
+    # dimensions; never written into parquet_dims
+    price_history_out = fact_out / "price_history"
+    if price_history_out.exists():
+        shutil.rmtree(price_history_out, ignore_errors=True)
+
     # ------------------------------------------------------------
     # Validate critical config early
     # ------------------------------------------------------------
@@ -62,11 +70,28 @@ def run_sales_pipeline(sales_cfg, fact_out, parquet_dims, cfg):
 
     skip_order_cols = bool(sales_cfg["skip_order_cols"])
 
+    ipc_compression = sales_cfg.get("ipc_compression")
+    if ipc_compression not in (None, "lz4", "zstd"):
+        raise ValueError(
+            "sales.ipc_compression must be null, 'lz4' or 'zstd'"
+        )
+
+    csv_compression = sales_cfg.get("csv_compression")
+    if csv_compression not in (None, "gzip", "zstd"):
+        raise ValueError(
+            "sales.csv_compression must be null, 'gzip' or 'zstd'"
+        )
+
     # ------------------------------------------------------------
     # Run sales fact generation
     # ------------------------------------------------------------
     from src.facts.sales.sales import generate_sales_fact
 
+    if dimensions is not None:
+        from src.engine.runners.dimensions_runner import SALES_DIMENSIONS
+
+        dimensions.wait(SALES_DIMENSIONS)
+
     stage("Generating Sales")
     t0 = time.time()
 
@@ -89,12 +114,19 @@ def run_sales_pipeline(sales_cfg, fact_out, parquet_dims, cfg):
         # existing args
         row_group_size=sales_cfg.get("row_group_size", 2_000_000),
         compression=sales_cfg.get("compression", "snappy"),
+        ipc_compression=ipc_compression,
+        csv_compression=csv_compression,
+        csv_target_size_mb=sales_cfg.get("csv_target_size_mb"),
+        duckdb_sort_by_order_date=bool(
+            (sales_cfg.get("duckdb") or {}).get("sort_by_order_date", False)
+        ),
         chunk_size=sales_cfg.get("chunk_size", 1_000_000),
         workers=sales_cfg.get("workers"),
         partition_enabled=sales_cfg.get("partition_enabled", False),
         partition_cols=sales_cfg.get("partition_cols", ["Year", "Month"]),
         delta_output_folder=str(sales_out_folder),
         skip_order_cols=skip_order_cols,
+        price_history_folder=str(price_history_out),
     )
 
     done(f"Generating Sales completed in {time.time() - t0:.1f}s")
@@ -102,6 +134,9 @@ def run_sales_pipeline(sales_cfg, fact_out, parquet_dims, cfg):
     # ------------------------------------------------------------
     # Packaging (consumes Parquet output)
     # ------------------------------------------------------------
+    if dimensions is not None:
+        dimensions.wait_all()
+
     t1 = time.time()
     package_output(cfg, sales_cfg, parquet_dims, fact_out)
     done(f"Creating Final Output Folder completed in {time.time() - t1:.1f}s")
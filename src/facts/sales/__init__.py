@@ -1,3 +1,8 @@
-from .sales import generate_sales_fact
+from .sales import generate_sales_fact, load_sales_dimensions
+from .sales_stream import iter_sales_batches
 
-__all__ = ["generate_sales_fact"]
+__all__ = [
+    "generate_sales_fact",
+    "load_sales_dimensions",
+    "iter_sales_batches",
+]
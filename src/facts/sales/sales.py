@@ -2,12 +2,26 @@ import os
 import glob
 import numpy as np
 import pandas as pd
-from multiprocessing import Pool, cpu_count
+from multiprocessing import cpu_count
 from math import ceil
 
 from src.utils.logging_utils import info, work, skip, done
+from src.utils.output_utils import write_batches
+from src.utils.mp_utils import pool_context
+from src.engine.dimension_loader import DimensionHandle
 from .sales_worker import init_sales_worker, _worker_task
-from .sales_writer import merge_parquet_files
+from .sales_logic.product_store import ProductStore
+from .sales_logic.lifecycle import LifecycleIndex, day_numbers
+from .sales_logic.locality import LEVELS
+from .sales_logic.popularity import popularity_weights
+from .sales_logic.price_history import PRICE_HISTORY_SCHEMA, PriceHistory
+from .sales_logic.fx import FxRates
+from .sales_writer import (
+    merge_parquet_files,
+    merge_arrow_files,
+    merge_orc_files,
+    orc_compression,
+)
 
 
 # =====================================================================
@@ -20,14 +34,15 @@ def ensure_dir(path: str):
 
 def load_parquet_column(path: str, col: str):
     """
-    Load a single parquet column as numpy array.
-    Kept as pandas for compatibility and dtype safety.
+    Load a single parquet column as numpy array (projected read).
     """
-    return pd.read_parquet(path, columns=[col])[col].values
+    name = os.path.splitext(os.path.basename(path))[0]
+    return DimensionHandle(name, path).numpy(col)
 
 
 def load_parquet_df(path: str, cols=None):
-    return pd.read_parquet(path, columns=cols)
+    name = os.path.splitext(os.path.basename(path))[0]
+    return DimensionHandle(name, path).pandas(cols)
 
 
 def build_weighted_customers(keys, pct, mult, seed=42):
@@ -51,25 +66,16 @@ def build_weighted_customers(keys, pct, mult, seed=42):
     return arr
 
 
-def build_weighted_date_pool(start, end, seed=42):
-    """
-    Build a weighted daily date pool with realistic seasonality.
-    """
-    rng = np.random.default_rng(seed)
-
-    dates = pd.date_range(start, end, freq="D")
-    n = len(dates)
-
+def _seasonal_weights(dates, first_year, noise, blackout_draws, blackout_rate):
+    """Unnormalized daily weights; noise / blackout_draws are per-day draws."""
     years = dates.year.values
     months = dates.month.values
     weekdays = dates.weekday.values
     doy = dates.dayofyear.values
 
     # Year growth
-    unique_years = np.unique(years)
-    year_idx = {y: i for i, y in enumerate(unique_years)}
     growth = 1.08
-    yw = np.array([growth ** year_idx[y] for y in years])
+    yw = np.array([growth ** int(y - first_year) for y in years])
 
     # Month seasonality
     month_weights = {
@@ -83,12 +89,12 @@ def build_weighted_date_pool(start, end, seed=42):
     wdw = np.array([weekday_weights[d] for d in weekdays])
 
     # Promotional spikes
-    spike = np.ones(n)
+    spike = np.ones(len(dates))
     for s, e, f in [(140,170,1.28),(240,260,1.35),(310,350,1.72)]:
         spike[(doy >= s) & (doy <= e)] *= f
 
     # One-off trends
-    ot = np.ones(n)
+    ot = np.ones(len(dates))
     for a, b, f in [
         ("2021-06-01","2021-10-31",0.70),
         ("2023-02-01","2023-08-31",1.40)
@@ -96,13 +102,53 @@ def build_weighted_date_pool(start, end, seed=42):
         mask = (dates >= a) & (dates <= b)
         ot[mask] *= f
 
-    noise = rng.uniform(0.95, 1.05, size=n)
-
     weights = yw * mw * wdw * spike * ot * noise
 
     # Random blackout days
-    blackout = rng.random(n) < rng.uniform(0.10, 0.18)
-    weights[blackout] = 0
+    weights[blackout_draws < blackout_rate] = 0
+    return weights
+
+
+def build_weighted_date_pool(start, end, seed=42, base_end=None):
+    """
+    Build a weighted daily date pool with realistic seasonality.
+
+    base_end: end date of the originally generated range when extending
+    it (append mode). Days up to base_end keep exactly the weights of
+    build_weighted_date_pool(start, base_end, seed); later days draw
+    their noise / blackouts from a separate stream, one (noise, blackout)
+    pair per day, so a longer extension never changes earlier days.
+    """
+    rng = np.random.default_rng(seed)
+
+    first_year = pd.Timestamp(start).year
+    if base_end is None or pd.Timestamp(base_end) >= pd.Timestamp(end):
+        base_end = end
+
+    dates = pd.date_range(start, base_end, freq="D")
+    n = len(dates)
+
+    noise = rng.uniform(0.95, 1.05, size=n)
+    blackout_draws = rng.random(n)
+    blackout_rate = rng.uniform(0.10, 0.18)
+    weights = _seasonal_weights(
+        dates, first_year, noise, blackout_draws, blackout_rate
+    )
+
+    ext = pd.date_range(
+        pd.Timestamp(base_end) + pd.Timedelta(days=1), end, freq="D"
+    )
+    if len(ext):
+        draws = np.random.default_rng([seed, 1]).random((len(ext), 2))
+        ext_weights = _seasonal_weights(
+            ext,
+            first_year,
+            0.95 + 0.1 * draws[:, 0],
+            draws[:, 1],
+            blackout_rate,
+        )
+        dates = dates.append(ext)
+        weights = np.concatenate([weights, ext_weights])
 
     weights /= weights.sum()
 
@@ -123,39 +169,10 @@ def batch_tasks(tasks, batch_size):
     ]
 
 
-# =====================================================================
-# Main Fact Generation
-# =====================================================================
-
-def generate_sales_fact(
-    cfg,
-    parquet_folder,
-    out_folder,
-    total_rows,
-    chunk_size=2_000_000,
-    start_date=None,
-    end_date=None,
-    row_group_size=2_000_000,
-    compression="snappy",
-    merge_parquet=False,
-    merged_file="sales.parquet",
-    delete_chunks=False,
-    heavy_pct=5,
-    heavy_mult=5,
-    seed=42,
-    file_format="parquet",
-    workers=None,
-    tune_chunk=False,
-    write_delta=False,   # legacy (ignored)
-    delta_output_folder=None,
-    skip_order_cols=False,
-    write_pyarrow=True,
-    partition_enabled=False,
-    partition_cols=None
-):
-    # ------------------------------------------------------------
-    # Resolve dates
-    # ------------------------------------------------------------
+def resolve_sales_dates(cfg, start_date=None, end_date=None):
+    """
+    Resolve the sales date window (explicit values win over defaults.dates).
+    """
     if start_date is None or end_date is None:
         defaults_section = cfg.get("defaults") or cfg.get("_defaults")
         if not defaults_section or "dates" not in defaults_section:
@@ -164,34 +181,308 @@ def generate_sales_fact(
         start_date = defaults["start"]
         end_date = defaults["end"]
 
-    # ------------------------------------------------------------
-    # Delta setup
-    # ------------------------------------------------------------
-    if file_format == "deltaparquet":
-        if delta_output_folder is None:
-            delta_output_folder = os.path.join(out_folder, "delta")
-        delta_output_folder = os.path.abspath(delta_output_folder)
-        ensure_dir(delta_output_folder)
-        ensure_dir(os.path.join(delta_output_folder, "_tmp_parts"))
+    return start_date, end_date
 
-    ensure_dir(out_folder)
 
-    # ------------------------------------------------------------
-    # Load dimensions
-    # ------------------------------------------------------------
-    customers_raw = load_parquet_column(
-        os.path.join(parquet_folder, "customers.parquet"),
-        "CustomerKey",
+def build_chunk_tasks(total_rows, chunk_size, master_seed):
+    """
+    Split total_rows into (idx, batch_size, seed) chunk tasks.
+    """
+    rng_master = np.random.default_rng(master_seed)
+    total_chunks = ceil(total_rows / chunk_size)
+    seeds = rng_master.integers(1, 1 << 30, size=total_chunks)
+
+    tasks = []
+    remaining = total_rows
+    for idx, s in enumerate(seeds):
+        if remaining <= 0:
+            break
+        batch = min(chunk_size, remaining)
+        tasks.append((idx, batch, int(s)))
+        remaining -= batch
+
+    return tasks
+
+
+# =====================================================================
+# Dimension loading
+# =====================================================================
+
+def build_store_sampler(parquet_folder, store_lifecycle=None):
+    """
+    LifecycleIndex over stores from sales.store_lifecycle, or None
+    (uniform store sampling) when disabled.
+    """
+    lifecycle_cfg = store_lifecycle or {}
+    if not lifecycle_cfg.get("enabled", False):
+        return None
+
+    return LifecycleIndex.from_parquet(
+        os.path.join(str(parquet_folder), "stores.parquet"),
+        "StoreKey",
+        "OpeningDate",
+        "ClosingDate",
+        weight_column=lifecycle_cfg.get("weight_column"),
+        label="store",
     )
-    customers = build_weighted_customers(
-        customers_raw, heavy_pct, heavy_mult, seed
-    ).astype(np.int64)
 
-    prod_df = load_parquet_df(
-        os.path.join(parquet_folder, "products.parquet"),
-        ["ProductKey", "UnitPrice", "UnitCost"],
+
+def build_customer_sampler(path, customers, pool_idx, customer_lifecycle=None):
+    """
+    LifecycleIndex over the heavy-user expanded customer pool from
+    sales.customer_lifecycle, or None (uniform pool sampling) when
+    disabled. pool_idx maps pool entries to customers.parquet rows, so
+    heavy users keep their extra draw slots inside their active window.
+    """
+    lifecycle_cfg = customer_lifecycle or {}
+    if not lifecycle_cfg.get("enabled", False):
+        return None
+
+    handle = DimensionHandle("customers", path)
+    if "CustomerStartDate" not in handle.columns:
+        raise ValueError(
+            "sales.customer_lifecycle requires customers.lifecycle.enabled "
+            "(CustomerStartDate / CustomerEndDate)"
+        )
+
+    table = handle.arrow(["CustomerStartDate", "CustomerEndDate"])
+    return LifecycleIndex(
+        customers,
+        day_numbers(table["CustomerStartDate"])[pool_idx],
+        day_numbers(table["CustomerEndDate"])[pool_idx],
+        label="customer",
+    )
+
+
+def load_locality_inputs(parquet_folder, locality=None, store_lifecycle=None):
+    """
+    Raw arrays for StoreLocality from sales.locality, or None when
+    disabled. The dense / CSR lookups are built in init_sales_worker.
+    """
+    locality_cfg = locality or {}
+    if not locality_cfg.get("enabled", False):
+        return None
+
+    level = locality_cfg.get("level", "country")
+    if level not in LEVELS:
+        raise ValueError(f"sales.locality.level must be one of {list(LEVELS)}")
+    local_pct = float(locality_cfg.get("local_pct", 85))
+    if not 0 <= local_pct <= 100:
+        raise ValueError("sales.locality.local_pct must be between 0 and 100")
+
+    parquet_folder = str(parquet_folder)
+    handle = lambda name: DimensionHandle(
+        name, os.path.join(parquet_folder, f"{name}.parquet")
+    )
+
+    lifecycle = (store_lifecycle or {}).get("enabled", False)
+    store_cols = ["StoreKey", "GeographyKey", "StoreType"]
+    if lifecycle:
+        store_cols += ["OpeningDate", "ClosingDate"]
+
+    customers = handle("customers").arrow(["CustomerKey", "GeographyKey"])
+    stores = handle("stores").arrow(store_cols)
+    geo = handle("geography").arrow(["GeographyKey", "Country"])
+
+    if level == "country":
+        _, geo_region = np.unique(
+            geo["Country"].to_numpy(zero_copy_only=False), return_inverse=True
+        )
+    else:
+        geo_region = np.arange(geo.num_rows)
+
+    inputs = dict(
+        customer_keys=customers["CustomerKey"].to_numpy(),
+        customer_geo=customers["GeographyKey"].to_numpy(),
+        store_keys=stores["StoreKey"].to_numpy(),
+        store_geo=stores["GeographyKey"].to_numpy(),
+        store_online=stores["StoreType"].to_numpy(zero_copy_only=False) == "Online",
+        geo_keys=geo["GeographyKey"].to_numpy(),
+        geo_region=geo_region,
+        local_pct=local_pct,
+    )
+    if lifecycle:
+        inputs.update(
+            store_start=day_numbers(stores["OpeningDate"]),
+            store_end=day_numbers(stores["ClosingDate"]),
+        )
+    return inputs
+
+
+def load_basket_inputs(parquet_folder, basket_affinity=None):
+    """
+    Subcategory -> category map and weights for BasketAffinity from
+    sales.basket_affinity, or None when disabled. The affinity matrix
+    and alias tables are built in init_sales_worker.
+    """
+    basket_cfg = basket_affinity or {}
+    if not basket_cfg.get("enabled", False):
+        return None
+
+    subcategories = DimensionHandle(
+        "product_subcategory",
+        os.path.join(str(parquet_folder), "product_subcategory.parquet"),
+    ).arrow(["ProductSubcategoryKey", "CategoryKey"])
+
+    return dict(
+        subcategory_keys=subcategories["ProductSubcategoryKey"].to_numpy(),
+        category_keys=subcategories["CategoryKey"].to_numpy(),
+        same_subcategory=float(basket_cfg.get("same_subcategory", 0.35)),
+        same_category=float(basket_cfg.get("same_category", 0.40)),
+        other=float(basket_cfg.get("other", 0.25)),
+        pairs=[list(p) for p in basket_cfg.get("pairs") or []],
+    )
+
+
+def load_product_popularity(parquet_folder, product_store, product_popularity=None, seed=42):
+    """
+    Per-product demand weights from sales.product_popularity, or None
+    (uniform products) when disabled. The alias table is compiled in
+    init_sales_worker.
+    """
+    pop_cfg = product_popularity or {}
+    if not pop_cfg.get("enabled", False):
+        return None
+
+    class_weights = pop_cfg.get("class_weights") or {}
+    subcategory_weights = pop_cfg.get("subcategory_weights") or {}
+    if subcategory_weights and product_store.subcategory_keys is None:
+        raise ValueError(
+            "sales.product_popularity.subcategory_weights requires "
+            "SubcategoryKey in products.parquet"
+        )
+
+    classes = None
+    if class_weights:
+        classes = DimensionHandle(
+            "products", os.path.join(str(parquet_folder), "products.parquet")
+        ).arrow(["Class"])["Class"].to_numpy(zero_copy_only=False)
+
+    return popularity_weights(
+        len(product_store),
+        zipf_exponent=pop_cfg.get("zipf_exponent"),
+        unit_price=product_store.unit_price,
+        price_exponent=float(pop_cfg.get("price_exponent") or 0.0),
+        classes=classes,
+        class_weights=class_weights,
+        subcategories=product_store.subcategory_keys,
+        subcategory_weights=subcategory_weights,
+        seed=seed,
+    )
+
+
+def load_fx_rates(parquet_folder, currency_df, local_currency=None):
+    """
+    Dense day x currency rate matrix from exchange_rates.parquet for
+    sales.local_currency, or None (no local-currency columns).
+    """
+    if not (local_currency or {}).get("enabled", False):
+        return None
+
+    fx_df = load_parquet_df(
+        os.path.join(str(parquet_folder), "exchange_rates.parquet"),
+        ["Date", "FromCurrency", "ToCurrency", "Rate"],
+    )
+    fx_df["Date"] = pd.to_datetime(fx_df["Date"])
+
+    fx_rates = FxRates.from_frames(fx_df, currency_df)
+    info(f"Local-currency amounts: {fx_rates!r}")
+    return fx_rates
+
+
+PRICE_HISTORY_FILE = "product_price_history.parquet"
+
+
+def build_price_history(product_store, start_date, end_date, price_history=None, seed=42):
+    """
+    Product x month price / cost matrices for sales.price_history, or
+    None (Products UnitPrice / UnitCost on every date) when disabled.
+    Anchored at start_date, so the same config and start give the same
+    prices whatever the end date.
+    """
+    ph_cfg = price_history or {}
+    if not ph_cfg.get("enabled", False):
+        return None
+
+    return PriceHistory(
+        product_store.unit_price,
+        product_store.unit_cost,
+        start_date,
+        end_date,
+        increase_every_months=int(ph_cfg.get("increase_every_months", 12)),
+        annual_increase_pct=float(ph_cfg.get("annual_increase_pct", 4.0)),
+        markdown_products_pct=float(ph_cfg.get("markdown_products_pct", 20)),
+        markdown_pct=float(ph_cfg.get("markdown_pct", 30)),
+        markdown_horizon_months=int(ph_cfg.get("markdown_horizon_months", 48)),
+        seed=seed,
+    )
+
+
+def export_price_history(out_folder, product_store, price_history):
+    """
+    Write ProductPriceHistory into out_folder, a sales-side scratch
+    folder that packaging ships with the dimensions.
+    """
+    os.makedirs(str(out_folder), exist_ok=True)
+    path = os.path.join(str(out_folder), PRICE_HISTORY_FILE)
+    rows = write_batches(
+        path, price_history.iter_batches(product_store.keys), PRICE_HISTORY_SCHEMA
+    )
+    info(f"ProductPriceHistory: {rows:,} rows ({price_history!r})")
+    return path
+
+
+def load_sales_dimensions(
+    parquet_folder,
+    heavy_pct=5,
+    heavy_mult=5,
+    seed=42,
+    store_lifecycle=None,
+    customer_lifecycle=None,
+    locality=None,
+    basket_affinity=None,
+    product_popularity=None,
+    local_currency=None,
+):
+    """
+    Load every dimension input the sales engine needs.
+
+    Returns a plain dict of NumPy arrays / dense-map dicts that can be
+    reused across runs (see iter_sales_batches(dims=...)).
+
+    store_lifecycle: sales.store_lifecycle config; when enabled, rows
+    only get stores trading on their order date.
+    customer_lifecycle: sales.customer_lifecycle config; when enabled,
+    orders only get customers active on their order date.
+    locality: sales.locality config; when enabled, most rows get a store
+    in the customer's geography / country (see StoreLocality).
+    basket_affinity: sales.basket_affinity config; when enabled, later
+    order lines favour subcategories related to the previous line.
+    product_popularity: sales.product_popularity config; when enabled,
+    products are drawn by demand weight instead of uniformly.
+    local_currency: sales.local_currency config; when enabled, rows get
+    ExchangeRate / UnitPriceLocal / NetPriceLocal columns.
+    """
+    parquet_folder = str(parquet_folder)
+
+    customers_path = os.path.join(parquet_folder, "customers.parquet")
+    customers_raw = load_parquet_column(customers_path, "CustomerKey")
+
+    # Expanded over row positions (same shuffle as expanding the keys),
+    # so lifecycle dates can be gathered for the pool
+    pool_idx = build_weighted_customers(
+        np.arange(len(customers_raw)), heavy_pct, heavy_mult, seed
     )
-    product_np = prod_df.to_numpy()
+    customers = customers_raw[pool_idx].astype(np.int64)
+
+    product_store = ProductStore.from_parquet(
+        os.path.join(parquet_folder, "products.parquet")
+    )
+    basket_inputs = load_basket_inputs(parquet_folder, basket_affinity)
+    if basket_inputs is not None and product_store.subcategory_keys is None:
+        raise ValueError(
+            "sales.basket_affinity requires SubcategoryKey in products.parquet"
+        )
 
     store_keys = load_parquet_column(
         os.path.join(parquet_folder, "stores.parquet"),
@@ -252,25 +543,211 @@ def generate_sales_fact(
         promo_start_all = promo_df["StartDate"].to_numpy("datetime64[D]")
         promo_end_all = promo_df["EndDate"].to_numpy("datetime64[D]")
 
+    return dict(
+        product_store=product_store,
+        store_keys=store_keys,
+        store_sampler=build_store_sampler(parquet_folder, store_lifecycle),
+        store_locality=load_locality_inputs(
+            parquet_folder, locality, store_lifecycle
+        ),
+        basket_affinity=basket_inputs,
+        product_popularity=load_product_popularity(
+            parquet_folder, product_store, product_popularity, seed
+        ),
+        promo_keys_all=promo_keys_all,
+        promo_pct_all=promo_pct_all,
+        promo_start_all=promo_start_all,
+        promo_end_all=promo_end_all,
+        customers=customers,
+        customer_sampler=build_customer_sampler(
+            customers_path, customers, pool_idx, customer_lifecycle
+        ),
+        store_to_geo=store_to_geo,
+        geo_to_currency=geo_to_currency,
+        fx_rates=load_fx_rates(parquet_folder, currency_df, local_currency),
+    )
+
+
+def build_worker_cfg(
+    dims,
+    date_pool,
+    date_prob,
+    out_folder=None,
+    file_format="parquet",
+    row_group_size=2_000_000,
+    compression="snappy",
+    ipc_compression=None,
+    csv_compression=None,
+    csv_target_size_mb=None,
+    delta_output_folder=None,
+    write_delta=False,
+    skip_order_cols=False,
+    partition_enabled=False,
+    partition_cols=None,
+    price_history=None,
+):
+    """
+    Assemble the init_sales_worker config from loaded dimensions,
+    the weighted date pool and output options.
+
+    price_history: PriceHistory from build_price_history (None keeps
+    the Products prices on every date).
+    """
+    for sampler in ("store_sampler", "customer_sampler"):
+        if dims.get(sampler) is not None:
+            dims[sampler].check_coverage(date_pool)
+
+    return dict(
+        **dims,
+        date_pool=date_pool,
+        date_prob=date_prob,
+        out_folder=out_folder,
+        file_format=file_format,
+        row_group_size=row_group_size,
+        compression=compression,
+        ipc_compression=ipc_compression,
+        csv_compression=csv_compression,
+        csv_target_size_mb=csv_target_size_mb,
+        no_discount_key=1,
+        delta_output_folder=delta_output_folder,
+        write_delta=write_delta,
+        skip_order_cols=skip_order_cols,
+        partition_enabled=partition_enabled,
+        partition_cols=partition_cols,
+        price_history=price_history,
+    )
+
+
+# =====================================================================
+# Main Fact Generation
+# =====================================================================
+
+def generate_sales_fact(
+    cfg,
+    parquet_folder,
+    out_folder,
+    total_rows,
+    chunk_size=2_000_000,
+    start_date=None,
+    end_date=None,
+    row_group_size=2_000_000,
+    compression="snappy",
+    merge_parquet=False,
+    merged_file="sales.parquet",
+    delete_chunks=False,
+    heavy_pct=5,
+    heavy_mult=5,
+    seed=42,
+    file_format="parquet",
+    workers=None,
+    tune_chunk=False,
+    write_delta=False,   # legacy (ignored)
+    delta_output_folder=None,
+    skip_order_cols=False,
+    write_pyarrow=True,
+    partition_enabled=False,
+    partition_cols=None,
+    date_window=None,
+    chunk_seed=None,
+    delta_mode="overwrite",
+    ipc_compression=None,
+    duckdb_sort_by_order_date=False,
+    csv_compression=None,
+    csv_target_size_mb=None,
+    price_history_folder=None,
+    base_end_date=None,
+):
+    """
+    Generate the Sales fact in parallel chunks.
+
+    file_format: csv | parquet | deltaparquet | arrow | orc | duckdb
+    ipc_compression: None | "lz4" | "zstd" (arrow only)
+    csv_compression / csv_target_size_mb: csv only; compress chunk files
+    (gzip / zstd) and roll them at a target size
+    duckdb: chunks are appended to <out_folder>/sales.duckdb as workers
+    finish, optionally re-sorted by OrderDate at the end
+
+    Append support:
+    - date_window=(start, end) restricts order dates to a sub-range of
+      [start_date, end_date] while keeping that range's seasonality
+    - chunk_seed overrides the chunk seed stream (default: seed + 1)
+    - delta_mode is the Delta write mode of the first commit
+    - base_end_date is the dataset's original end date; seasonality
+      weights up to it match the original run (see
+      build_weighted_date_pool)
+
+    price_history_folder: where ProductPriceHistory is written when
+    sales.price_history is enabled and exported (None: not written)
+    """
+    start_date, end_date = resolve_sales_dates(cfg, start_date, end_date)
+
+    # ------------------------------------------------------------
+    # Delta setup
+    # ------------------------------------------------------------
+    if file_format == "deltaparquet":
+        if delta_output_folder is None:
+            delta_output_folder = os.path.join(out_folder, "delta")
+        delta_output_folder = os.path.abspath(delta_output_folder)
+        ensure_dir(delta_output_folder)
+        ensure_dir(os.path.join(delta_output_folder, "_tmp_parts"))
+
+    ensure_dir(out_folder)
+
+    # ------------------------------------------------------------
+    # Load dimensions
+    # ------------------------------------------------------------
+    dims = load_sales_dimensions(
+        parquet_folder,
+        heavy_pct=heavy_pct,
+        heavy_mult=heavy_mult,
+        seed=seed,
+        store_lifecycle=(cfg.get("sales") or {}).get("store_lifecycle"),
+        customer_lifecycle=(cfg.get("sales") or {}).get("customer_lifecycle"),
+        locality=(cfg.get("sales") or {}).get("locality"),
+        basket_affinity=(cfg.get("sales") or {}).get("basket_affinity"),
+        product_popularity=(cfg.get("sales") or {}).get("product_popularity"),
+        local_currency=(cfg.get("sales") or {}).get("local_currency"),
+    )
+
     date_pool, date_prob = build_weighted_date_pool(
-        start_date, end_date, seed
+        start_date, end_date, seed, base_end=base_end_date
     )
 
+    price_history_cfg = (cfg.get("sales") or {}).get("price_history") or {}
+    price_history = build_price_history(
+        dims["product_store"], start_date, end_date, price_history_cfg, seed
+    )
+    if (
+        price_history is not None
+        and price_history_folder is not None
+        and price_history_cfg.get("export", True)
+    ):
+        export_price_history(
+            price_history_folder, dims["product_store"], price_history
+        )
+
+    if date_window is not None:
+        ws = np.datetime64(str(date_window[0]), "D")
+        we = np.datetime64(str(date_window[1]), "D")
+        mask = (date_pool >= ws) & (date_pool <= we)
+
+        date_pool = date_pool[mask]
+        date_prob = date_prob[mask]
+
+        if date_pool.size == 0 or date_prob.sum() <= 0:
+            skip("No sales dates in requested window.")
+            return []
+
+        date_prob = date_prob / date_prob.sum()
+
     # ------------------------------------------------------------
     # Chunk scheduling
     # ------------------------------------------------------------
-    rng_master = np.random.default_rng(seed + 1)
-    total_chunks = ceil(total_rows / chunk_size)
-    seeds = rng_master.integers(1, 1 << 30, size=total_chunks)
-
-    tasks = []
-    remaining = total_rows
-    for idx, s in enumerate(seeds):
-        if remaining <= 0:
-            break
-        batch = min(chunk_size, remaining)
-        tasks.append((idx, batch, int(s)))
-        remaining -= batch
+    tasks = build_chunk_tasks(
+        total_rows,
+        chunk_size,
+        seed + 1 if chunk_seed is None else chunk_seed,
+    )
 
     if not tasks:
         skip("No sales rows to generate.")
@@ -286,31 +763,38 @@ def generate_sales_fact(
 
     info(f"Spawning {n_workers} worker processes...")
 
+    duckdb_loader = None
+    if file_format == "duckdb":
+        from src.tools.sql.duckdb_loader import DuckDBSalesLoader
+
+        # Uncompressed IPC hand-off; DuckDB scans it zero-copy
+        ipc_compression = None
+        duckdb_loader = DuckDBSalesLoader(
+            os.path.join(out_folder, "sales.duckdb"),
+            skip_order_cols=skip_order_cols,
+            local_currency=dims["fx_rates"] is not None,
+        )
+
     # ------------------------------------------------------------
     # Worker configuration
     # ------------------------------------------------------------
-    worker_cfg = dict(
-        product_np=product_np,
-        store_keys=store_keys,
-        promo_keys_all=promo_keys_all,
-        promo_pct_all=promo_pct_all,
-        promo_start_all=promo_start_all,
-        promo_end_all=promo_end_all,
-        customers=customers,
-        store_to_geo=store_to_geo,
-        geo_to_currency=geo_to_currency,
-        date_pool=date_pool,
-        date_prob=date_prob,
+    worker_cfg = build_worker_cfg(
+        dims,
+        date_pool,
+        date_prob,
         out_folder=out_folder,
         file_format=file_format,
         row_group_size=row_group_size,
         compression=compression,
-        no_discount_key=1,
+        ipc_compression=ipc_compression,
+        csv_compression=csv_compression,
+        csv_target_size_mb=csv_target_size_mb,
         delta_output_folder=delta_output_folder,
         write_delta=write_delta,
         skip_order_cols=skip_order_cols,
         partition_enabled=partition_enabled,
         partition_cols=partition_cols,
+        price_history=price_history,
     )
 
     created_files = []
@@ -324,38 +808,37 @@ def generate_sales_fact(
     total_units = len(tasks)
     completed_units = 0
 
-    with Pool(
+    # Dimension threads may still be running (overlapped generation)
+    with pool_context().Pool(
         processes=n_workers,
         initializer=init_sales_worker,
         initargs=(worker_cfg,),
     ) as pool:
 
         for result in pool.imap_unordered(_worker_task, batched_tasks):
-            if isinstance(result, list):
-                for r in result:
-                    completed_units += 1
-                    if isinstance(r, str):
-                        created_files.append(r)
-                        # work(
-                        #     f"[{completed_units}/{total_units}] → "
-                        #     f"{os.path.basename(r)}"
-                        # )
-                        work(
-                            f"[{completed_units}/{total_units}] -> "
-                            f"{os.path.basename(r)}"
-                        )
-
-            else:
+            for r in (result if isinstance(result, list) else [result]):
                 completed_units += 1
-                if isinstance(result, str):
-                    created_files.append(result)
+
+                # CSV chunks may roll into several files
+                paths = r if isinstance(r, list) else [r]
+                for path in paths:
+                    if not isinstance(path, str):
+                        continue
+                    if duckdb_loader is not None:
+                        duckdb_loader.append_arrow_file(path)
+                        os.remove(path)
+                    created_files.append(path)
                     work(
-                        f"[{completed_units}/{total_units}] → "
-                        f"{os.path.basename(result)}"
+                        f"[{completed_units}/{total_units}] -> "
+                        f"{os.path.basename(path)}"
                     )
 
     done("All chunks completed.")
 
+    if duckdb_loader is not None:
+        duckdb_loader.close(sort_by_order_date=duckdb_sort_by_order_date)
+        return created_files
+
     # ------------------------------------------------------------
     # Final assembly
     # ------------------------------------------------------------
@@ -365,24 +848,41 @@ def generate_sales_fact(
             parts_folder=os.path.join(delta_output_folder, "_tmp_parts"),
             delta_output_folder=delta_output_folder,
             partition_cols=partition_cols,
+            mode=delta_mode,
         )
         return created_files
 
     if file_format == "csv":
         return created_files
 
-    if file_format == "parquet":
-        parquet_chunks = sorted(
+    if file_format in ("parquet", "arrow", "orc"):
+        chunks = sorted(
             f for f in glob.glob(
-                os.path.join(out_folder, "sales_chunk*.parquet")
+                os.path.join(out_folder, f"sales_chunk*.{file_format}")
             )
             if os.path.isfile(f)
         )
-        if parquet_chunks and merge_parquet:
-            merge_parquet_files(
-                parquet_chunks,
-                os.path.join(out_folder, merged_file),
-                delete_after=True,
+        if chunks and merge_parquet:
+            merged_path = os.path.join(
+                out_folder,
+                os.path.splitext(merged_file)[0] + f".{file_format}",
             )
 
+            if file_format == "parquet":
+                merge_parquet_files(chunks, merged_path, delete_after=True)
+            elif file_format == "arrow":
+                merge_arrow_files(
+                    chunks,
+                    merged_path,
+                    delete_after=True,
+                    compression=ipc_compression,
+                )
+            else:
+                merge_orc_files(
+                    chunks,
+                    merged_path,
+                    delete_after=True,
+                    compression=orc_compression(compression),
+                )
+
     return created_files
@@ -0,0 +1,334 @@
+import sys
+import time
+import queue
+import socket
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.utils.logging_utils import info, warn, done, fmt_sec
+from .sales_stream import iter_sales_batches
+
+
+EMIT_FORMATS = ("ndjson", "csv", "arrow")
+
+_END = object()
+
+
+# =====================================================================
+# Rate limiting
+# =====================================================================
+
+class TokenBucket:
+    """
+    Token bucket limiter: `rate` rows/s with at most `capacity` rows of burst.
+    Starts empty so the stream ramps up at the target rate.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self.tokens = 0.0
+        self.t = time.perf_counter()
+
+    def acquire(self, n: int):
+        if n > self.capacity:
+            raise ValueError("Cannot acquire more tokens than bucket capacity")
+
+        while True:
+            now = time.perf_counter()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.t) * self.rate
+            )
+            self.t = now
+
+            if self.tokens >= n:
+                self.tokens -= n
+                return
+
+            time.sleep((n - self.tokens) / self.rate)
+
+
+# =====================================================================
+# Event timestamps
+# =====================================================================
+
+def add_event_timestamps(batch: pa.RecordBatch, rng) -> pa.RecordBatch:
+    """
+    Prepend EventTimestamp (OrderDate + random time of day) and order the
+    batch by it, so every event falls on its own OrderDate.
+    """
+    order_dates = batch.column(batch.schema.get_field_index("OrderDate"))
+    days = order_dates.to_numpy(zero_copy_only=False).astype("datetime64[ms]")
+
+    offsets = rng.integers(0, 86_400_000, size=len(days)).astype("timedelta64[ms]")
+    ts = days + offsets
+
+    order = np.argsort(ts, kind="stable")
+    batch = batch.take(pa.array(order))
+
+    columns = [pa.array(ts[order], type=pa.timestamp("ms"))] + batch.columns
+    names = ["EventTimestamp"] + batch.schema.names
+    return pa.RecordBatch.from_arrays(columns, names=names)
+
+
+# =====================================================================
+# Sinks / encoders
+# =====================================================================
+
+def open_sink(target: str):
+    """
+    '-'              -> stdout
+    'tcp://host:port'-> local socket (client connection)
+    anything else    -> file path or FIFO (opened for writing)
+    """
+    if target == "-":
+        return sys.stdout.buffer, None
+
+    if target.startswith("tcp://"):
+        host, _, port = target[len("tcp://"):].rpartition(":")
+        if not host or not port:
+            raise ValueError(f"Invalid tcp target: {target}")
+        sock = socket.create_connection((host, int(port)))
+        return sock.makefile("wb"), sock
+
+    return open(target, "wb"), None
+
+
+class _NdjsonEncoder:
+    def __init__(self, sink, schema):
+        self.sink = sink
+
+    def write(self, batch):
+        # Render dates / timestamps as ISO strings before JSON encoding
+        cols = []
+        for col, field in zip(batch.columns, batch.schema):
+            if pa.types.is_timestamp(field.type):
+                # %S carries the millisecond fraction for timestamp[ms]
+                col = pc.strftime(col, format="%Y-%m-%dT%H:%M:%S")
+            elif pa.types.is_date(field.type):
+                col = pc.cast(col, pa.string())
+            cols.append(col)
+
+        df = pa.RecordBatch.from_arrays(cols, names=batch.schema.names).to_pandas()
+        text = df.to_json(orient="records", lines=True)
+        if not text.endswith("\n"):
+            text += "\n"
+        self.sink.write(text.encode("utf-8"))
+
+    def close(self):
+        pass
+
+
+class _CsvEncoder:
+    def __init__(self, sink, schema):
+        import pyarrow.csv as pacsv
+
+        self.writer = pacsv.CSVWriter(
+            sink,
+            schema,
+            write_options=pacsv.WriteOptions(
+                include_header=True,
+                quoting_style="none",
+            ),
+        )
+
+    def write(self, batch):
+        self.writer.write_batch(batch)
+
+    def close(self):
+        self.writer.close()
+
+
+class _ArrowEncoder:
+    def __init__(self, sink, schema):
+        self.writer = pa.ipc.new_stream(sink, schema)
+
+    def write(self, batch):
+        self.writer.write_batch(batch)
+
+    def close(self):
+        self.writer.close()
+
+
+_ENCODERS = {
+    "ndjson": _NdjsonEncoder,
+    "csv": _CsvEncoder,
+    "arrow": _ArrowEncoder,
+}
+
+
+# =====================================================================
+# Producer (pre-generates ahead of the clock)
+# =====================================================================
+
+def _producer(batches, out_q: queue.Queue, stop: threading.Event, errors: list):
+    try:
+        for batch in batches:
+            while not stop.is_set():
+                try:
+                    out_q.put(batch, timeout=0.2)
+                    break
+                except queue.Full:
+                    continue
+            if stop.is_set():
+                break
+    except Exception as ex:  # surfaced by the emitter loop
+        errors.append(ex)
+    finally:
+        batches.close()
+        if not stop.is_set():
+            out_q.put(_END)
+
+
+# =====================================================================
+# Entry point
+# =====================================================================
+
+def run_sales_emitter(
+    cfg,
+    rate,
+    total_rows=None,
+    output_format="ndjson",
+    target="-",
+    chunk_size=50_000,
+    workers=None,
+    prefetch=4,
+    seed=42,
+    burst_sec=0.1,
+    report_every=5.0,
+):
+    """
+    Emit Sales as timestamped events at a steady rate (rows/s).
+
+    Chunks are built ahead of the clock by iter_sales_batches in a
+    background thread (up to `prefetch` chunks queued, and as many
+    scheduled in the pool); the emitter
+    slices them into bucket-sized writes paced by a token bucket.
+
+    Lag is how far the stream is behind its schedule
+    (start + rows_emitted / rate); it grows when the producer or the
+    sink cannot keep up.
+    """
+    if output_format not in EMIT_FORMATS:
+        raise ValueError(f"output_format must be one of {EMIT_FORMATS}")
+
+    rate = float(rate)
+    if rate <= 0:
+        raise ValueError("rate must be > 0")
+
+    if total_rows is None:
+        total_rows = cfg["sales"]["total_rows"]
+    total_rows = int(total_rows)
+
+    bucket = TokenBucket(rate, rate * burst_sec)
+    slice_rows = max(1, int(bucket.capacity))
+
+    batches = iter_sales_batches(
+        cfg,
+        total_rows=total_rows,
+        chunk_size=chunk_size,
+        seed=seed,
+        workers=workers,
+        ordered=True,
+        max_inflight=max(1, int(prefetch)),
+    )
+
+    q = queue.Queue(maxsize=max(1, int(prefetch)))
+    stop = threading.Event()
+    errors = []
+    producer = threading.Thread(
+        target=_producer, args=(batches, q, stop, errors), daemon=True
+    )
+
+    rng = np.random.default_rng(seed + 2)
+    sink, sock = open_sink(target)
+    encoder = None
+
+    info(
+        f"Emitting {total_rows:,} sales events as {output_format} to "
+        f"{'stdout' if target == '-' else target} at {rate:,.0f} rows/s"
+    )
+
+    emitted = 0
+    max_lag = 0.0
+    stalls = 0
+    t_start = time.perf_counter()
+    t_report = t_start
+    emitted_report = 0
+
+    producer.start()
+
+    try:
+        while True:
+            try:
+                batch = q.get_nowait()
+            except queue.Empty:
+                if emitted:
+                    stalls += 1
+                batch = q.get()
+
+            if batch is _END:
+                break
+
+            batch = add_event_timestamps(batch, rng)
+            if encoder is None:
+                encoder = _ENCODERS[output_format](sink, batch.schema)
+                # The clock starts once the first chunk is ready
+                t_start = t_report = bucket.t = time.perf_counter()
+
+            for offset in range(0, batch.num_rows, slice_rows):
+                part = batch.slice(offset, slice_rows)
+                bucket.acquire(part.num_rows)
+                encoder.write(part)
+                sink.flush()
+                emitted += part.num_rows
+
+                now = time.perf_counter()
+                lag = max(0.0, (now - t_start) - emitted / rate)
+                max_lag = max(max_lag, lag)
+
+                if report_every and now - t_report >= report_every:
+                    achieved = (emitted - emitted_report) / (now - t_report)
+                    info(
+                        f"Emitted {emitted:,}/{total_rows:,} | target "
+                        f"{rate:,.0f}/s | achieved {achieved:,.0f}/s | "
+                        f"lag {lag:.2f}s"
+                    )
+                    t_report = now
+                    emitted_report = emitted
+
+        if errors:
+            raise errors[0]
+
+    except (BrokenPipeError, ConnectionResetError):
+        warn(f"Sink closed after {emitted:,} rows; stopping.")
+
+    finally:
+        stop.set()
+        try:
+            if encoder is not None:
+                encoder.close()
+            if sink is not sys.stdout.buffer:
+                sink.close()
+            else:
+                sink.flush()
+        except (BrokenPipeError, ConnectionResetError, ValueError):
+            pass
+        if sock is not None:
+            sock.close()
+        producer.join(timeout=5)
+
+    elapsed = time.perf_counter() - t_start
+    achieved = emitted / elapsed if elapsed > 0 else 0.0
+    done(
+        f"Emitted {emitted:,} rows in {fmt_sec(elapsed)} | target "
+        f"{rate:,.0f}/s | achieved {achieved:,.0f}/s | max lag "
+        f"{max_lag:.2f}s | producer stalls {stalls}"
+    )
+
+    return emitted
@@ -0,0 +1,142 @@
+import numpy as np
+
+
+class AliasTable:
+    """
+    Walker / Vose alias tables for O(1) weighted sampling.
+
+    Items are laid out in contiguous segments (one segment when
+    offsets is None); each segment is an independent distribution over
+    its own items, so e.g. one table holds a per-subcategory product
+    distribution for every subcategory. A draw picks a column in the
+    requested segment uniformly and keeps it with probability
+    prob[col], else takes alias[col] (same segment).
+
+    Construction is vectorized. With q = weight * segment size / segment
+    total, Vose pairs "small" columns (q < 1) with "large" ones in
+    order; which large tops up a small, and how much of a large is left
+    for its own column, both follow from where the cumulative small
+    deficits fall on the cumulative large excesses. Each of these is a
+    searchsorted, not a loop.
+    """
+
+    __slots__ = ("prob", "alias", "offsets", "counts")
+
+    def __init__(self, weights, offsets=None):
+        weights = np.asarray(weights, dtype=np.float64)
+        n = len(weights)
+        if n == 0:
+            raise ValueError("AliasTable requires at least one item")
+        if not np.all(np.isfinite(weights)) or (weights < 0).any():
+            raise ValueError("AliasTable weights must be finite and >= 0")
+
+        if offsets is None:
+            offsets = np.array([0, n], dtype=np.int64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if offsets[0] != 0 or offsets[-1] != n or (np.diff(offsets) < 0).any():
+            raise ValueError("AliasTable offsets must run from 0 to len(weights)")
+
+        counts = np.diff(offsets)
+        seg = np.repeat(np.arange(len(counts)), counts)
+
+        totals = np.bincount(seg, weights=weights, minlength=len(counts))
+        # All-zero segment: uniform over its items
+        flat = totals[seg] <= 0
+        w = np.where(flat, 1.0, weights)
+        totals = np.where(totals > 0, totals, counts.astype(np.float64))
+
+        q = w * counts[seg] / totals[seg]
+
+        prob = np.ones(n, dtype=np.float64)
+        alias = np.arange(n, dtype=np.int64)
+
+        small = np.nonzero(q < 1.0)[0]
+        large = np.nonzero(q >= 1.0)[0]
+
+        if small.size and large.size:
+            # Segment-local cumulative deficits / excesses, shifted by
+            # segment * span so one searchsorted never crosses segments
+            span = float(counts.max()) + 1.0
+
+            def _cumulative(idx, amount):
+                c = np.cumsum(amount)
+                s = seg[idx]
+                first = np.searchsorted(s, s, side="left")
+                base = np.where(first > 0, c[first - 1], 0.0)
+                return c - base, s * span
+
+            d = 1.0 - q[small]
+            D, s_shift = _cumulative(small, d)
+            D_start = D - d
+
+            e = q[large] - 1.0
+            E, l_shift = _cumulative(large, e)
+
+            # Small i is topped up by the first large (in its segment)
+            # whose cumulative excess exceeds the deficit before i
+            j = np.searchsorted(E + l_shift, D_start + s_shift, side="right")
+            j = np.minimum(j, large.size - 1)
+            ok = seg[large[j]] == seg[small]
+
+            prob[small] = np.where(ok, q[small], 1.0)
+            alias[small] = np.where(ok, large[j], small)
+
+            # Large j keeps 1 - (deficits it covered - its excess) and
+            # is itself topped up by the next large of its segment
+            served = np.searchsorted(D_start + s_shift, E + l_shift, side="left")
+            prev = np.maximum(served - 1, 0)
+            X = np.where(
+                (served > 0) & (seg[small[prev]] == seg[large]),
+                D[prev],
+                0.0,
+            )
+            nxt = np.minimum(np.arange(large.size) + 1, large.size - 1)
+            has_next = seg[large[nxt]] == seg[large]
+            has_next &= nxt != np.arange(large.size)
+
+            prob[large] = np.where(has_next, np.clip(1.0 - (X - E), 0.0, 1.0), 1.0)
+            alias[large] = np.where(has_next, large[nxt], large)
+
+        self.prob = prob
+        self.alias = alias
+        self.offsets = offsets
+        self.counts = counts
+
+    def __len__(self):
+        return len(self.prob)
+
+    @property
+    def num_segments(self):
+        return len(self.counts)
+
+    def sample(self, rng, size=None, segments=None) -> np.ndarray:
+        """
+        Item indices drawn from the given segment per row (segments
+        array), or size draws from segment 0.
+        """
+        if segments is None:
+            col = (rng.random(size) * self.counts[0]).astype(np.int64)
+        else:
+            segments = np.asarray(segments, dtype=np.int64)
+            col = self.offsets[segments] + (
+                rng.random(len(segments)) * self.counts[segments]
+            ).astype(np.int64)
+            # Callers never request empty segments; clip keeps the
+            # gather in bounds regardless
+            col = np.minimum(col, len(self.prob) - 1)
+
+        keep = rng.random(len(col)) < self.prob[col]
+        return np.where(keep, col, self.alias[col])
+
+    def probabilities(self) -> np.ndarray:
+        """Per-item probability within its segment (for checks)."""
+        size = np.repeat(self.counts, self.counts)
+        out = self.prob / size
+        np.add.at(out, self.alias, (1.0 - self.prob) / size)
+        return out
+
+    def __repr__(self):
+        return f"AliasTable({len(self):,} items, {self.num_segments:,} segments)"
+
+
+__all__ = ["AliasTable"]
@@ -0,0 +1,132 @@
+import numpy as np
+
+from .alias import AliasTable
+
+
+class BasketAffinity:
+    """
+    Market-basket affinity between the lines of an order.
+
+    Line 1 of an order keeps its independently drawn product. Line k
+    draws a subcategory from the affinity row of line k-1's
+    subcategory, then a product within that subcategory:
+
+        same_subcategory   mass on the same subcategory
+        same_category      mass spread over the other subcategories of
+                           the same category
+        other              mass spread over all remaining subcategories
+        pairs              extra (from, to, weight) SubcategoryKey mass
+
+    Rows of the matrix and the per-subcategory product distributions
+    are segmented AliasTables, so each pass (one per line number) is a
+    handful of vectorized gathers over the rows of that line number.
+    """
+
+    def __init__(
+        self,
+        product_subcategory,
+        subcategory_keys,
+        category_keys,
+        same_subcategory=0.35,
+        same_category=0.40,
+        other=0.25,
+        pairs=None,
+        product_weights=None,
+    ):
+        group_w = np.array([same_subcategory, same_category, other], dtype=np.float64)
+        if not np.all(np.isfinite(group_w)) or (group_w < 0).any() or group_w.sum() <= 0:
+            raise ValueError(
+                "sales.basket_affinity weights must be >= 0 and not all zero"
+            )
+
+        product_subcategory = np.asarray(product_subcategory, dtype=np.int64)
+
+        # Dense subcategory ids 0..S-1 over the subcategories products use
+        sub_values, product_sub = np.unique(product_subcategory, return_inverse=True)
+        S = len(sub_values)
+        self.product_sub = product_sub.astype(np.int32)
+
+        # Category per subcategory id (-1 = unknown: a category of its own)
+        category_of = dict(zip(
+            np.asarray(subcategory_keys, dtype=np.int64).tolist(),
+            np.asarray(category_keys, dtype=np.int64).tolist(),
+        ))
+        sub_category = np.array(
+            [category_of.get(int(k), -1 - i) for i, k in enumerate(sub_values)],
+            dtype=np.int64,
+        )
+
+        # ------------------------------------------------------------
+        # Affinity matrix (S x S), one probability row per subcategory
+        # ------------------------------------------------------------
+        same_sub = np.eye(S, dtype=bool)
+        same_cat = (sub_category[:, None] == sub_category[None, :]) & ~same_sub
+        rest = ~same_sub & ~same_cat
+
+        matrix = np.zeros((S, S), dtype=np.float64)
+        for mask, w in zip((same_sub, same_cat, rest), group_w):
+            n_in = mask.sum(axis=1, keepdims=True)
+            matrix += np.where(mask, w / np.maximum(n_in, 1), 0.0)
+
+        sub_index = {int(k): i for i, k in enumerate(sub_values)}
+        for pair in pairs or ():
+            try:
+                frm, to, w = pair
+            except (TypeError, ValueError):
+                raise ValueError(
+                    "sales.basket_affinity.pairs entries must be "
+                    "[from SubcategoryKey, to SubcategoryKey, weight]"
+                ) from None
+            if float(w) < 0:
+                raise ValueError("sales.basket_affinity.pairs weights must be >= 0")
+            i, j = sub_index.get(int(frm)), sub_index.get(int(to))
+            if i is not None and j is not None:
+                matrix[i, j] += float(w)
+
+        self.transitions = AliasTable(
+            matrix.ravel(), np.arange(S + 1, dtype=np.int64) * S
+        )
+        self.num_subcategories = S
+
+        # ------------------------------------------------------------
+        # Products grouped by subcategory (CSR) + per-subcategory tables
+        # ------------------------------------------------------------
+        order = np.argsort(self.product_sub, kind="stable")
+        self.sub_products = order.astype(np.int64)
+
+        offsets = np.zeros(S + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.product_sub, minlength=S), out=offsets[1:])
+
+        weights = (
+            np.ones(len(order))
+            if product_weights is None
+            else np.asarray(product_weights, dtype=np.float64)[order]
+        )
+        self.products = AliasTable(weights, offsets)
+
+    def apply(self, rng, prod_idx, line_num) -> np.ndarray:
+        """
+        Redraw prod_idx (in place) for lines 2.. of each order. Orders
+        are contiguous, so line k's previous line is the row before it.
+        """
+        line_num = np.asarray(line_num)
+        S = self.num_subcategories
+
+        for k in range(2, int(line_num.max(initial=1)) + 1):
+            rows = np.nonzero(line_num == k)[0]
+            rows = rows[rows > 0]
+            if rows.size == 0:
+                continue
+
+            prev_sub = self.product_sub[prod_idx[rows - 1]].astype(np.int64)
+            next_sub = self.transitions.sample(rng, segments=prev_sub) - prev_sub * S
+            pos = self.products.sample(rng, segments=next_sub)
+            prod_idx[rows] = self.sub_products[pos]
+
+        return prod_idx
+
+    def __repr__(self):
+        return f"BasketAffinity({self.num_subcategories:,} subcategories)"
+
+
+__all__ = ["BasketAffinity"]
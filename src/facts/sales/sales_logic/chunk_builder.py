@@ -8,10 +8,33 @@ from .promo_logic import apply_promotions
 from .price_logic import compute_prices
 
 
-def build_chunk_table(n: int, seed: int, no_discount_key: int = 1) -> pa.Table:
+def _edge_orders(order_ids_int, n):
+    """
+    Rows of the chunk's first and last orders: every row with their
+    order id (build_orders pads a chunk by repeating its leading rows).
+    Without order ids each row is its own order.
+    """
+    if order_ids_int is None:
+        return np.array([0]), np.array([n - 1])
+    return (
+        np.flatnonzero(order_ids_int == order_ids_int[0]),
+        np.flatnonzero(order_ids_int == order_ids_int[-1]),
+    )
+
+
+def build_chunk_table(
+    n: int,
+    seed: int,
+    no_discount_key: int = 1,
+    date_pool=None,
+    date_prob=None,
+) -> pa.Table:
     """
     Build `n` synthetic sales rows.
     All shared, immutable state is read from `State`.
+
+    date_pool / date_prob override the bound date pool for this chunk
+    (used by the sales server for per-request date ranges).
     """
 
     if not PA_AVAILABLE:
@@ -26,11 +49,20 @@ def build_chunk_table(n: int, seed: int, no_discount_key: int = 1) -> pa.Table:
     if skip_cols not in (True, False):
         raise RuntimeError("State.skip_order_cols must be a boolean")
 
-    product_np = State.product_np
+    products = State.product_store
+    arena = State.gather_arena
+    basket = State.basket_affinity
+    popularity = State.product_popularity
+    price_history = State.price_history
+    fx_rates = State.fx_rates
     customers = State.customers
-    date_pool = State.date_pool
-    date_prob = State.date_prob
+    customer_sampler = State.customer_sampler
+    if date_pool is None:
+        date_pool = State.date_pool
+        date_prob = State.date_prob
     store_keys = State.store_keys
+    store_sampler = State.store_sampler
+    store_locality = State.store_locality
 
     promo_keys_all = State.promo_keys_all
     promo_pct_all = State.promo_pct_all
@@ -48,8 +80,8 @@ def build_chunk_table(n: int, seed: int, no_discount_key: int = 1) -> pa.Table:
     # ------------------------------------------------------------
     if date_pool is None:
         raise RuntimeError("State.date_pool is None")
-    if product_np is None:
-        raise RuntimeError("State.product_np is None")
+    if products is None:
+        raise RuntimeError("State.product_store is None")
     if store_keys is None:
         raise RuntimeError("State.store_keys is None")
     if st2g_arr is None or g2c_arr is None:
@@ -61,30 +93,21 @@ def build_chunk_table(n: int, seed: int, no_discount_key: int = 1) -> pa.Table:
     schema_types = {f.name: f.type for f in schema}
 
     # ------------------------------------------------------------
-    # PRODUCTS
+    # PRODUCTS (gathered after orders: basket affinity redraws lines)
     # ------------------------------------------------------------
-    prod_idx = rng.integers(0, len(product_np), size=n)
-    prods = product_np[prod_idx]
-
-    product_keys = prods[:, 0]
-    unit_price = prods[:, 1].astype(np.float64, copy=False)
-    unit_cost = prods[:, 2].astype(np.float64, copy=False)
+    if popularity is None:
+        prod_idx = rng.integers(0, len(products), size=n)
+    else:
+        prod_idx = popularity.sample(rng, n)
 
     # ------------------------------------------------------------
-    # STORE → GEO → CURRENCY
+    # STORES (uniform; lifecycle / locality sampling need order
+    # dates and customers, below)
     # ------------------------------------------------------------
-    store_key_arr = store_keys[
-        rng.integers(0, len(store_keys), size=n)
-    ]
-
-    if store_key_arr.dtype != np.int64:
-        store_key_arr = store_key_arr.astype(np.int64, copy=False)
-
-    geo_arr = st2g_arr[store_key_arr]
-    currency_arr = g2c_arr[geo_arr]
-
-    if currency_arr.dtype != np.int64:
-        currency_arr = currency_arr.astype(np.int64, copy=False)
+    if store_sampler is None and store_locality is None:
+        store_key_arr = store_keys[
+            rng.integers(0, len(store_keys), size=n)
+        ]
 
     # ------------------------------------------------------------
     # ORDERS (ONLY if enabled)
@@ -97,9 +120,10 @@ def build_chunk_table(n: int, seed: int, no_discount_key: int = 1) -> pa.Table:
             date_pool=date_pool,
             date_prob=date_prob,
             customers=customers,
-            product_keys=product_keys,
+            product_keys=None,
             _len_date_pool=len(date_pool),
             _len_customers=len(customers),
+            customer_sampler=customer_sampler,
         )
 
         customer_keys = orders["customer_keys"]
@@ -108,20 +132,74 @@ def build_chunk_table(n: int, seed: int, no_discount_key: int = 1) -> pa.Table:
         line_num = orders["line_num"]
 
     else:
-        customer_keys = customers[
-            rng.integers(0, len(customers), size=n)
-        ]
+        if customer_sampler is None:
+            customer_keys = customers[
+                rng.integers(0, len(customers), size=n)
+            ]
         order_dates = date_pool[
             rng.integers(0, len(date_pool), size=n)
         ]
+        if customer_sampler is not None:
+            customer_keys = customer_sampler.sample(rng, order_dates)
 
         order_ids_int = None
         line_num = None
 
+    if basket is not None and line_num is not None:
+        # Lines 2.. follow the previous line's subcategory affinity
+        prod_idx = basket.apply(rng, prod_idx, line_num)
+
+    # One typed gather per column (arena buffers are reused per chunk)
+    if price_history is None:
+        prods = products.gather(prod_idx, arena)
+        unit_price = prods["unit_price"]
+        unit_cost = prods["unit_cost"]
+    else:
+        prods = products.gather(prod_idx, arena, columns=("keys",))
+
+    product_keys = prods["keys"]
+
     # Edge pinning: guarantees boundary coverage
     order_dates[0] = date_pool[0]
     order_dates[-1] = date_pool[-1]
 
+    if customer_sampler is not None:
+        # Pin the whole first / last order and redraw its customer on
+        # the pinned date, so each order keeps one active CustomerKey
+        first, last = _edge_orders(order_ids_int, n)
+        order_dates[first] = date_pool[0]
+        order_dates[last] = date_pool[-1]
+
+        edge_customers = customer_sampler.sample(rng, order_dates[[0, n - 1]])
+        customer_keys[first] = edge_customers[0]
+        customer_keys[last] = edge_customers[1]
+
+    if price_history is not None:
+        # List price / cost of the order month (after pinning: dates final)
+        unit_price, unit_cost = price_history.lookup(prod_idx, order_dates, arena)
+
+
+    # ------------------------------------------------------------
+    # STORE → GEO → CURRENCY
+    # ------------------------------------------------------------
+    if store_locality is not None:
+        # Mostly stores in the customer's region, else online
+        store_key_arr = store_locality.sample(
+            rng, customer_keys, order_dates, fallback=store_sampler
+        )
+    elif store_sampler is not None:
+        # Only stores trading on each row's order date
+        store_key_arr = store_sampler.sample(rng, order_dates)
+
+    if store_key_arr.dtype != np.int64:
+        store_key_arr = store_key_arr.astype(np.int64, copy=False)
+
+    geo_arr = st2g_arr[store_key_arr]
+    currency_arr = g2c_arr[geo_arr]
+
+    if currency_arr.dtype != np.int64:
+        currency_arr = currency_arr.astype(np.int64, copy=False)
+
     qty = np.clip(rng.poisson(3, n) + 1, 1, 4)
 
     # ------------------------------------------------------------
@@ -211,6 +289,13 @@ def build_chunk_table(n: int, seed: int, no_discount_key: int = 1) -> pa.Table:
     add("UnitPrice", price["final_unit_price"])
     add("DiscountAmount", price["discount_amt"])
 
+    # Local currency: one rate gather per row, amounts in cents
+    if fx_rates is not None:
+        rate = fx_rates.lookup(order_dates, currency_arr)
+        add("ExchangeRate", rate)
+        add("UnitPriceLocal", np.round(price["final_unit_price"] * rate, 2))
+        add("NetPriceLocal", np.round(price["final_net_price"] * rate, 2))
+
     # Status
     add("DeliveryStatus", delivery_status)
     add("IsOrderDelayed", is_order_delayed)
@@ -0,0 +1,104 @@
+import numpy as np
+
+
+# The FX master (src/integrations/fx_yahoo.py) stores, under
+# FromCurrency=USD, the close of USD{CUR}=X for these currencies
+# (units per USD) and of {CUR}USD=X for every other one (USD per unit)
+USD_QUOTED_CURRENCIES = frozenset({"INR"})
+
+
+def rates_per_base(to_currency, rate, base_currency="USD"):
+    """
+    Rates as units of ToCurrency per one base currency unit, inverting
+    rows stored in the {CUR}USD=X direction.
+    """
+    rate = np.asarray(rate, dtype=np.float64)
+    if base_currency != "USD":
+        return rate
+    to_currency = np.asarray(to_currency, dtype=object)
+    per_unit = ~np.isin(to_currency, list(USD_QUOTED_CURRENCIES | {"USD"}))
+    return np.where(per_unit, 1.0 / rate, rate)
+
+
+class FxRates:
+    """
+    Dense (day x currency) exchange rate matrix for local-currency
+    amounts.
+
+    rates[day - first_day, CurrencyKey] is the units of that currency
+    per base currency unit on that day, so a row costs one gather (flat
+    index day * width + CurrencyKey) and one multiply.
+
+    Days the rate table skips carry the previous day's rate forward;
+    order dates outside the table use its first / last day.
+    """
+
+    def __init__(self, dates, currency_keys, rates):
+        days = np.asarray(dates).astype("datetime64[D]").astype(np.int64)
+        currency_keys = np.asarray(currency_keys, dtype=np.int64)
+        rates = np.asarray(rates, dtype=np.float64)
+        if days.size == 0:
+            raise ValueError("FxRates requires at least one exchange rate")
+        if not np.all(np.isfinite(rates)) or (rates <= 0).any():
+            raise ValueError("Exchange rates must be finite and > 0")
+
+        self.first_day = int(days.min())
+        n_days = int(days.max()) - self.first_day + 1
+        self.width = int(currency_keys.max()) + 1
+
+        matrix = np.full((n_days, self.width), np.nan, dtype=np.float64)
+        matrix[days - self.first_day, currency_keys] = rates
+
+        # Forward-fill gaps per currency, then back-fill leading days
+        known = ~np.isnan(matrix)
+        idx = np.where(known, np.arange(n_days)[:, None], -1)
+        np.maximum.accumulate(idx, axis=0, out=idx)
+        idx = np.where(idx < 0, known.argmax(axis=0)[None, :], idx)
+        self.rates = matrix[idx, np.arange(self.width)[None, :]]
+
+        # CurrencyKeys without rates stay NaN (from_frames rejects them)
+        self.currency_keys = np.unique(currency_keys)
+
+    @classmethod
+    def from_frames(cls, fx_df, currency_df, base_currency=None):
+        """
+        Build from exchange_rates (Date, FromCurrency, ToCurrency, Rate)
+        and currency (CurrencyKey, ISOCode) frames; rates are normalized
+        with rates_per_base first.
+        """
+        if base_currency is None:
+            bases = fx_df["FromCurrency"].unique()
+            if len(bases) != 1:
+                raise ValueError(
+                    f"exchange_rates.parquet has several base currencies: {list(bases)}"
+                )
+            base_currency = bases[0]
+
+        fx_df = fx_df[fx_df["FromCurrency"] == base_currency]
+        key_of = dict(zip(currency_df["ISOCode"], currency_df["CurrencyKey"]))
+
+        missing = sorted(set(key_of) - set(fx_df["ToCurrency"]))
+        if missing:
+            raise ValueError(
+                f"No {base_currency} exchange rates for currencies: {missing}"
+            )
+
+        fx_df = fx_df[fx_df["ToCurrency"].isin(key_of)]
+        return cls(
+            fx_df["Date"].to_numpy("datetime64[D]"),
+            fx_df["ToCurrency"].map(key_of).to_numpy(np.int64),
+            rates_per_base(fx_df["ToCurrency"], fx_df["Rate"], base_currency),
+        )
+
+    def lookup(self, order_dates, currency_keys) -> np.ndarray:
+        """Rate per row for its order date and CurrencyKey."""
+        days = np.asarray(order_dates).astype("datetime64[D]", copy=False).view(np.int64)
+        flat = np.clip(days - self.first_day, 0, len(self.rates) - 1) * self.width
+        flat += currency_keys
+        return self.rates.ravel()[flat]
+
+    def __repr__(self):
+        return f"FxRates({len(self.rates):,} days x {len(self.currency_keys):,} currencies)"
+
+
+__all__ = ["FxRates", "USD_QUOTED_CURRENCIES", "rates_per_base"]
@@ -57,11 +57,19 @@ class State:
     # Core runtime flags / data
     # --------------------------------------------------------------
     skip_order_cols = None
-    product_np = None
+    product_store = None
+    gather_arena = None
     customers = None
+    customer_sampler = None
     date_pool = None
     date_prob = None
     store_keys = None
+    store_sampler = None
+    store_locality = None
+    basket_affinity = None
+    product_popularity = None
+    price_history = None
+    fx_rates = None
 
     # --------------------------------------------------------------
     # Promotions
@@ -86,6 +94,9 @@ class State:
     out_folder = None
     row_group_size = None
     compression = None
+    ipc_compression = None
+    csv_compression = None
+    csv_target_bytes = None
 
     # --------------------------------------------------------------
     # Delta options
@@ -162,7 +173,9 @@ def bind_globals(gdict: dict):
                 "skip_order_cols must be bound before Sales schema initialization"
             )
 
-        logical_schema = get_sales_schema(State.skip_order_cols)
+        logical_schema = get_sales_schema(
+            State.skip_order_cols, State.fx_rates is not None
+        )
         State.sales_schema = _logical_to_arrow_schema(logical_schema)
 
 
@@ -0,0 +1,212 @@
+import numpy as np
+
+from src.engine.dimension_loader import DimensionHandle
+from src.utils.logging_utils import warn
+
+
+# End date null -> active indefinitely
+_OPEN_FOREVER = np.iinfo(np.int64).max
+
+# Redraw rounds before leftovers are resolved exactly per date
+_MAX_REDRAWS = 8
+
+
+def day_numbers(column) -> np.ndarray:
+    """Timestamp / date Arrow column -> int64 day numbers (null -> _OPEN_FOREVER)."""
+    days = column.to_numpy(zero_copy_only=False).astype("datetime64[D]")
+    out = days.astype(np.int64)
+    out[np.isnat(days)] = _OPEN_FOREVER
+    return out
+
+
+class LifecycleIndex:
+    """
+    Key sampler that only returns members (stores, customers) active on
+    each row's date.
+
+    A member is active on day d when start <= d < end (no end date:
+    active indefinitely). Members are sorted by start day, so the ones
+    started by day d are a prefix of that order; a dense day-offset ->
+    prefix-length array makes the prefix lookup O(1).
+
+    Rows draw from their prefix (uniform: O(1); weighted: binary search
+    on prefix weight sums) and redraw when they hit a member that has
+    already ended. Ended members are a minority, so a few vectorized
+    rounds settle almost every row; leftovers are resolved exactly per
+    date.
+
+    Keys may repeat (e.g. the heavy-user expanded customer pool); each
+    entry is then one uniform draw slot.
+    """
+
+    def __init__(self, keys, start_days, end_days=None, weights=None, label="store"):
+        keys = np.asarray(keys, dtype=np.int64)
+        start_days = np.asarray(start_days, dtype=np.int64)
+        if end_days is None:
+            end_days = np.full(len(keys), _OPEN_FOREVER, dtype=np.int64)
+        end_days = np.asarray(end_days, dtype=np.int64)
+
+        self.label = label
+        if not (len(keys) == len(start_days) == len(end_days)):
+            raise ValueError(f"{label.title()} lifecycle arrays must have equal lengths")
+        if len(keys) == 0:
+            raise ValueError(f"{label.title()} lifecycle index requires at least one {label}")
+
+        order = np.lexsort((keys, start_days))
+        self.keys = keys[order]
+        self.start = start_days[order]
+        self.end = end_days[order]
+
+        # Dense per-day lookups over [first_day, last event day]:
+        #   prefix_len[d - first_day]  members started on or before day d
+        #   active_len[d - first_day]  members active on day d
+        finite_end = np.sort(self.end[self.end != _OPEN_FOREVER])
+        self.first_day = int(self.start[0])
+        last_day = max(
+            int(self.start[-1]),
+            int(finite_end[-1]) if finite_end.size else 0,
+        )
+        span = np.arange(self.first_day, last_day + 1, dtype=np.int64)
+
+        self.prefix_len = np.searchsorted(self.start, span, side="right").astype(np.int64)
+        self.active_len = self.prefix_len - np.searchsorted(
+            finite_end, span, side="right"
+        )
+        self._active_after = len(self.keys) - finite_end.size
+
+        self.cum_weights = None
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)[order]
+            if len(weights) != len(self.keys):
+                raise ValueError(f"{label.title()} weights must match the number of keys")
+            if not np.all(np.isfinite(weights)) or (weights < 0).any():
+                raise ValueError(f"{label.title()} weights must be finite and >= 0")
+            if weights.sum() <= 0:
+                raise ValueError(f"{label.title()} weights must not all be zero")
+            self.cum_weights = np.cumsum(weights)
+
+    @classmethod
+    def from_parquet(
+        cls,
+        path,
+        key_column,
+        start_column,
+        end_column,
+        weight_column=None,
+        label="store",
+    ):
+        """Build the index from a dimension parquet (projected read)."""
+        handle = DimensionHandle(f"{label}s", path)
+        cols = [key_column, start_column, end_column]
+        if weight_column:
+            cols.append(weight_column)
+
+        table = handle.arrow(cols)
+        weights = None
+        if weight_column:
+            weights = table[weight_column].to_numpy(zero_copy_only=False)
+
+        return cls(
+            table[key_column].to_numpy(),
+            day_numbers(table[start_column]),
+            day_numbers(table[end_column]),
+            weights,
+            label=label,
+        )
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _lookup(self, dense, days, after):
+        offsets = np.asarray(days, dtype=np.int64) - self.first_day
+        clipped = np.clip(offsets, 0, len(dense) - 1)
+        out = dense[clipped]
+        out[offsets < 0] = 0
+        out[offsets >= len(dense)] = after
+        return out
+
+    def started_by(self, days) -> np.ndarray:
+        """Number of members started on or before each day (prefix length)."""
+        return self._lookup(self.prefix_len, days, len(self.keys))
+
+    def active_count(self, days) -> np.ndarray:
+        """Number of members active on each day."""
+        return self._lookup(self.active_len, days, self._active_after)
+
+    def active_on(self, day) -> np.ndarray:
+        """Sorted-order indices of the members active on one day."""
+        k = int(self.started_by(np.array([day]))[0])
+        return np.nonzero(self.end[:k] > day)[0]
+
+    def _draw(self, rng, prefix):
+        if self.cum_weights is None:
+            j = (rng.random(len(prefix)) * prefix).astype(np.int64)
+            return np.minimum(j, prefix - 1)
+
+        u = rng.random(len(prefix)) * self.cum_weights[prefix - 1]
+        j = np.searchsorted(self.cum_weights, u, side="right")
+        return np.minimum(j, prefix - 1)
+
+    def _draw_exact(self, rng, day, count):
+        idx = self.active_on(day)
+        if idx.size == 0:
+            return None
+        if self.cum_weights is None:
+            return idx[rng.integers(0, idx.size, size=count)]
+
+        w = np.diff(self.cum_weights, prepend=0.0)[idx]
+        total = w.sum()
+        if total <= 0:
+            return idx[rng.integers(0, idx.size, size=count)]
+        return idx[rng.choice(idx.size, size=count, p=w / total)]
+
+    def sample(self, rng, order_dates) -> np.ndarray:
+        """
+        One key per row, active on that row's order date.
+        Rows whose date has no active member fall back to any member.
+        """
+        days = np.asarray(order_dates).astype("datetime64[D]").astype(np.int64)
+        n = len(days)
+        chosen = np.full(n, -1, dtype=np.int64)
+
+        prefix = self.started_by(days)
+        pending = np.nonzero(self.active_count(days) > 0)[0]
+
+        for _ in range(_MAX_REDRAWS):
+            if pending.size == 0:
+                break
+            j = self._draw(rng, prefix[pending])
+            ok = self.end[j] > days[pending]
+            chosen[pending[ok]] = j[ok]
+            pending = pending[~ok]
+
+        # Leftovers: unlucky redraws (exact per date), or dates with no
+        # active member (any member; see check_coverage)
+        leftover = np.nonzero(chosen < 0)[0]
+        for day in np.unique(days[leftover]):
+            rows = leftover[days[leftover] == day]
+            picks = self._draw_exact(rng, day, rows.size)
+            if picks is None:
+                picks = rng.integers(0, len(self.keys), size=rows.size)
+            chosen[rows] = picks
+
+        return self.keys[chosen]
+
+    def check_coverage(self, date_pool):
+        """Warn about dates in date_pool on which no member is active."""
+        days = np.asarray(date_pool).astype("datetime64[D]").astype(np.int64)
+        missing = days[self.active_count(days) <= 0]
+        if missing.size:
+            first, last = missing.min(), missing.max()
+            warn(
+                f"No {self.label} active on {missing.size:,} sales date(s) "
+                f"({np.datetime64(first, 'D')} .. {np.datetime64(last, 'D')}); "
+                f"rows on those dates are sampled from all {self.label}s"
+            )
+        return missing.size
+
+    def __repr__(self):
+        return f"LifecycleIndex({len(self):,} {self.label}s)"
+
+
+__all__ = ["LifecycleIndex", "day_numbers"]
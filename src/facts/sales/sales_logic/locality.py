@@ -0,0 +1,150 @@
+import numpy as np
+
+from .lifecycle import _MAX_REDRAWS
+
+
+LEVELS = ("geography", "country")
+
+
+def _region_dtype(n_regions):
+    return np.int16 if n_regions < np.iinfo(np.int16).max else np.int32
+
+
+class StoreLocality:
+    """
+    Customer -> store sampler with geographic locality.
+
+    local_pct of rows buy at a physical store in the customer's region
+    (GeographyKey, or its country); the rest, and customers whose region
+    has no physical store, buy at an online store.
+
+    Both lookups are precomputed once per process:
+
+    - cust_region   dense CustomerKey -> region id (-1 unknown)
+    - CSR           region id -> stores (offsets + flat store arrays);
+                    the last segment holds the online stores
+
+    so a row costs a region gather and a store gather. With store
+    opening / closing days, picks of stores not trading on the row's
+    date are redrawn within the same segment; rows that still have no
+    store go to the fallback sampler (lifecycle index or uniform).
+    """
+
+    def __init__(
+        self,
+        customer_keys,
+        customer_geo,
+        store_keys,
+        store_geo,
+        store_online,
+        geo_keys,
+        geo_region,
+        local_pct,
+        store_start=None,
+        store_end=None,
+    ):
+        if not 0 <= float(local_pct) <= 100:
+            raise ValueError("sales.locality.local_pct must be between 0 and 100")
+        self.local_p = float(local_pct) / 100
+
+        customer_keys = np.asarray(customer_keys, dtype=np.int64)
+        store_keys = np.asarray(store_keys, dtype=np.int64)
+        store_online = np.asarray(store_online, dtype=bool)
+        if len(store_keys) == 0:
+            raise ValueError("Store locality requires at least one store")
+
+        # GeographyKey -> region id (dense)
+        geo_keys = np.asarray(geo_keys, dtype=np.int64)
+        geo_region = np.asarray(geo_region, dtype=np.int64)
+        n_regions = int(geo_region.max()) + 1 if geo_region.size else 0
+        self.online_region = n_regions
+        dtype = _region_dtype(n_regions + 1)
+
+        geo_to_region = np.full(int(geo_keys.max()) + 1, -1, dtype=dtype)
+        geo_to_region[geo_keys] = geo_region
+
+        def _regions(geo):
+            geo = np.asarray(geo, dtype=np.int64)
+            out = np.full(len(geo), -1, dtype=dtype)
+            known = (geo >= 0) & (geo < len(geo_to_region))
+            out[known] = geo_to_region[geo[known]]
+            return out
+
+        # CustomerKey -> region id (dense)
+        self.cust_region = np.full(int(customer_keys.max()) + 1, -1, dtype=dtype)
+        self.cust_region[customer_keys] = _regions(customer_geo)
+
+        # Region -> stores (CSR); online stores form the last segment
+        segment = np.where(store_online, self.online_region, _regions(store_geo))
+        keep = segment >= 0
+        order = np.argsort(segment[keep], kind="stable")
+
+        self.store_keys = store_keys[keep][order]
+        counts = np.bincount(segment[keep], minlength=n_regions + 1)
+        self.offsets = np.zeros(n_regions + 2, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        self.counts = counts.astype(np.int64)
+
+        self.store_start = self.store_end = None
+        if store_start is not None:
+            self.store_start = np.asarray(store_start, dtype=np.int64)[keep][order]
+            self.store_end = np.asarray(store_end, dtype=np.int64)[keep][order]
+
+        self._all_keys = store_keys
+
+    def __len__(self):
+        return len(self.store_keys)
+
+    def _trading(self, j, days):
+        if self.store_start is None:
+            return np.ones(len(j), dtype=bool)
+        return (self.store_start[j] <= days) & (days < self.store_end[j])
+
+    def sample(self, rng, customer_keys, order_dates, fallback=None) -> np.ndarray:
+        """
+        One store key per row. fallback (a LifecycleIndex, or None for
+        uniform) covers rows with neither a local nor an online store.
+        """
+        n = len(customer_keys)
+        days = np.asarray(order_dates).astype("datetime64[D]").astype(np.int64)
+
+        region = self.cust_region[customer_keys].astype(np.int64)
+        online = (region < 0) | (rng.random(n) >= self.local_p)
+        region[online] = self.online_region
+
+        # Regions without physical stores buy online
+        region[self.counts[region] == 0] = self.online_region
+
+        chosen = np.full(n, -1, dtype=np.int64)
+        pending = np.nonzero(self.counts[region] > 0)[0]
+
+        for _ in range(_MAX_REDRAWS):
+            if pending.size == 0:
+                break
+            r = region[pending]
+            j = self.offsets[r] + (rng.random(pending.size) * self.counts[r]).astype(np.int64)
+            ok = self._trading(j, days[pending])
+            chosen[pending[ok]] = j[ok]
+            pending = pending[~ok]
+
+        out = np.empty(n, dtype=np.int64)
+        found = chosen >= 0
+        out[found] = self.store_keys[chosen[found]]
+
+        rest = np.nonzero(~found)[0]
+        if rest.size:
+            if fallback is not None:
+                out[rest] = fallback.sample(rng, order_dates[rest])
+            else:
+                out[rest] = self._all_keys[rng.integers(0, len(self._all_keys), size=rest.size)]
+
+        return out
+
+    def __repr__(self):
+        return (
+            f"StoreLocality({self.online_region:,} regions, "
+            f"{len(self):,} stores, local {self.local_p:.0%})"
+        )
+
+
+__all__ = ["LEVELS", "StoreLocality"]
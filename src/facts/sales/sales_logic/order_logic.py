@@ -11,6 +11,7 @@ def build_orders(
     product_keys,          # kept for API stability (not used here)
     _len_date_pool: int,
     _len_customers: int,
+    customer_sampler=None,
 ):
     """
     Generate order-level structure and expand to line-level rows.
@@ -19,6 +20,9 @@ def build_orders(
       - customer_keys
       - order_dates
       - (optionally) order_ids_int, line_num, order_ids_str
+
+    With a customer_sampler, each order's customer is drawn from the
+    customers active on its order date.
     """
 
     if skip_cols not in (True, False):
@@ -53,8 +57,11 @@ def build_orders(
 
     order_ids_int = date_int * 1_000_000_000 + suffix_int
 
-    cust_idx = rng.integers(0, _len_customers, size=order_count)
-    order_customers = customers[cust_idx].astype(np.int64, copy=False)
+    if customer_sampler is None:
+        cust_idx = rng.integers(0, _len_customers, size=order_count)
+        order_customers = customers[cust_idx].astype(np.int64, copy=False)
+    else:
+        order_customers = customer_sampler.sample(rng, order_dates)
 
     # ------------------------------------------------------------
     # Lines per order
@@ -0,0 +1,71 @@
+import numpy as np
+
+
+def popularity_weights(
+    n,
+    zipf_exponent=None,
+    unit_price=None,
+    price_exponent=0.0,
+    classes=None,
+    class_weights=None,
+    subcategories=None,
+    subcategory_weights=None,
+    seed=42,
+) -> np.ndarray:
+    """
+    Relative demand per product (row order of the product store).
+
+    Factors multiply; each is skipped when not configured:
+
+    - zipf_exponent        1 / rank ** s over a seeded random ranking,
+                           so popularity is not tied to ProductKey order
+    - price_exponent       UnitPrice ** e (e < 0: cheaper sells more)
+    - class_weights        {Class: weight}, unlisted classes weigh 1
+    - subcategory_weights  {SubcategoryKey: weight}, unlisted weigh 1
+    """
+    weights = np.ones(n, dtype=np.float64)
+
+    if zipf_exponent:
+        s = float(zipf_exponent)
+        if s < 0:
+            raise ValueError("sales.product_popularity.zipf_exponent must be >= 0")
+        rank = np.empty(n, dtype=np.float64)
+        rank[np.random.default_rng(seed).permutation(n)] = np.arange(1, n + 1)
+        weights *= rank ** -s
+
+    if price_exponent:
+        if unit_price is None:
+            raise ValueError("price_exponent needs unit_price")
+        price = np.asarray(unit_price, dtype=np.float64)
+        # Free / unpriced products get the smallest positive price
+        positive = price[price > 0]
+        floor = positive.min() if positive.size else 1.0
+        weights *= np.maximum(price, floor) ** float(price_exponent)
+
+    if class_weights:
+        if classes is None:
+            raise ValueError("class_weights needs the products Class column")
+        labels = np.asarray(classes, dtype=object)
+        factor = np.ones(n, dtype=np.float64)
+        for label, w in class_weights.items():
+            factor[labels == label] = float(w)
+        weights *= factor
+
+    if subcategory_weights:
+        if subcategories is None:
+            raise ValueError("subcategory_weights needs SubcategoryKey")
+        sub = np.asarray(subcategories, dtype=np.int64)
+        factor = np.ones(n, dtype=np.float64)
+        for key, w in subcategory_weights.items():
+            factor[sub == int(key)] = float(w)
+        weights *= factor
+
+    if not np.all(np.isfinite(weights)) or (weights < 0).any():
+        raise ValueError("sales.product_popularity weights must be finite and >= 0")
+    if weights.sum() <= 0:
+        raise ValueError("sales.product_popularity weights must not all be zero")
+
+    return weights
+
+
+__all__ = ["popularity_weights"]
@@ -0,0 +1,168 @@
+import numpy as np
+import pyarrow as pa
+
+
+PRICE_HISTORY_SCHEMA = pa.schema([
+    ("ProductKey", pa.int64()),
+    ("MonthStartDate", pa.date32()),
+    ("UnitPrice", pa.float64()),
+    ("UnitCost", pa.float64()),
+    ("IsMarkdown", pa.int8()),
+])
+
+# Products per block when building / exporting (bounds temporaries)
+_BLOCK = 100_000
+
+# No clearance
+_NEVER = np.iinfo(np.int64).max
+
+
+def _month_number(value) -> int:
+    return int(np.datetime64(str(value), "M").astype(np.int64))
+
+
+class PriceHistory:
+    """
+    Dense (product x month) list price and cost matrices.
+
+    Month 0 is the month of the sales start date, where every product
+    sells at its Products UnitPrice / UnitCost. From there:
+
+    - periodic increases: each product reprices every
+      increase_every_months months on its own phase, by its own rate
+      around annual_increase_pct (cost moves with price)
+    - lifecycle markdowns: markdown_products_pct of products enter
+      clearance at a month in 1..markdown_horizon_months and sell
+      markdown_pct below list from then on (cost unchanged)
+
+    Per-product parameters do not depend on the range length, so an
+    append run that extends the end date keeps earlier months' prices.
+
+    Matrices are float64 rounded to cents (the same dtype as the
+    ProductStore columns); a row's price is one gather at
+    product_idx * n_months + month_idx, no date-range search.
+    """
+
+    def __init__(
+        self,
+        unit_price,
+        unit_cost,
+        start_date,
+        end_date,
+        increase_every_months=12,
+        annual_increase_pct=4.0,
+        markdown_products_pct=20.0,
+        markdown_pct=30.0,
+        markdown_horizon_months=48,
+        seed=42,
+    ):
+        cadence = int(increase_every_months)
+        if cadence < 1:
+            raise ValueError("sales.price_history.increase_every_months must be >= 1")
+        if not 0 <= float(markdown_products_pct) <= 100:
+            raise ValueError("sales.price_history.markdown_products_pct must be between 0 and 100")
+        if not 0 <= float(markdown_pct) < 100:
+            raise ValueError("sales.price_history.markdown_pct must be in [0, 100)")
+        if int(markdown_horizon_months) < 1:
+            raise ValueError("sales.price_history.markdown_horizon_months must be >= 1")
+
+        self.first_month = _month_number(start_date)
+        last_month = _month_number(end_date)
+        if last_month < self.first_month:
+            raise ValueError("Price history end date is before its start date")
+        self.n_months = last_month - self.first_month + 1
+
+        # Dense day -> month index over the covered months (a date to
+        # month conversion per row costs more than this gather)
+        month_starts = np.arange(
+            self.first_month, last_month + 2
+        ).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+        self.first_day = int(month_starts[0])
+        self.day_month = np.repeat(
+            np.arange(self.n_months, dtype=np.int32), np.diff(month_starts)
+        )
+
+        unit_price = np.asarray(unit_price, dtype=np.float64)
+        unit_cost = np.asarray(unit_cost, dtype=np.float64)
+        P = len(unit_price)
+
+        # Per-product schedule (independent of the number of months)
+        rng = np.random.default_rng(seed)
+        phase = rng.integers(0, cadence, size=P)
+        rate = float(annual_increase_pct) / 100 * rng.uniform(0.5, 1.5, size=P)
+        step_log = np.log1p(rate) * cadence / 12
+        marked = rng.random(P) < float(markdown_products_pct) / 100
+        clearance = rng.integers(1, int(markdown_horizon_months) + 1, size=P)
+
+        self.clearance_month = np.where(marked, clearance, _NEVER)
+        self.markdown_factor = 1.0 - float(markdown_pct) / 100
+
+        M = self.n_months
+        self.price = np.empty((P, M), dtype=np.float64)
+        self.cost = np.empty((P, M), dtype=np.float64)
+
+        months = np.arange(M, dtype=np.int64)
+        for lo in range(0, P, _BLOCK):
+            hi = min(lo + _BLOCK, P)
+            steps = (months[None, :] + phase[lo:hi, None]) // cadence
+            growth = np.exp(steps * step_log[lo:hi, None])
+
+            cost = unit_cost[lo:hi, None] * growth
+            price = unit_price[lo:hi, None] * growth
+            in_clearance = months[None, :] >= self.clearance_month[lo:hi, None]
+            price = np.where(in_clearance, price * self.markdown_factor, price)
+
+            self.price[lo:hi] = np.round(price, 2)
+            self.cost[lo:hi] = np.round(cost, 2)
+
+    def __len__(self):
+        return len(self.price)
+
+    def month_index(self, order_dates) -> np.ndarray:
+        days = np.asarray(order_dates).astype("datetime64[D]", copy=False).view(np.int64)
+        days = np.clip(days - self.first_day, 0, len(self.day_month) - 1)
+        return self.day_month[days]
+
+    def lookup(self, prod_idx, order_dates, arena=None):
+        """(unit_price, unit_cost) per row for the order month."""
+        flat = np.asarray(prod_idx, dtype=np.int64) * self.n_months
+        flat += self.month_index(order_dates)
+
+        if arena is None:
+            return self.price.ravel()[flat], self.cost.ravel()[flat]
+        return (
+            arena.take("history.unit_price", self.price.ravel(), flat),
+            arena.take("history.unit_cost", self.cost.ravel(), flat),
+        )
+
+    def iter_batches(self, product_keys):
+        """ProductPriceHistory record batches (product-major)."""
+        product_keys = np.asarray(product_keys, dtype=np.int64)
+        M = self.n_months
+        month_starts = (
+            np.arange(self.first_month, self.first_month + M)
+            .astype("datetime64[M]")
+            .astype("datetime64[D]")
+        )
+        months = np.arange(M, dtype=np.int64)
+
+        for lo in range(0, len(self), _BLOCK):
+            hi = min(lo + _BLOCK, len(self))
+            n = hi - lo
+            markdown = months[None, :] >= self.clearance_month[lo:hi, None]
+            yield pa.RecordBatch.from_arrays(
+                [
+                    pa.array(np.repeat(product_keys[lo:hi], M)),
+                    pa.array(np.tile(month_starts, n)),
+                    pa.array(self.price[lo:hi].ravel()),
+                    pa.array(self.cost[lo:hi].ravel()),
+                    pa.array(markdown.ravel().astype(np.int8)),
+                ],
+                schema=PRICE_HISTORY_SCHEMA,
+            )
+
+    def __repr__(self):
+        return f"PriceHistory({len(self):,} products x {self.n_months:,} months)"
+
+
+__all__ = ["PRICE_HISTORY_SCHEMA", "PriceHistory"]
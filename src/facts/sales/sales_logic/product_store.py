@@ -0,0 +1,112 @@
+import numpy as np
+
+from src.engine.dimension_loader import DimensionHandle
+
+
+def _key_array(values) -> np.ndarray:
+    """Contiguous int32 keys (int64 only if a key does not fit)."""
+    values = np.asarray(values)
+    if values.size and int(values.max()) > np.iinfo(np.int32).max:
+        return np.ascontiguousarray(values, dtype=np.int64)
+    return np.ascontiguousarray(values, dtype=np.int32)
+
+
+class GatherArena:
+    """
+    Reusable per-process output buffers for row gathers.
+
+    A buffer is only reallocated when a chunk needs more rows than it
+    holds; returned arrays are views that stay valid until the next
+    gather into the same name.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+
+    def buffer(self, name, dtype, n) -> np.ndarray:
+        buf = self._buffers.get(name)
+        if buf is None or buf.dtype != dtype or len(buf) < n:
+            buf = np.empty(n, dtype=dtype)
+            self._buffers[name] = buf
+        return buf[:n]
+
+    def take(self, name, values, idx) -> np.ndarray:
+        out = self.buffer(name, values.dtype, len(idx))
+        np.take(values, idx, out=out)
+        return out
+
+
+class ProductStore:
+    """
+    Products as separate typed, contiguous columns (struct of arrays):
+
+    - keys              int32 ProductKey
+    - unit_price        float64 (already rounded to cents by the dimension)
+    - unit_cost         float64
+    - subcategory_keys  int32, optional
+
+    Row samples gather only the columns they need, one np.take per
+    column, instead of copying rows of a mixed 2-D float matrix.
+    """
+
+    __slots__ = ("keys", "unit_price", "unit_cost", "subcategory_keys")
+
+    def __init__(self, keys, unit_price, unit_cost, subcategory_keys=None):
+        self.keys = _key_array(keys)
+        self.unit_price = np.ascontiguousarray(unit_price, dtype=np.float64)
+        self.unit_cost = np.ascontiguousarray(unit_cost, dtype=np.float64)
+        self.subcategory_keys = (
+            None if subcategory_keys is None else _key_array(subcategory_keys)
+        )
+
+        n = len(self.keys)
+        lengths = {len(self.unit_price), len(self.unit_cost)}
+        if self.subcategory_keys is not None:
+            lengths.add(len(self.subcategory_keys))
+        if lengths != {n}:
+            raise ValueError("ProductStore columns must have equal lengths")
+        if n == 0:
+            raise ValueError("ProductStore requires at least one product")
+
+    @classmethod
+    def from_parquet(cls, path):
+        """Projected read of the product columns the sales engine uses."""
+        handle = DimensionHandle("products", path)
+        cols = ["ProductKey", "UnitPrice", "UnitCost"]
+        if "SubcategoryKey" in handle.columns:
+            cols.append("SubcategoryKey")
+
+        table = handle.arrow(cols)
+        sub = table["SubcategoryKey"] if "SubcategoryKey" in cols else None
+        return cls(
+            table["ProductKey"].to_numpy(),
+            table["UnitPrice"].to_numpy(),
+            table["UnitCost"].to_numpy(),
+            None if sub is None else sub.to_numpy(),
+        )
+
+    def __len__(self):
+        return len(self.keys)
+
+    def gather(self, idx, arena=None, columns=("keys", "unit_price", "unit_cost")):
+        """
+        Gather the given columns for row indices idx.
+        Returns {column: array}; with an arena the arrays are views into
+        its reusable buffers.
+        """
+        out = {}
+        for name in columns:
+            values = getattr(self, name)
+            if values is None:
+                raise ValueError(f"ProductStore has no {name} column")
+            if arena is None:
+                out[name] = values[idx]
+            else:
+                out[name] = arena.take(f"product.{name}", values, idx)
+        return out
+
+    def __repr__(self):
+        return f"ProductStore({len(self):,} products)"
+
+
+__all__ = ["GatherArena", "ProductStore"]
@@ -0,0 +1,271 @@
+import os
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Pool, cpu_count
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pyarrow as pa
+
+from src.utils.logging_utils import info, warn, done, fmt_sec
+from .sales import (
+    resolve_sales_dates,
+    load_sales_dimensions,
+    build_weighted_date_pool,
+    build_chunk_tasks,
+    build_worker_cfg,
+    build_price_history,
+)
+from .sales_worker import init_sales_worker, _stream_task
+
+
+ARROW_STREAM_MIME = "application/vnd.apache.arrow.stream"
+
+
+# =====================================================================
+# Request parsing
+# =====================================================================
+
+def _parse_sales_request(query: dict, server):
+    """
+    Map query parameters onto generate_sales_fact inputs.
+
+    rows  -> total_rows   (default: sales.total_rows)
+    seed  -> seed         (date pool weights + chunk seeds)
+    start -> start_date   (default: defaults.dates.start)
+    end   -> end_date     (default: defaults.dates.end)
+    chunk -> chunk_size   (default: server chunk size)
+    """
+    def _one(name):
+        values = query.get(name)
+        return values[-1] if values else None
+
+    rows = _one("rows")
+    rows = server.default_rows if rows is None else int(rows)
+    if rows < 0:
+        raise ValueError("rows must be >= 0")
+    if server.max_rows and rows > server.max_rows:
+        raise ValueError(f"rows exceeds server limit ({server.max_rows:,})")
+
+    chunk = _one("chunk")
+    chunk = server.chunk_size if chunk is None else int(chunk)
+    if chunk <= 0:
+        raise ValueError("chunk must be > 0")
+
+    seed = _one("seed")
+    seed = server.seed if seed is None else int(seed)
+
+    start = _one("start") or server.start_date
+    end = _one("end") or server.end_date
+    if np.datetime64(start, "D") > np.datetime64(end, "D"):
+        raise ValueError("start must be <= end")
+
+    return rows, chunk, seed, start, end
+
+
+# =====================================================================
+# HTTP handler
+# =====================================================================
+
+class SalesRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET /sales?rows=&seed=&start=&end=&chunk=
+
+    Responds with an Arrow IPC stream of Sales record batches.
+    Backpressure: at most `max_inflight` chunks per client are queued
+    in the shared pool; the next chunk is only scheduled after the
+    oldest one has been written to the client socket.
+    """
+
+    server_version = "ContosoSales/1.0"
+
+    def log_message(self, format, *args):
+        # Route http.server access logs through our logger
+        info(f"{self.address_string()} - {format % args}")
+
+    def _error(self, code, msg):
+        body = (msg + "\n").encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/sales":
+            self._error(404, "Not found. Use GET /sales")
+            return
+
+        try:
+            rows, chunk, seed, start, end = _parse_sales_request(
+                parse_qs(url.query), self.server
+            )
+        except ValueError as ex:
+            self._error(400, str(ex))
+            return
+
+        self._stream_sales(rows, chunk, seed, start, end)
+
+    def _stream_sales(self, rows, chunk, seed, start, end):
+        server = self.server
+        client = self.address_string()
+
+        # Same date seasonality and chunk seeds as generate_sales_fact
+        date_pool, date_prob = build_weighted_date_pool(start, end, seed)
+        tasks = [
+            (idx, batch, s, date_pool, date_prob)
+            for idx, batch, s in build_chunk_tasks(rows, chunk, seed + 1)
+        ]
+
+        self.send_response(200)
+        self.send_header("Content-Type", ARROW_STREAM_MIME)
+        self.end_headers()
+
+        info(
+            f"Client {client}: {rows:,} rows, seed={seed}, "
+            f"{start}..{end}"
+        )
+
+        t0 = time.time()
+        sent = 0
+        pending = deque()
+        next_task = 0
+
+        try:
+            with pa.ipc.new_stream(self.wfile, server.schema) as writer:
+                while next_task < len(tasks) or pending:
+                    while (
+                        next_task < len(tasks)
+                        and len(pending) < server.max_inflight
+                    ):
+                        pending.append(
+                            server.pool.apply_async(
+                                _stream_task, (tasks[next_task],)
+                            )
+                        )
+                        next_task += 1
+
+                    _, table = pending.popleft().get()
+                    writer.write_table(table)
+                    sent += table.num_rows
+                    del table
+
+        except (BrokenPipeError, ConnectionResetError):
+            warn(
+                f"Client {client} disconnected after {sent:,} rows; "
+                f"dropping {len(pending)} queued chunk(s)"
+            )
+            return
+
+        elapsed = time.time() - t0
+        rate = sent / elapsed if elapsed > 0 else 0.0
+        done(
+            f"Client {client}: streamed {sent:,} rows in "
+            f"{fmt_sec(elapsed)} ({rate:,.0f} rows/s)"
+        )
+
+
+class SalesServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+# =====================================================================
+# Entry point
+# =====================================================================
+
+def run_sales_server(
+    cfg,
+    host="127.0.0.1",
+    port=8765,
+    workers=None,
+    max_inflight=2,
+    chunk_size=100_000,
+    max_rows=None,
+):
+    """
+    Serve Sales as Arrow IPC streams over HTTP until interrupted.
+
+    All clients share one worker pool initialized once with the
+    dimensions from sales.parquet_folder; the dimensions must exist
+    (run the generator first).
+    """
+    sales_cfg = cfg["sales"]
+    parquet_folder = sales_cfg["parquet_folder"]
+
+    if not os.path.exists(os.path.join(parquet_folder, "customers.parquet")):
+        raise RuntimeError(
+            f"Dimensions not found in {parquet_folder}; "
+            "run the generator once before serving"
+        )
+
+    if max_inflight < 1:
+        raise ValueError("max_inflight must be >= 1")
+
+    start_date, end_date = resolve_sales_dates(cfg)
+    seed = 42
+
+    dims = load_sales_dimensions(
+        parquet_folder,
+        seed=seed,
+        store_lifecycle=sales_cfg.get("store_lifecycle"),
+        customer_lifecycle=sales_cfg.get("customer_lifecycle"),
+        locality=sales_cfg.get("locality"),
+        basket_affinity=sales_cfg.get("basket_affinity"),
+        product_popularity=sales_cfg.get("product_popularity"),
+        local_currency=sales_cfg.get("local_currency"),
+    )
+    date_pool, date_prob = build_weighted_date_pool(start_date, end_date, seed)
+
+    skip_order_cols = bool(sales_cfg.get("skip_order_cols", False))
+    worker_cfg = build_worker_cfg(
+        dims,
+        date_pool,
+        date_prob,
+        file_format="parquet",
+        skip_order_cols=skip_order_cols,
+        price_history=build_price_history(
+            dims["product_store"],
+            start_date,
+            end_date,
+            sales_cfg.get("price_history"),
+            seed,
+        ),
+    )
+
+    if workers is None:
+        workers = sales_cfg.get("workers") or max(1, cpu_count() - 1)
+    workers = max(1, int(workers))
+
+    server = SalesServer((host, int(port)), SalesRequestHandler)
+    server.seed = seed
+    server.start_date = str(start_date)
+    server.end_date = str(end_date)
+    server.default_rows = int(sales_cfg["total_rows"])
+    server.chunk_size = int(chunk_size)
+    server.max_rows = int(max_rows) if max_rows else None
+    server.max_inflight = int(max_inflight)
+
+    with Pool(
+        processes=workers,
+        initializer=init_sales_worker,
+        initargs=(worker_cfg,),
+    ) as pool:
+        server.pool = pool
+
+        # Resolve the streamed schema once (identical in every worker)
+        _, probe = pool.apply(_stream_task, ((0, 1, seed),))
+        server.schema = probe.schema
+
+        info(
+            f"Serving sales on http://{host}:{server.server_address[1]}/sales "
+            f"({workers} workers, {max_inflight} chunk(s) in flight per client)"
+        )
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            info("Shutting down sales server...")
+        finally:
+            server.server_close()
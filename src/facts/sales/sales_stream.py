@@ -0,0 +1,214 @@
+import queue
+from collections import deque
+from multiprocessing import cpu_count
+
+from src.utils.mp_utils import pool_context
+
+from .sales import (
+    resolve_sales_dates,
+    load_sales_dimensions,
+    build_weighted_date_pool,
+    build_chunk_tasks,
+    build_worker_cfg,
+    build_price_history,
+)
+from .sales_worker import init_sales_worker, _stream_task
+from .sales_logic.globals import State
+
+
+# =====================================================================
+# Helpers
+# =====================================================================
+
+def _table_batches(table, batch_size):
+    if batch_size:
+        return table.to_batches(max_chunksize=int(batch_size))
+    return table.to_batches()
+
+
+def _iter_in_process(worker_cfg, tasks, batch_size):
+    """
+    Build chunks in the calling process.
+
+    State is process-global, so it is reset before and after use;
+    do not interleave with another in-process stream.
+    """
+    State.reset()
+    try:
+        init_sales_worker(worker_cfg)
+        for task in tasks:
+            _, table = _stream_task(task)
+            yield from _table_batches(table, batch_size)
+            del table
+    finally:
+        State.reset()
+
+
+def _iter_pool(worker_cfg, tasks, n_workers, ordered, batch_size, max_inflight):
+    """
+    Build chunks in a process pool with at most max_inflight chunks
+    scheduled (running or finished but not yet consumed); the next chunk
+    is submitted only as results are taken, so a slow consumer holds
+    back the pool instead of buffering every chunk.
+    """
+    # The emitter consumes this from a background thread
+    with pool_context().Pool(
+        processes=n_workers,
+        initializer=init_sales_worker,
+        initargs=(worker_cfg,),
+    ) as pool:
+        pending = deque()
+        finished = queue.Queue()
+        next_task = 0
+
+        while next_task < len(tasks) or pending:
+            while next_task < len(tasks) and len(pending) < max_inflight:
+                if ordered:
+                    pending.append(
+                        pool.apply_async(_stream_task, (tasks[next_task],))
+                    )
+                else:
+                    pending.append(
+                        pool.apply_async(
+                            _stream_task,
+                            (tasks[next_task],),
+                            callback=finished.put,
+                            error_callback=finished.put,
+                        )
+                    )
+                next_task += 1
+
+            if ordered:
+                _, table = pending.popleft().get()
+            else:
+                result = finished.get()
+                pending.pop()  # only the count matters here
+                if isinstance(result, BaseException):
+                    raise result
+                _, table = result
+
+            yield from _table_batches(table, batch_size)
+            del table
+
+
+# =====================================================================
+# Public API
+# =====================================================================
+
+def iter_sales_batches(
+    cfg,
+    dims=None,
+    parquet_folder=None,
+    total_rows=None,
+    chunk_size=None,
+    start_date=None,
+    end_date=None,
+    seed=42,
+    heavy_pct=5,
+    heavy_mult=5,
+    skip_order_cols=None,
+    workers=0,
+    ordered=True,
+    batch_size=None,
+    max_inflight=None,
+):
+    """
+    Lazily yield Sales rows as pyarrow.RecordBatch, without writing files.
+
+    Uses the same dimension loading, date seasonality and chunk seeds as
+    generate_sales_fact, so for equal settings the rows match the chunk
+    files of a normal run (parquet schema, no Year/Month columns).
+
+    Parameters
+    ----------
+    cfg : dict
+        Resolved config. sales.* supplies defaults for parquet_folder,
+        total_rows, chunk_size and skip_order_cols.
+    dims : dict, optional
+        Output of load_sales_dimensions(); pass it to reuse loaded
+        dimensions across calls. Loaded from parquet_folder when None.
+    workers : int
+        0 builds chunks in the calling process; N > 0 fans out across a
+        process pool of N workers; None uses cpu_count() - 1.
+    ordered : bool
+        Pool mode only. True yields chunks in chunk order (deterministic
+        stream); False yields them as soon as they finish.
+    batch_size : int, optional
+        Max rows per RecordBatch (default: one batch per chunk).
+    max_inflight : int, optional
+        Pool mode only. Chunks scheduled ahead of the consumer
+        (default: 2 per worker); bounds memory when it is slower than
+        the pool.
+    """
+    sales_cfg = cfg.get("sales", {})
+
+    if total_rows is None:
+        total_rows = sales_cfg["total_rows"]
+    if chunk_size is None:
+        chunk_size = sales_cfg.get("chunk_size", 1_000_000)
+    if skip_order_cols is None:
+        skip_order_cols = bool(sales_cfg.get("skip_order_cols", False))
+
+    total_rows = int(total_rows)
+    chunk_size = int(chunk_size)
+    if total_rows < 0:
+        raise ValueError("total_rows must be >= 0")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+
+    start_date, end_date = resolve_sales_dates(cfg, start_date, end_date)
+
+    if dims is None:
+        if parquet_folder is None:
+            parquet_folder = sales_cfg["parquet_folder"]
+        dims = load_sales_dimensions(
+            parquet_folder,
+            heavy_pct=heavy_pct,
+            heavy_mult=heavy_mult,
+            seed=seed,
+            store_lifecycle=sales_cfg.get("store_lifecycle"),
+            customer_lifecycle=sales_cfg.get("customer_lifecycle"),
+            locality=sales_cfg.get("locality"),
+            basket_affinity=sales_cfg.get("basket_affinity"),
+            product_popularity=sales_cfg.get("product_popularity"),
+            local_currency=sales_cfg.get("local_currency"),
+        )
+
+    date_pool, date_prob = build_weighted_date_pool(
+        start_date, end_date, seed
+    )
+
+    tasks = build_chunk_tasks(total_rows, chunk_size, seed + 1)
+    if not tasks:
+        return
+
+    worker_cfg = build_worker_cfg(
+        dims,
+        date_pool,
+        date_prob,
+        file_format="parquet",
+        skip_order_cols=bool(skip_order_cols),
+        price_history=build_price_history(
+            dims["product_store"],
+            start_date,
+            end_date,
+            sales_cfg.get("price_history"),
+            seed,
+        ),
+    )
+
+    if workers is None:
+        workers = max(1, cpu_count() - 1)
+    workers = min(int(workers), len(tasks))
+
+    if max_inflight is None:
+        max_inflight = 2 * max(1, workers)
+    if int(max_inflight) < 1:
+        raise ValueError("max_inflight must be >= 1")
+
+    if workers <= 0:
+        yield from _iter_in_process(worker_cfg, tasks, batch_size)
+    else:
+        yield from _iter_pool(
+            worker_cfg, tasks, workers, ordered, batch_size, int(max_inflight)
+        )
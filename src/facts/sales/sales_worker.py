@@ -5,6 +5,18 @@ import pyarrow.parquet as pq
 
 from .sales_logic import chunk_builder
 from .sales_logic.globals import State, bind_globals
+from .sales_logic.product_store import GatherArena
+from .sales_logic.locality import StoreLocality
+from .sales_logic.basket import BasketAffinity
+from .sales_logic.alias import AliasTable
+
+
+# File suffix per sales.csv_compression
+CSV_EXTENSIONS = {
+    None: ".csv",
+    "gzip": ".csv.gz",
+    "zstd": ".csv.zst",
+}
 
 
 # ===============================================================
@@ -21,8 +33,14 @@ def init_sales_worker(worker_cfg: dict):
     # Extract config (explicit, fail-fast)
     # -----------------------------------------------------------
     try:
-        product_np = worker_cfg["product_np"]
+        product_store = worker_cfg["product_store"]
         store_keys = worker_cfg["store_keys"]
+        store_sampler = worker_cfg["store_sampler"]
+        store_locality = worker_cfg["store_locality"]
+        basket_affinity = worker_cfg["basket_affinity"]
+        product_popularity = worker_cfg["product_popularity"]
+        price_history = worker_cfg["price_history"]
+        fx_rates = worker_cfg["fx_rates"]
 
         promo_keys_all = worker_cfg["promo_keys_all"]
         promo_pct_all = worker_cfg["promo_pct_all"]
@@ -30,6 +48,7 @@ def init_sales_worker(worker_cfg: dict):
         promo_end_all = worker_cfg["promo_end_all"]
 
         customers = worker_cfg["customers"]
+        customer_sampler = worker_cfg["customer_sampler"]
 
         store_to_geo = worker_cfg["store_to_geo"]
         geo_to_currency = worker_cfg["geo_to_currency"]
@@ -47,6 +66,10 @@ def init_sales_worker(worker_cfg: dict):
         delta_output_folder = worker_cfg["delta_output_folder"]
         write_delta = worker_cfg["write_delta"]
 
+        ipc_compression = worker_cfg["ipc_compression"]
+        csv_compression = worker_cfg["csv_compression"]
+        csv_target_size_mb = worker_cfg["csv_target_size_mb"]
+
         skip_order_cols = worker_cfg["skip_order_cols"]
         partition_enabled = worker_cfg["partition_enabled"]
         partition_cols = worker_cfg["partition_cols"]
@@ -57,6 +80,17 @@ def init_sales_worker(worker_cfg: dict):
     if skip_order_cols not in (True, False):
         raise RuntimeError("skip_order_cols must be a boolean")
 
+    if csv_compression not in CSV_EXTENSIONS:
+        raise RuntimeError(
+            f"csv_compression must be one of {list(CSV_EXTENSIONS)}"
+        )
+
+    csv_target_bytes = (
+        int(float(csv_target_size_mb) * 1024 * 1024)
+        if csv_target_size_mb
+        else None
+    )
+
     # -----------------------------------------------------------
     # Dense mapping helpers (fast lookup)
     # -----------------------------------------------------------
@@ -78,15 +112,33 @@ def init_sales_worker(worker_cfg: dict):
         else None
     )
 
+    # Customer -> region and region -> store CSR (locality sampling)
+    if store_locality is not None:
+        store_locality = StoreLocality(**store_locality)
+
+    # Subcategory affinity matrix + per-subcategory product alias tables
+    # (weighted by product popularity when enabled)
+    if basket_affinity is not None:
+        basket_affinity = BasketAffinity(
+            product_store.subcategory_keys,
+            product_weights=product_popularity,
+            **basket_affinity,
+        )
+
+    # Product demand weights -> alias table (O(1) per row)
+    popularity_table = (
+        AliasTable(product_popularity) if product_popularity is not None else None
+    )
+
     # -----------------------------------------------------------
-    # Ensure output folders once
+    # Ensure output folders once (None = in-memory streaming)
     # -----------------------------------------------------------
-    if file_format == "deltaparquet":
+    if file_format == "deltaparquet" and delta_output_folder is not None:
         os.makedirs(
             os.path.join(delta_output_folder, "_tmp_parts"),
             exist_ok=True,
         )
-    else:
+    elif out_folder is not None:
         os.makedirs(out_folder, exist_ok=True)
 
     # -----------------------------------------------------------
@@ -108,7 +160,17 @@ def init_sales_worker(worker_cfg: dict):
         pa.field("UnitCost", pa.float64()),
         pa.field("UnitPrice", pa.float64()),
         pa.field("DiscountAmount", pa.float64()),
+    ]
+
+    # Optional local-currency amounts (sales.local_currency)
+    if fx_rates is not None:
+        base_fields += [
+            pa.field("ExchangeRate", pa.float64()),
+            pa.field("UnitPriceLocal", pa.float64()),
+            pa.field("NetPriceLocal", pa.float64()),
+        ]
 
+    base_fields += [
         pa.field("DeliveryStatus", pa.string()),
         pa.field("IsOrderDelayed", pa.int8()),
     ]
@@ -150,9 +212,17 @@ def init_sales_worker(worker_cfg: dict):
     # -----------------------------------------------------------
     bind_globals({
         # core data
-        "product_np": product_np,
+        "product_store": product_store,
+        "gather_arena": GatherArena(),
         "store_keys": store_keys,
+        "store_sampler": store_sampler,
+        "store_locality": store_locality,
+        "basket_affinity": basket_affinity,
+        "product_popularity": popularity_table,
+        "price_history": price_history,
+        "fx_rates": fx_rates,
         "customers": customers,
+        "customer_sampler": customer_sampler,
 
         # promotions
         "promo_keys_all": promo_keys_all,
@@ -173,9 +243,16 @@ def init_sales_worker(worker_cfg: dict):
         "out_folder": out_folder,
         "row_group_size": row_group_size,
         "compression": compression,
+        "ipc_compression": ipc_compression,
+        "csv_compression": csv_compression,
+        "csv_target_bytes": csv_target_bytes,
 
         # delta
-        "delta_output_folder": os.path.normpath(delta_output_folder),
+        "delta_output_folder": (
+            os.path.normpath(delta_output_folder)
+            if delta_output_folder is not None
+            else None
+        ),
         "write_delta": write_delta,
 
         # behavior
@@ -233,7 +310,18 @@ def _write_parquet_batches(table: pa.Table, path: str):
         writer.close()
 
 
+# Rows written between size checks when rolling CSV files
+_CSV_ROLL_ROWS = 4_096
+
+
 def _write_csv(table: pa.Table, path: str):
+    """
+    Write the chunk as CSV, optionally compressed (gzip / zstd) and
+    rolled into <name>_partNNN files of ~csv_target_bytes each
+    (compressed size when compressing).
+
+    Returns the list of written files.
+    """
     import pyarrow.compute as pc
     import pyarrow.csv as pacsv
 
@@ -257,20 +345,141 @@ def _write_csv(table: pa.Table, path: str):
             ),
         )
 
-    pacsv.write_csv(
+    codec = State.csv_compression
+    target = State.csv_target_bytes
+    base = path[: -len(".csv")] if path.endswith(".csv") else path
+    ext = CSV_EXTENSIONS[codec]
+
+    write_options = pacsv.WriteOptions(
+        include_header=True,
+        quoting_style="none",
+    )
+
+    if target:
+        batches = table.to_batches(max_chunksize=_CSV_ROLL_ROWS)
+    else:
+        batches = [table]
+
+    paths = []
+    raw = sink = writer = None
+
+    def _close():
+        writer.close()
+        if sink is not raw:
+            sink.close()
+        if not raw.closed:
+            raw.close()
+
+    for batch in batches:
+        if writer is None:
+            part_path = (
+                f"{base}_part{len(paths):03d}{ext}" if target else f"{base}{ext}"
+            )
+            raw = pa.OSFile(part_path, "wb")
+            sink = pa.CompressedOutputStream(raw, codec) if codec else raw
+            writer = pacsv.CSVWriter(sink, table.schema, write_options=write_options)
+            paths.append(part_path)
+
+        writer.write(batch)
+
+        # raw.tell() counts bytes on disk; flush the codec so it is current
+        if target and sink is not raw:
+            sink.flush()
+        if target and raw.tell() >= target:
+            _close()
+            writer = None
+
+    if writer is not None:
+        _close()
+
+    return paths
+
+
+def _write_arrow(table: pa.Table, path: str):
+    """
+    Write the chunk as an Arrow IPC file (Feather v2) as-is.
+    """
+    schema = State.sales_schema
+
+    if table.schema != schema:
+        raise RuntimeError(
+            "Schema mismatch in Arrow writer.\n"
+            f"Expected:\n{schema}\n\nGot:\n{table.schema}"
+        )
+
+    options = pa.ipc.IpcWriteOptions(compression=State.ipc_compression)
+
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, schema, options=options) as writer:
+            writer.write_table(table, max_chunksize=State.row_group_size)
+
+
+def _write_orc(table: pa.Table, path: str):
+    from pyarrow import orc
+    from .sales_writer import orc_compression
+
+    schema = State.sales_schema
+
+    if table.schema != schema:
+        raise RuntimeError(
+            "Schema mismatch in ORC writer.\n"
+            f"Expected:\n{schema}\n\nGot:\n{table.schema}"
+        )
+
+    orc.write_table(
         table,
         path,
-        write_options=pacsv.WriteOptions(
-            include_header=True,
-            quoting_style="none",
-        ),
+        compression=orc_compression(State.compression),
     )
 
 
+# Chunk file writers for single-file formats (name suffix, writer)
+_CHUNK_WRITERS = {
+    "parquet": ("parquet", _write_parquet_batches),
+    "csv": ("csv", _write_csv),
+    "arrow": ("arrow", _write_arrow),
+    "orc": ("orc", _write_orc),
+    # duckdb: chunks handed to the main process as Arrow IPC files
+    "duckdb": ("arrow", _write_arrow),
+}
+
+
 # ===============================================================
 # Worker task
 # ===============================================================
 
+def _chunk_seed(idx, seed):
+    base_seed = int(seed) if seed is not None else 0
+    return base_seed + idx * 10_000
+
+
+def _build_chunk(idx, batch_size, seed, date_pool=None, date_prob=None):
+    table = chunk_builder.build_chunk_table(
+        batch_size,
+        _chunk_seed(idx, seed),
+        no_discount_key=State.no_discount_key,
+        date_pool=date_pool,
+        date_prob=date_prob,
+    )
+
+    if not isinstance(table, pa.Table):
+        raise TypeError("chunk_builder must return pyarrow.Table")
+
+    return table
+
+
+def _stream_task(task):
+    """
+    Build one chunk and return it in memory (no file I/O).
+
+    task: (idx, batch_size, seed) or
+          (idx, batch_size, seed, date_pool, date_prob)
+    Returns (idx, pyarrow.Table).
+    """
+    idx, batch_size, seed, *pool = task
+    return idx, _build_chunk(idx, batch_size, seed, *pool)
+
+
 def _worker_task(args):
     """
     Supports:
@@ -288,17 +497,7 @@ def _worker_task(args):
     results = []
 
     for idx, batch_size, seed in tasks:
-        base_seed = int(seed) if seed is not None else 0
-        chunk_seed = base_seed + idx * 10_000
-
-        table = chunk_builder.build_chunk_table(
-            batch_size,
-            chunk_seed,
-            no_discount_key=State.no_discount_key,
-        )
-
-        if not isinstance(table, pa.Table):
-            raise TypeError("chunk_builder must return pyarrow.Table")
+        table = _build_chunk(idx, batch_size, seed)
 
         # DELTA
         if State.file_format == "deltaparquet":
@@ -314,24 +513,21 @@ def _worker_task(args):
             results.append({"part": name, "rows": rows})
             continue
 
-        # CSV
-        if State.file_format == "csv":
-            path = os.path.join(
-                State.out_folder,
-                f"sales_chunk{idx:04d}.csv",
-            )
-            _write_csv(table, path)
-            del table
-            results.append(path)
-            continue
+        # PARQUET / CSV / ARROW / ORC
+        try:
+            ext, writer = _CHUNK_WRITERS[State.file_format]
+        except KeyError:
+            raise RuntimeError(
+                f"Unsupported file_format: {State.file_format}"
+            ) from None
 
-        # PARQUET
         path = os.path.join(
             State.out_folder,
-            f"sales_chunk{idx:04d}.parquet",
+            f"sales_chunk{idx:04d}.{ext}",
         )
-        _write_parquet_batches(table, path)
+        written = writer(table, path)
         del table
-        results.append(path)
+        # CSV may roll into several files (list of paths)
+        results.append(written if written is not None else path)
 
     return results[0] if single else results
@@ -87,16 +87,125 @@ def merge_parquet_files(parquet_files, merged_file, delete_after=False):
     return merged_file
 
 
+# ----------------------------------------------------------------------
+# ARROW IPC / ORC MERGERS
+# ----------------------------------------------------------------------
+def _remove_files(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except Exception:
+            pass
+
+
+def merge_arrow_files(arrow_files, merged_file, delete_after=False, compression=None):
+    """
+    Merge Arrow IPC (Feather v2) chunk files into one IPC file.
+
+    - Memory-maps each chunk and streams its record batches
+    - Batches are written as-is (no re-encoding); buffers are only
+      recompressed when `compression` (lz4 / zstd) is set
+    """
+    arrow_files = sorted(p for p in arrow_files if os.path.exists(p))
+    if not arrow_files:
+        skip("No arrow chunk files to merge")
+        return None
+
+    info(f"Merging {len(arrow_files)} chunks: {os.path.basename(merged_file)}")
+
+    with pa.memory_map(arrow_files[0]) as src:
+        schema = pa.ipc.open_file(src).schema
+
+    missing = REQUIRED_PRICING_COLS - set(schema.names)
+    if missing:
+        raise RuntimeError(f"Missing required pricing columns: {missing}")
+
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+
+    with pa.OSFile(merged_file, "wb") as sink:
+        with pa.ipc.new_file(sink, schema, options=options) as writer:
+            for path in arrow_files:
+                with pa.memory_map(path) as src:
+                    reader = pa.ipc.open_file(src)
+                    for i in range(reader.num_record_batches):
+                        batch = reader.get_batch(i)
+                        if batch.schema != schema:
+                            batch = batch.select(schema.names)
+                        writer.write_batch(batch)
+
+    if delete_after:
+        _remove_files(arrow_files)
+
+    done(f"Merged chunks: {os.path.basename(merged_file)}")
+    return merged_file
+
+
+def merge_orc_files(orc_files, merged_file, delete_after=False, compression="snappy"):
+    """
+    Merge ORC chunk files stripe by stripe (constant memory).
+    """
+    from pyarrow import orc
+
+    orc_files = sorted(p for p in orc_files if os.path.exists(p))
+    if not orc_files:
+        skip("No orc chunk files to merge")
+        return None
+
+    info(f"Merging {len(orc_files)} chunks: {os.path.basename(merged_file)}")
+
+    schema = orc.ORCFile(orc_files[0]).schema
+
+    missing = REQUIRED_PRICING_COLS - set(schema.names)
+    if missing:
+        raise RuntimeError(f"Missing required pricing columns: {missing}")
+
+    writer = orc.ORCWriter(merged_file, compression=compression)
+    try:
+        for path in orc_files:
+            reader = orc.ORCFile(path)
+            for i in range(reader.nstripes):
+                stripe = reader.read_stripe(i).select(schema.names)
+                writer.write(pa.Table.from_batches([stripe]))
+    finally:
+        writer.close()
+
+    if delete_after:
+        _remove_files(orc_files)
+
+    done(f"Merged chunks: {os.path.basename(merged_file)}")
+    return merged_file
+
+
+def orc_compression(compression):
+    """
+    Map sales.compression (Parquet naming) onto ORC codec names.
+    """
+    c = (compression or "uncompressed").lower()
+    if c in ("none", "uncompressed"):
+        return "uncompressed"
+    if c == "gzip":
+        return "zlib"
+    if c in ("snappy", "zlib", "lz4", "zstd"):
+        return c
+    raise ValueError(f"Unsupported ORC compression: {compression}")
+
+
 # ----------------------------------------------------------------------
 # DELTA-PARQUET PARTITION WRITER
 # ----------------------------------------------------------------------
-def write_delta_partitioned(parts_folder, delta_output_folder, partition_cols):
+def write_delta_partitioned(
+    parts_folder,
+    delta_output_folder,
+    partition_cols,
+    mode="overwrite",
+):
     """
     Convert worker parquet parts into a partitioned Delta table.
 
     - Arrow-only (no pandas, no dataset)
     - Uses deltalake.write_deltalake
     - Scales via append-style writes
+    - mode applies to the first part only ("overwrite" or "append")
     """
 
     parts_folder = os.path.abspath(parts_folder)
@@ -158,7 +267,7 @@ def write_delta_partitioned(parts_folder, delta_output_folder, partition_cols):
         write_deltalake(
             delta_output_folder,
             table,
-            mode="overwrite" if first else "append",
+            mode=mode if first else "append",
             partition_by=partition_cols,
         )
         first = False
@@ -29,7 +29,9 @@ def download_history(currency, start_date, end_date):
         dates = pd.date_range(start=start_date, end=end_date)
         return pd.DataFrame({"Date": dates, "Rate": 1.0})
 
-    # INR uses USDINR=X (invert)
+    # INR uses USDINR=X (INR per USD); the others {CUR}USD=X (USD per
+    # unit). Keep in sync with USD_QUOTED_CURRENCIES in
+    # src/facts/sales/sales_logic/fx.py, which normalizes the direction.
     if currency == "INR":
         ticker = "USDINR=X"
         invert = False
@@ -1,7 +1,11 @@
 from .generate_create_table_scripts import generate_all_create_tables
-from .generate_bulk_insert_sql import generate_bulk_insert_script
+from .generate_bulk_insert_sql import (
+    generate_bulk_insert_script,
+    generate_bulk_insert_manifest,
+)
 
 __all__ = [
     "generate_all_create_tables",
     "generate_bulk_insert_script",
+    "generate_bulk_insert_manifest",
 ]
\ No newline at end of file
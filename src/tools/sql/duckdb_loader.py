@@ -0,0 +1,250 @@
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utils.static_schemas import (
+    STATIC_SCHEMAS,
+    get_sales_schema,
+    get_dates_schema,
+    get_customers_schema,
+)
+from src.utils.logging_utils import work, done, fmt_sec
+
+
+# File name of the packaged database inside a dataset folder
+DUCKDB_FILE = "contoso.duckdb"
+
+
+def require_duckdb():
+    try:
+        import duckdb
+    except ImportError as e:
+        raise RuntimeError(
+            "duckdb is required for duckdb output (pip install duckdb)"
+        ) from e
+    return duckdb
+
+
+# ------------------------------------------------------------
+# Schema helpers
+# ------------------------------------------------------------
+
+def table_name_from_stem(stem: str) -> str:
+    """customers -> Customers, product_category -> ProductCategory."""
+    return stem.replace("_", " ").title().replace(" ", "")
+
+
+def duckdb_type(sql_type: str):
+    """
+    Translate a static_schemas (SQL Server) type into DuckDB.
+    Returns (type, not_null).
+    """
+    t = sql_type.upper().strip()
+    not_null = t.endswith("NOT NULL")
+    if not_null:
+        t = t[: -len("NOT NULL")].strip()
+
+    if t == "VARCHAR(MAX)":
+        t = "VARCHAR"
+    elif t == "DATETIME":
+        t = "TIMESTAMP"
+    elif t == "BIT":
+        t = "BOOLEAN"
+    elif t == "FLOAT":
+        t = "DOUBLE"  # SQL Server FLOAT is 8 bytes
+
+    return t, not_null
+
+
+def create_table_ddl(table_name: str, cols, primary_key=False) -> str:
+    """
+    CREATE TABLE for DuckDB. With primary_key, the first NOT NULL
+    column becomes the primary key.
+    """
+    lines = []
+    pk = None
+    for col, sql_type in cols:
+        t, not_null = duckdb_type(sql_type)
+        lines.append(f'    "{col}" {t}{" NOT NULL" if not_null else ""}')
+        if primary_key and not_null and pk is None:
+            pk = col
+
+    if pk is not None:
+        lines.append(f'    PRIMARY KEY ("{pk}")')
+
+    body = ",\n".join(lines)
+    return f'CREATE TABLE "{table_name}" (\n{body}\n);'
+
+
+def _static_schema(table_name: str, cfg):
+    if table_name == "Dates":
+        return get_dates_schema(cfg.get("dates", {}))
+    if table_name == "Customers":
+        return get_customers_schema(cfg.get("customers", {}))
+    return STATIC_SCHEMAS.get(table_name)
+
+
+def _insert_arrow(con, table_name: str, table: pa.Table, columns=None):
+    """
+    Insert an Arrow table through a zero-copy scan (no CSV / pandas).
+    columns=None inserts positionally.
+    """
+    con.register("_arrow_src", table)
+    try:
+        if columns is None:
+            con.execute(f'INSERT INTO "{table_name}" SELECT * FROM _arrow_src')
+        else:
+            cols = ", ".join(f'"{c}"' for c in columns)
+            con.execute(
+                f'INSERT INTO "{table_name}" ({cols}) '
+                f"SELECT {cols} FROM _arrow_src"
+            )
+    finally:
+        con.unregister("_arrow_src")
+
+
+def _insert_columns(table_name: str, schema, table: pa.Table):
+    """
+    Decide how Parquet columns map onto the static schema:
+    - all schema columns present -> by name
+    - same column count          -> by position (as BULK INSERT does)
+    - otherwise                  -> by name, for the shared columns
+    """
+    names = [c for c, _ in schema]
+    present = [c for c in names if c in table.column_names]
+
+    if len(present) == len(names):
+        return names
+    if len(names) == table.num_columns:
+        return None
+    if not present:
+        raise RuntimeError(
+            f"No {table_name} columns match static_schemas: {table.column_names}"
+        )
+    return present
+
+
+# ------------------------------------------------------------
+# Sales (streamed while workers finish)
+# ------------------------------------------------------------
+
+class DuckDBSalesLoader:
+    """
+    Appends finished Sales chunks (Arrow IPC files) into a DuckDB table.
+    Import time is tracked separately from generation time.
+    """
+
+    def __init__(self, db_path, skip_order_cols=False, local_currency=False):
+        duckdb = require_duckdb()
+
+        self.db_path = Path(db_path)
+        if self.db_path.exists():
+            self.db_path.unlink()
+
+        self.con = duckdb.connect(str(self.db_path))
+        self.schema = get_sales_schema(skip_order_cols, local_currency)
+        self.columns = [c for c, _ in self.schema]
+        self.con.execute(create_table_ddl("Sales", self.schema))
+
+        self.rows = 0
+        self.seconds = 0.0
+
+    def append_arrow_file(self, path):
+        t0 = time.time()
+        with pa.memory_map(str(path)) as src:
+            table = pa.ipc.open_file(src).read_all()
+            _insert_arrow(self.con, "Sales", table, self.columns)
+            self.rows += table.num_rows
+            del table
+        self.seconds += time.time() - t0
+
+    def close(self, sort_by_order_date=False):
+        try:
+            if sort_by_order_date and self.rows:
+                t0 = time.time()
+                self.con.execute(
+                    'CREATE TABLE "Sales_sorted" AS '
+                    'SELECT * FROM "Sales" ORDER BY "OrderDate"'
+                )
+                self.con.execute('DROP TABLE "Sales"')
+                self.con.execute('ALTER TABLE "Sales_sorted" RENAME TO "Sales"')
+                self.seconds += time.time() - t0
+
+            self.con.execute("CHECKPOINT")
+        finally:
+            self.con.close()
+
+        done(
+            f"DuckDB import: {self.rows:,} sales rows in "
+            f"{fmt_sec(self.seconds)}"
+        )
+
+
+# ------------------------------------------------------------
+# Dimensions
+# ------------------------------------------------------------
+
+def load_dimensions_into_duckdb(
+    db_path, parquet_dims, cfg, primary_keys=False, extra_dims=()
+):
+    """
+    Bulk-append every dimension parquet (plus extra_dims, files produced
+    by the sales run) into the DuckDB file.
+
+    Tables known to static_schemas are created from it (optionally with
+    a primary key); others are created from the Parquet schema.
+    """
+    duckdb = require_duckdb()
+
+    t0 = time.time()
+    con = duckdb.connect(str(db_path))
+    count = 0
+
+    try:
+        files = sorted(Path(parquet_dims).glob("*.parquet"))
+        for f in files + [Path(p) for p in extra_dims]:
+            table_name = table_name_from_stem(f.stem)
+            table = pq.read_table(f)
+            schema = _static_schema(table_name, cfg)
+
+            con.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+
+            if schema is None:
+                con.register("_arrow_src", table)
+                try:
+                    con.execute(
+                        f'CREATE TABLE "{table_name}" AS SELECT * FROM _arrow_src'
+                    )
+                finally:
+                    con.unregister("_arrow_src")
+            else:
+                con.execute(
+                    create_table_ddl(table_name, schema, primary_key=primary_keys)
+                )
+                _insert_arrow(
+                    con,
+                    table_name,
+                    table,
+                    _insert_columns(table_name, schema, table),
+                )
+
+            work(f"{table_name}: {table.num_rows:,} rows")
+            count += 1
+
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+
+    elapsed = time.time() - t0
+    done(f"DuckDB import: {count} dimension tables in {fmt_sec(elapsed)}")
+    return elapsed
+
+
+__all__ = [
+    "DUCKDB_FILE",
+    "DuckDBSalesLoader",
+    "load_dimensions_into_duckdb",
+    "table_name_from_stem",
+]
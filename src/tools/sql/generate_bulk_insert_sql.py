@@ -1,4 +1,5 @@
 import os
+import json
 from datetime import datetime
 from pathlib import Path
 from src.utils.logging_utils import info, work, skip
@@ -84,3 +85,55 @@ WITH (
 
     work(f"Wrote BULK INSERT script: {Path(output_sql_file).name}")
     return output_sql_file
+
+
+# Compression inferred from the file suffix of a CSV chunk
+_CSV_COMPRESSION = {
+    ".csv": None,
+    ".gz": "gzip",
+    ".zst": "zstd",
+}
+
+
+def generate_bulk_insert_manifest(
+    csv_folder,
+    table_name,
+    output_file,
+):
+    """
+    Write a JSON manifest of the CSV files of one table (path, size and
+    compression per file) so loaders can run one bulk-load stream per file.
+    """
+    csv_folder = Path(csv_folder)
+
+    files = []
+    for f in sorted(csv_folder.iterdir()):
+        name = f.name.lower()
+        if not (name.endswith(".csv") or ".csv." in name):
+            continue
+        suffix = f.suffix.lower()
+        if suffix not in _CSV_COMPRESSION:
+            continue
+        files.append({
+            "path": os.path.abspath(f),
+            "bytes": f.stat().st_size,
+            "compression": _CSV_COMPRESSION[suffix],
+        })
+
+    if not files:
+        skip(f"No CSV files found in {csv_folder}. Skipping bulk load manifest.")
+        return None
+
+    manifest = {
+        "table": table_name,
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "format": {"first_row": 2, "field_terminator": ",", "row_terminator": "0x0a"},
+        "total_bytes": sum(f["bytes"] for f in files),
+        "files": files,
+    }
+
+    with open(output_file, "w", encoding="utf-8") as out:
+        json.dump(manifest, out, indent=2)
+
+    work(f"Wrote bulk load manifest: {Path(output_file).name} ({len(files)} files)")
+    return output_file
@@ -5,6 +5,7 @@ from src.utils.static_schemas import (
     STATIC_SCHEMAS,
     get_sales_schema,
     get_dates_schema,
+    get_customers_schema,
 )
 from src.utils.logging_utils import work, skip
 
@@ -24,6 +25,7 @@ def generate_all_create_tables(
     output_folder,
     cfg,
     skip_order_cols=False,
+    local_currency=False,
 ):
     os.makedirs(output_folder, exist_ok=True)
 
@@ -46,6 +48,12 @@ def generate_all_create_tables(
             dim_scripts.append(
                 create_table_from_static_schema("Dates", dates_cols)
             )
+        elif table_name == "Customers":
+            dim_scripts.append(
+                create_table_from_static_schema(
+                    "Customers", get_customers_schema(cfg.get("customers"))
+                )
+            )
         else:
             dim_scripts.append(
                 create_table_from_static_schema(table_name, cols)
@@ -54,7 +62,7 @@ def generate_all_create_tables(
     # -------------------------
     # Sales Fact Table
     # -------------------------
-    sales_schema = get_sales_schema(skip_order_cols)
+    sales_schema = get_sales_schema(skip_order_cols, local_currency)
     fact_scripts.append(
         create_table_from_static_schema("Sales", sales_schema)
     )
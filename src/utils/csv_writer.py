@@ -0,0 +1,225 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.utils.logging_utils import work, fmt_sec
+
+
+# ============================================================
+# pandas.to_csv(quoting=csv.QUOTE_MINIMAL) compatible rendering
+# ============================================================
+#
+# pyarrow.csv.CSVWriter either quotes every string ("needed") or rejects
+# values containing separators/quotes ("none"), so neither reproduces
+# QUOTE_MINIMAL. Rows are therefore rendered with Arrow compute kernels
+# (one string column per field, joined per row) and the resulting
+# contiguous UTF-8 buffer is written as-is.
+
+SEP = ","
+LINE_TERMINATOR = os.linesep   # pandas.to_csv default
+_NEEDS_QUOTES = r'[,"\r\n]'
+
+
+def _quote_minimal(col):
+    """Quote values containing separator / quote / newline, doubling quotes."""
+    needs = pc.match_substring_regex(col, _NEEDS_QUOTES)
+    quoted = pc.binary_join_element_wise(
+        '"', pc.replace_substring(col, '"', '""'), '"', ""
+    )
+    return pc.if_else(needs, quoted, col)
+
+
+def _header_line(names):
+    cells = []
+    for name in names:
+        if any(ch in name for ch in ',"\r\n'):
+            name = '"' + name.replace('"', '""') + '"'
+        cells.append(name)
+    return SEP.join(cells) + LINE_TERMINATOR
+
+
+def _float_text(col):
+    """Python repr style: whole floats keep a trailing '.0'."""
+    text = pc.cast(col, pa.string())
+    plain = pc.invert(pc.match_substring_regex(text, r"[.eEna]"))
+    return pc.if_else(plain, pc.binary_join_element_wise(text, ".0", ""), text)
+
+
+def _pandas_float_ints(pf: pq.ParquetFile):
+    """
+    Integer columns pandas reads back as float64 (nullable ints without
+    an extension dtype) — pandas writes those as '1.0'.
+    """
+    meta = pf.schema_arrow.pandas_metadata or {}
+    ext = {
+        c.get("name")
+        for c in meta.get("columns", [])
+        if str(c.get("numpy_type", "")).startswith(("Int", "UInt"))
+    }
+    md = pf.metadata
+    cols = set()
+    for i, field in enumerate(pf.schema_arrow):
+        if not pa.types.is_integer(field.type) or field.name in ext:
+            continue
+        for rg in range(md.num_row_groups):
+            stats = md.row_group(rg).column(i).statistics
+            if stats is not None and stats.has_null_count:
+                has_nulls = stats.null_count > 0
+            else:
+                col = pf.read_row_group(rg, columns=[field.name])[field.name]
+                has_nulls = col.null_count > 0
+            if has_nulls:
+                cols.add(field.name)
+                break
+    return cols
+
+
+def _timestamp_formats(pf: pq.ParquetFile):
+    """
+    pandas prints a datetime column as a bare date when every value is
+    midnight; decide that per column over the whole file.
+    """
+    ts_cols = [
+        f.name for f in pf.schema_arrow if pa.types.is_timestamp(f.type)
+    ]
+    if not ts_cols:
+        return {}
+
+    formats = {}
+    table = pf.read(columns=ts_cols)
+    for name in ts_cols:
+        col = table[name]
+        day = pc.floor_temporal(col, unit="day")
+        all_midnight = pc.all(
+            pc.fill_null(pc.equal(col, day), True)
+        ).as_py()
+        formats[name] = "%Y-%m-%d" if all_midnight else "%Y-%m-%d %H:%M:%S"
+    return formats
+
+
+def _render_column(col, field, ts_formats, float_ints):
+    t = field.type
+
+    if pa.types.is_dictionary(t):
+        col = pc.cast(col, t.value_type)
+        t = t.value_type
+
+    if pa.types.is_string(t) or pa.types.is_large_string(t):
+        text = _quote_minimal(pc.cast(col, pa.string()))
+    elif pa.types.is_boolean(t):
+        text = pc.if_else(col, "True", "False")
+    elif pa.types.is_timestamp(t):
+        fmt = ts_formats.get(field.name, "%Y-%m-%d %H:%M:%S")
+        if fmt.endswith("%S"):
+            # Whole seconds, like pandas for second-resolution values
+            col = pc.cast(col, pa.timestamp("s", tz=t.tz), safe=False)
+        text = pc.strftime(col, format=fmt)
+    elif pa.types.is_floating(t) or (
+        pa.types.is_integer(t) and field.name in float_ints
+    ):
+        text = _float_text(pc.cast(col, pa.float64()))
+    else:
+        text = pc.cast(col, pa.string())
+
+    return pc.fill_null(text, "")
+
+
+def _render_batch(batch, ts_formats, float_ints):
+    cols = [
+        _render_column(col, field, ts_formats, float_ints)
+        for col, field in zip(batch.columns, batch.schema)
+    ]
+    lines = pc.binary_join_element_wise(*cols, SEP)
+    lines = pc.binary_join_element_wise(lines, LINE_TERMINATOR, "")
+    if isinstance(lines, pa.ChunkedArray):
+        lines = lines.combine_chunks()
+    return lines
+
+
+def _string_data(arr: pa.StringArray):
+    """Contiguous UTF-8 bytes of a null-free string array."""
+    if len(arr) == 0:
+        return b""
+    offsets = np.frombuffer(arr.buffers()[1], dtype=np.int32)
+    begin = int(offsets[arr.offset])
+    end = int(offsets[arr.offset + len(arr)])
+    return arr.buffers()[2][begin:end]
+
+
+# ============================================================
+# Public API
+# ============================================================
+
+def parquet_to_csv(src, dst, batch_size=65_536):
+    """
+    Stream a Parquet file to CSV batch by batch.
+    Returns (rows, bytes_written, seconds, peak_batch_bytes).
+    """
+    t0 = time.time()
+    pf = pq.ParquetFile(src)
+
+    ts_formats = _timestamp_formats(pf)
+    float_ints = _pandas_float_ints(pf)
+
+    rows = 0
+    written = 0
+    peak = 0
+
+    Path(dst).parent.mkdir(parents=True, exist_ok=True)
+
+    with open(dst, "wb") as out:
+        header = _header_line(pf.schema_arrow.names).encode("utf-8")
+        out.write(header)
+        written += len(header)
+
+        for batch in pf.iter_batches(batch_size=batch_size):
+            lines = _render_batch(batch, ts_formats, float_ints)
+            data = _string_data(lines)
+            out.write(data)
+
+            rows += batch.num_rows
+            written += len(data)
+            peak = max(peak, batch.nbytes + lines.nbytes)
+            del lines, data
+
+    return rows, written, time.time() - t0, peak
+
+
+def convert_parquet_files_to_csv(pairs, workers=None):
+    """
+    Convert (src_parquet, dst_csv) pairs concurrently in a thread pool
+    (Arrow kernels release the GIL). Logs throughput and peak batch
+    memory per file.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return []
+
+    if workers is None:
+        workers = min(len(pairs), os.cpu_count() or 1)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(parquet_to_csv, src, dst): (src, dst)
+            for src, dst in pairs
+        }
+        for fut in as_completed(futures):
+            src, dst = futures[fut]
+            rows, written, secs, peak = fut.result()
+            mb = written / 1e6
+            rate = mb / secs if secs > 0 else 0.0
+            work(
+                f"{Path(dst).name}: {rows:,} rows, {mb:.1f} MB in "
+                f"{fmt_sec(secs)} ({rate:.1f} MB/s, peak batch "
+                f"{peak / 1e6:.1f} MB)"
+            )
+            results.append(dst)
+
+    return results
@@ -0,0 +1,183 @@
+import os
+import errno
+import shutil
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from pathlib import Path
+
+from src.utils.logging_utils import done, fmt_sec
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# ============================================================
+# Transfer strategies
+# ============================================================
+#
+# move=True  (scratch output that is deleted afterwards):
+#     rename -> hardlink -> reflink -> copy
+# move=False (source must stay intact, e.g. cached parquet_dims):
+#     reflink -> copy
+#
+# Hardlinks are never used for persistent sources: the dataset would
+# share inodes with files that get rewritten in place on the next run.
+
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+_CROSS_DEVICE = {errno.EXDEV, errno.EPERM, errno.EACCES, errno.ENOTSUP}
+if hasattr(errno, "EOPNOTSUPP"):
+    _CROSS_DEVICE.add(errno.EOPNOTSUPP)
+
+
+def _reflink(src, dst):
+    """Copy-on-write clone (btrfs / XFS / overlay on either). Raises OSError."""
+    if fcntl is None:
+        raise OSError(errno.ENOTSUP, "reflink not supported on this platform")
+
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.unlink(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def transfer_file(src, dst, move=False):
+    """
+    Place src at dst with the cheapest available strategy.
+    Returns (strategy, bytes_copied); bytes_copied is 0 unless data was
+    physically rewritten.
+    """
+    src, dst = str(src), str(dst)
+
+    if os.path.lexists(dst):
+        os.unlink(dst)
+
+    if move:
+        try:
+            os.rename(src, dst)
+            return "rename", 0
+        except OSError as e:
+            if e.errno not in _CROSS_DEVICE:
+                raise
+        try:
+            os.link(src, dst)
+            return "hardlink", 0
+        except (OSError, NotImplementedError):
+            pass
+
+    try:
+        _reflink(src, dst)
+        return "reflink", 0
+    except OSError:
+        pass
+
+    shutil.copy2(src, dst)
+    return "copy", os.path.getsize(dst)
+
+
+# ============================================================
+# Batch transfers
+# ============================================================
+
+class TransferReport:
+    """Strategy counts and byte totals for one batch of transfers."""
+
+    def __init__(self):
+        self.strategies = Counter()
+        self.files = 0
+        self.total_bytes = 0
+        self.copied_bytes = 0
+        self.seconds = 0.0
+
+    def add(self, strategy, size, copied):
+        self.strategies[strategy] += 1
+        self.files += 1
+        self.total_bytes += size
+        self.copied_bytes += copied
+
+    def summary(self):
+        used = ", ".join(
+            f"{name} {count}" for name, count in self.strategies.most_common()
+        ) or "none"
+        return (
+            f"{self.files} file(s), {self.total_bytes / 1e6:,.1f} MB "
+            f"[{used}] | {self.copied_bytes / 1e6:,.1f} MB copied in "
+            f"{fmt_sec(self.seconds)}"
+        )
+
+
+def transfer_files(pairs, move=False, workers=None, label=None):
+    """
+    Transfer (src, dst) file pairs; copies (the only strategy that moves
+    data) run concurrently in a thread pool. Logs and returns a
+    TransferReport.
+    """
+    pairs = [(Path(s), Path(d)) for s, d in pairs]
+    report = TransferReport()
+    t0 = time.time()
+
+    if pairs:
+        for d in {d.parent for _, d in pairs}:
+            d.mkdir(parents=True, exist_ok=True)
+
+        if workers is None:
+            workers = min(len(pairs), 8, os.cpu_count() or 1)
+
+        def _one(pair):
+            src, dst = pair
+            size = src.stat().st_size
+            strategy, copied = transfer_file(src, dst, move=move)
+            return strategy, size, copied
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for strategy, size, copied in pool.map(_one, pairs):
+                report.add(strategy, size, copied)
+
+    report.seconds = time.time() - t0
+    if label:
+        done(f"{label}: {report.summary()}")
+    return report
+
+
+def tree_pairs(src_dir, dst_dir, ignore=()):
+    """(src, dst) pairs for every file under src_dir, skipping names matching ignore."""
+    src_dir, dst_dir = Path(src_dir), Path(dst_dir)
+    pairs = []
+
+    for root, dirs, files in os.walk(src_dir):
+        dirs[:] = [d for d in dirs if not any(fnmatch(d, p) for p in ignore)]
+        rel = Path(root).relative_to(src_dir)
+        for name in files:
+            if any(fnmatch(name, p) for p in ignore):
+                continue
+            pairs.append((Path(root) / name, dst_dir / rel / name))
+
+    return pairs
+
+
+def transfer_tree(src_dir, dst_dir, move=False, ignore=(), workers=None, label=None):
+    """Transfer a directory tree file by file (see transfer_files)."""
+    Path(dst_dir).mkdir(parents=True, exist_ok=True)
+    return transfer_files(
+        tree_pairs(src_dir, dst_dir, ignore),
+        move=move,
+        workers=workers,
+        label=label,
+    )
+
+
+__all__ = [
+    "TransferReport",
+    "transfer_file",
+    "transfer_files",
+    "transfer_tree",
+    "tree_pairs",
+]
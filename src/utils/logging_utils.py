@@ -1,4 +1,6 @@
 import os
+import sys
+import threading
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -41,6 +43,7 @@ def _shorten_path_in_msg(msg: str) -> str:
 ENABLE_COLORS = True          # Colors in console
 ENABLE_FILE_LOG = False       # Save logs to file
 LOG_FILE = "logs/generator.log"
+LOG_TO_STDERR = False         # Keep stdout free for data (sales emit to stdout)
 
 COLORS = {
     "INFO":  "\033[94m",   # Blue
@@ -55,6 +58,17 @@ COLORS = {
 # Track entire pipeline start
 PIPELINE_START_TIME = time.time()
 
+# One writer at a time: dimension generators log from several threads.
+# Held across fork as well, so a child never inherits it locked.
+_WRITE_LOCK = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_WRITE_LOCK.acquire,
+        after_in_parent=_WRITE_LOCK.release,
+        after_in_child=_WRITE_LOCK.release,
+    )
+
 # ============================================================================
 # HELPERS
 # ============================================================================
@@ -88,13 +102,18 @@ def _line(level, msg):
 
 
 def _flush(line):
-    """Prints to stdout safely for multiprocessing."""
-    print(line, flush=True)
-
-    if ENABLE_FILE_LOG:
-        os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+    """Writes one whole line to stdout (or stderr), safe across threads."""
+    stream = sys.stderr if LOG_TO_STDERR else sys.stdout
+
+    with _WRITE_LOCK:
+        # Single write: print() emits the line and its newline separately
+        stream.write(line + "\n")
+        stream.flush()
+
+        if ENABLE_FILE_LOG:
+            os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+            with open(LOG_FILE, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
 
 
 # ============================================================================
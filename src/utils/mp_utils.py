@@ -0,0 +1,62 @@
+import multiprocessing
+import threading
+import weakref
+from contextlib import contextmanager
+
+
+# Threads parked between tasks (waiting on a queue or a future, holding
+# no lock a forked child could need); any other live thread counts as busy
+_IDLE_THREADS = weakref.WeakSet()
+_IDLE_LOCK = threading.Lock()
+
+
+def set_thread_idle(idle=True):
+    """Mark the calling thread as parked (idle=True) or working again."""
+    thread = threading.current_thread()
+    with _IDLE_LOCK:
+        if idle:
+            _IDLE_THREADS.add(thread)
+        else:
+            _IDLE_THREADS.discard(thread)
+
+
+@contextmanager
+def thread_idle():
+    """Treat the calling thread as parked for the duration of a blocking wait."""
+    set_thread_idle(True)
+    try:
+        yield
+    finally:
+        set_thread_idle(False)
+
+
+def _busy_threads():
+    current = threading.current_thread()
+    with _IDLE_LOCK:
+        return [
+            t for t in threading.enumerate()
+            if t is not current and t not in _IDLE_THREADS
+        ]
+
+
+def pool_context():
+    """
+    multiprocessing context for starting a worker Pool.
+
+    fork is only safe while no other thread is working: a lock held by
+    another thread at fork time (a dimension generator on the
+    DimensionScheduler's threads, a writer's I/O thread) stays locked in
+    the children forever. Parked threads (idle scheduler workers, a
+    caller blocked on DimensionScheduler.wait) do not count. With a busy
+    thread, pools are started with forkserver (spawn where it is
+    unavailable); otherwise the default context is kept.
+    """
+    ctx = multiprocessing.get_context()
+    if ctx.get_start_method() != "fork" or not _busy_threads():
+        return ctx
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+__all__ = ["pool_context", "set_thread_idle", "thread_idle"]
@@ -1,10 +1,12 @@
 import shutil
 from pathlib import Path
+import pyarrow as pa
 import pyarrow.parquet as pq
 from datetime import datetime
-import csv
 
 from src.utils.logging_utils import stage, done, info
+from src.utils.csv_writer import convert_parquet_files_to_csv
+from src.utils.file_transfer import transfer_files, transfer_tree
 
 # ============================================================
 # Helpers
@@ -17,6 +19,19 @@ def format_number_short(n: int) -> str:
     return str(n)
 
 
+def write_batches(path, batches, schema) -> int:
+    """
+    Stream Arrow record batches into one Parquet file, one row group
+    per batch. Returns the number of rows written.
+    """
+    rows = 0
+    with pq.ParquetWriter(str(path), schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch, row_group_size=max(1, batch.num_rows))
+            rows += batch.num_rows
+    return rows
+
+
 def create_final_output_folder(
     final_folder_root: Path,
     parquet_dims: Path,
@@ -24,10 +39,14 @@ def create_final_output_folder(
     sales_cfg: dict,
     file_format: str,
     sales_rows_expected: int,
-    cfg: dict
+    cfg: dict,
+    extra_dims=(),
 ):
     """
     Packs cleaned dimension + fact data according to config rules.
+
+    extra_dims: dimension-like parquet files produced by the sales run
+    (e.g. ProductPriceHistory), packaged alongside parquet_dims.
     """
     stage("Creating Final Output Folder")
 
@@ -53,6 +72,9 @@ def create_final_output_folder(
         "deltaparquet": "DeltaParquet",
         "parquet": "Parquet",
         "csv": "CSV",
+        "arrow": "Arrow",
+        "orc": "ORC",
+        "duckdb": "DuckDB",
     }.get(file_format.lower(), file_format)
 
     # ---------------------------
@@ -83,29 +105,27 @@ def create_final_output_folder(
     # DIMENSIONS HANDLING
     # --------------------------------------------------------
     ff = file_format.lower()
+    dim_files = sorted(parquet_dims.glob("*.parquet")) + list(extra_dims)
 
     if ff == "parquet":
-        # Copy dimension parquet files
-        for f in parquet_dims.glob("*.parquet"):
-            shutil.copy2(f, dims_out / f.name)
+        # parquet_dims is persistent: reflink when possible, else copy
+        transfer_files(
+            [(f, dims_out / f.name) for f in dim_files],
+            move=False,
+            label="Dimensions packaged",
+        )
 
     elif ff == "csv":
-        # Convert parquet → CSV
-        import pandas as pd
-        for f in parquet_dims.glob("*.parquet"):
-            df = pd.read_parquet(f)
-            csv_path = dims_out / (f.stem + ".csv")
-            df.to_csv(
-                csv_path,
-                index=False,
-                encoding="utf-8",
-                quoting=csv.QUOTE_MINIMAL
-            )
+        # Convert parquet → CSV (streamed, files in parallel)
+        convert_parquet_files_to_csv(
+            (f, dims_out / (f.stem + ".csv"))
+            for f in dim_files
+        )
 
     elif ff == "deltaparquet":
         # Convert parquet → Delta table
         from deltalake import write_deltalake
-        for f in parquet_dims.glob("*.parquet"):
+        for f in dim_files:
             dim_name = f.stem
             delta_out = dims_out / dim_name
             delta_out.mkdir(parents=True, exist_ok=True)
@@ -116,6 +136,35 @@ def create_final_output_folder(
                 table,
                 mode="overwrite"
             )
+
+    elif ff == "arrow":
+        # Convert parquet → Arrow IPC file (Feather v2)
+        ipc_options = pa.ipc.IpcWriteOptions(
+            compression=sales_cfg.get("ipc_compression")
+        )
+        for f in dim_files:
+            table = pq.read_table(f)
+            with pa.OSFile(str(dims_out / (f.stem + ".arrow")), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema, options=ipc_options) as writer:
+                    writer.write_table(table)
+
+    elif ff == "orc":
+        # Convert parquet → ORC
+        from pyarrow import orc
+        from src.facts.sales.sales_writer import orc_compression
+
+        codec = orc_compression(sales_cfg.get("compression", "snappy"))
+        for f in dim_files:
+            orc.write_table(
+                pq.read_table(f),
+                str(dims_out / (f.stem + ".orc")),
+                compression=codec,
+            )
+
+    elif ff == "duckdb":
+        # Dimensions are imported into the database by packaging
+        pass
+
     else:
         raise ValueError(f"Unknown file_format: {file_format}")
 
@@ -133,46 +182,24 @@ def create_final_output_folder(
     # ---------------------------
     if ff == "deltaparquet":
 
-        # Locate Delta output folder
-        delta_src = None
-
-        # config override
-        cfg_delta = sales_cfg.get("delta_output_folder")
-        if cfg_delta:
-            d = Path(cfg_delta).expanduser().resolve()
-            if d.exists():
-                delta_src = d
-
-        # fallback to standard delta location
-        if delta_src is None:
-            fb = fact_folder / "sales"
-            if fb.exists():
-                delta_src = fb
-
-        if delta_src is None:
-            raise RuntimeError("DeltaParquet output folder not found!")
-
-        # Copy REAL delta table only
-        shutil.copytree(
-            delta_src,
-            sales_target,
-            ignore=shutil.ignore_patterns("_tmp_parts*", "tmp*", "*_tmp*")
-        )
-
+        # The Delta snapshot is moved out of scratch by packaging
+        # (package_output); nothing to copy here.
         done("Creating Final Output Folder")
         return final_folder
 
     # --------------------------------------------------------
-    # PARQUET MODE
+    # PARQUET / ARROW / ORC / DUCKDB MODE (sales copied by packaging)
     # --------------------------------------------------------
-    if ff == "parquet":
+    if ff in ("parquet", "arrow", "orc", "duckdb"):
         partitioned_sales = fact_folder / "sales"
 
         if partitioned_sales.exists():
-            shutil.copytree(
+            transfer_tree(
                 partitioned_sales,
                 sales_target,
-                ignore=shutil.ignore_patterns("_tmp_parts*", "tmp*", "*_tmp*")
+                move=True,
+                ignore=("_tmp_parts*", "tmp*", "*_tmp*"),
+                label="Partitioned sales packaged",
             )
 
         done("Creating Final Output Folder")
@@ -183,20 +210,14 @@ def create_final_output_folder(
     # --------------------------------------------------------
     if ff == "csv":
         partitioned_sales = fact_folder / "sales"
-        import pandas as pd
-
-        for file in partitioned_sales.rglob("*.parquet"):
-            rel = file.relative_to(partitioned_sales)
-            out_file = sales_target / rel.with_suffix(".csv")
-            out_file.parent.mkdir(parents=True, exist_ok=True)
-
-            df = pd.read_parquet(file)
-            df.to_csv(
-                out_file,
-                index=False,
-                encoding="utf-8",
-                quoting=csv.QUOTE_MINIMAL
+
+        convert_parquet_files_to_csv(
+            (
+                file,
+                sales_target / file.relative_to(partitioned_sales).with_suffix(".csv"),
             )
+            for file in partitioned_sales.rglob("*.parquet")
+        )
 
         done("Creating Final Output Folder")
         return final_folder
@@ -16,7 +16,9 @@ STATIC_SCHEMAS = {
         ("Occupation",         "VARCHAR(20)"),
         ("CustomerType",       "VARCHAR(20)"),
         ("CompanyName",        "VARCHAR(200)"),
-        ("GeographyKey",       "INT")
+        ("GeographyKey",       "INT"),
+        ("CustomerStartDate",  "DATE"),
+        ("CustomerEndDate",    "DATE")
     ],
 
     "Geography": [
@@ -166,6 +168,14 @@ STATIC_SCHEMAS = {
         ("CurrencyName","VARCHAR(50)")
     ],
 
+    "ProductPriceHistory": [
+        ("ProductKey",     "INT NOT NULL"),
+        ("MonthStartDate", "DATE NOT NULL"),
+        ("UnitPrice",      "DECIMAL(10,2)"),
+        ("UnitCost",       "DECIMAL(10,2)"),
+        ("IsMarkdown",     "TINYINT")
+    ],
+
     # -----------------------
     # FACTS
     # -----------------------
@@ -244,10 +254,27 @@ DATE_COLUMN_GROUPS = {
 }
 
 
-def get_sales_schema(skip_order_cols: bool):
-    """Return the Sales schema with or without order number columns."""
+# Optional Sales columns (sales.local_currency), after DiscountAmount
+SALES_LOCAL_CURRENCY_COLUMNS = [
+    ("ExchangeRate",   "DECIMAL(10, 6)"),
+    ("UnitPriceLocal", "DECIMAL(12, 2)"),
+    ("NetPriceLocal",  "DECIMAL(12, 2)"),
+]
+
+
+def get_sales_schema(skip_order_cols: bool, local_currency: bool = False):
+    """
+    Return the Sales schema with or without order number columns, and
+    with the local-currency columns when local_currency is set.
+    """
     base_schema = STATIC_SCHEMAS["Sales"]
 
+    if local_currency:
+        at = [col for col, _ in base_schema].index("DiscountAmount") + 1
+        base_schema = (
+            base_schema[:at] + SALES_LOCAL_CURRENCY_COLUMNS + base_schema[at:]
+        )
+
     if not skip_order_cols:
         return base_schema
 
@@ -259,6 +286,21 @@ def get_sales_schema(skip_order_cols: bool):
     ]
 
 
+# Customers columns present only with customers.lifecycle.enabled
+CUSTOMER_LIFECYCLE_COLUMNS = ("CustomerStartDate", "CustomerEndDate")
+
+
+def get_customers_schema(customers_cfg: dict):
+    """Return the Customers schema, with lifecycle dates only when enabled."""
+    if ((customers_cfg or {}).get("lifecycle") or {}).get("enabled", False):
+        return STATIC_SCHEMAS["Customers"]
+    return [
+        (col, dtype)
+        for col, dtype in STATIC_SCHEMAS["Customers"]
+        if col not in CUSTOMER_LIFECYCLE_COLUMNS
+    ]
+
+
 def get_dates_schema(dates_cfg: dict):
     """
     Return Dates schema filtered by config include flags.
@@ -6,6 +6,7 @@ This package exposes:
 - save_version: Write version metadata after generation.
 - load_version: Load stored metadata.
 - validate_all_dimensions: Ensure version files exist for dimensions.
+- DimensionCache: Content-addressed store of generated dimension variants.
 """
 
 # Core version metadata store
@@ -15,6 +16,9 @@ from .version_store import (
     should_regenerate,
 )
 
+# Content-addressed variant cache
+from .dimension_cache import DimensionCache
+
 # Validation helpers
 from .version_checker import (
     ensure_dimension_version_exists,
@@ -26,6 +30,8 @@ __all__ = [
     "save_version",
     "load_version",
     "should_regenerate",
+    # cache
+    "DimensionCache",
     # validation
     "ensure_dimension_version_exists",
     "validate_all_dimensions",
@@ -0,0 +1,229 @@
+import json
+import time
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+
+from src.utils.logging_utils import info, work
+from src.utils.file_transfer import transfer_files
+from .version_store import PROJECT_ROOT, VERSION_DIR, _version_file
+
+
+# -----------------------------------------------------------
+# Content-addressed dimension cache
+# -----------------------------------------------------------
+#
+# <root>/<dimension>/<key>/
+#     <output>.parquet ...        parquet files the generator wrote
+#     <output>.version.json ...   matching data/versioning metadata
+#     entry.json                  name, key, files, bytes, last_used
+#
+# key = sha256(config sections + upstream dimension keys + generator
+# source hash), so a variant is reusable for any config that resolves
+# to the same inputs, and a changed upstream dimension (e.g. geography)
+# invalidates everything built on it.
+
+ENTRY_FILE = "entry.json"
+
+# Keys of the dimension variants currently in a parquet_dims folder
+KEYS_FILE = ".dimension_keys.json"
+
+
+def _clean(obj):
+    """Drop runtime-only keys (e.g. _force_regenerate) before hashing."""
+    if isinstance(obj, dict):
+        return {
+            k: _clean(v) for k, v in obj.items()
+            if not str(k).startswith("_")
+        }
+    if isinstance(obj, (list, tuple)):
+        return [_clean(v) for v in obj]
+    return obj
+
+
+def code_version(paths) -> str:
+    """sha256 over the source files of a generator."""
+    h = hashlib.sha256()
+    for p in sorted(Path(p) for p in paths):
+        h.update(p.name.encode("utf-8"))
+        h.update(p.read_bytes())
+    return h.hexdigest()
+
+
+def dimension_key(name, sections, upstream_keys, code) -> str:
+    payload = {
+        "name": name,
+        "sections": _clean(sections),
+        "upstream": dict(sorted(upstream_keys.items())),
+        "code": code,
+    }
+    data = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class DimensionCache:
+    """
+    Keeps several generated variants per dimension, evicting the least
+    recently used entries once the cache exceeds max_bytes.
+
+    Entries are reflinked or copied in and out (never hardlinked):
+    generators rewrite parquet_dims files in place.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._in_use = set()
+
+    @classmethod
+    def from_config(cls, cfg):
+        """DimensionCache from cfg['dimension_cache'], or None when disabled."""
+        cache_cfg = cfg.get("dimension_cache") or {}
+        if not cache_cfg.get("enabled", False):
+            return None
+
+        root = Path(cache_cfg.get("folder", "./data/dimension_cache"))
+        if not root.is_absolute():
+            root = PROJECT_ROOT / root
+
+        max_mb = cache_cfg.get("max_size_mb", 2048)
+        if max_mb is None or float(max_mb) <= 0:
+            raise ValueError("dimension_cache.max_size_mb must be > 0")
+
+        return cls(root, float(max_mb) * 1024 * 1024)
+
+    # -------------------------------------------------------
+    # parquet_dims key markers
+    # -------------------------------------------------------
+    def current_key(self, parquet_dims, name):
+        path = Path(parquet_dims) / KEYS_FILE
+        with self._lock:
+            try:
+                return json.loads(path.read_text()).get(name)
+            except (FileNotFoundError, ValueError):
+                return None
+
+    def set_current_key(self, parquet_dims, name, key):
+        path = Path(parquet_dims) / KEYS_FILE
+        with self._lock:
+            try:
+                keys = json.loads(path.read_text())
+            except (FileNotFoundError, ValueError):
+                keys = {}
+            keys[name] = key
+            path.write_text(json.dumps(keys, indent=2, sort_keys=True))
+
+    # -------------------------------------------------------
+    # Entries
+    # -------------------------------------------------------
+    def _entry_dir(self, name, key):
+        return self.root / name / key
+
+    def touch(self, name, key):
+        """Mark a variant used by this run (LRU order, eviction guard)."""
+        meta_path = self._entry_dir(name, key) / ENTRY_FILE
+        with self._lock:
+            self._in_use.add((name, key))
+            try:
+                meta = json.loads(meta_path.read_text())
+            except (FileNotFoundError, ValueError):
+                return
+            meta["last_used"] = time.time()
+            meta_path.write_text(json.dumps(meta, indent=2))
+
+    def restore(self, name, key, parquet_dims, outputs):
+        """Copy a cached variant into parquet_dims. Returns True on a hit."""
+        entry = self._entry_dir(name, key)
+        meta_path = entry / ENTRY_FILE
+        if not meta_path.exists():
+            return False
+
+        files = [entry / f"{stem}.parquet" for stem in outputs]
+        if not all(f.exists() for f in files):
+            return False
+
+        transfer_files(
+            [(f, Path(parquet_dims) / f.name) for f in files],
+            move=False,
+        )
+        for stem in outputs:
+            vf = entry / f"{stem}.version.json"
+            if vf.exists():
+                shutil.copyfile(vf, _version_file(stem))
+
+        self.touch(name, key)
+        self.set_current_key(parquet_dims, name, key)
+        return True
+
+    def store(self, name, key, parquet_dims, outputs):
+        """Add the variant now in parquet_dims, then evict down to max_bytes."""
+        entry = self._entry_dir(name, key)
+        if (entry / ENTRY_FILE).exists():
+            self.touch(name, key)
+            self.set_current_key(parquet_dims, name, key)
+            return
+
+        files = [Path(parquet_dims) / f"{stem}.parquet" for stem in outputs]
+        missing = [f.name for f in files if not f.exists()]
+        if missing:
+            raise RuntimeError(f"{name}: cannot cache, missing {missing}")
+
+        tmp = entry.with_name(entry.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        report = transfer_files([(f, tmp / f.name) for f in files], move=False)
+
+        for stem in outputs:
+            vf = VERSION_DIR / f"{stem}.version.json"
+            if vf.exists():
+                shutil.copyfile(vf, tmp / vf.name)
+
+        meta = {
+            "name": name,
+            "key": key,
+            "files": [f.name for f in files],
+            "bytes": report.total_bytes,
+            "created": time.time(),
+            "last_used": time.time(),
+        }
+        (tmp / ENTRY_FILE).write_text(json.dumps(meta, indent=2))
+
+        with self._lock:
+            shutil.rmtree(entry, ignore_errors=True)
+            tmp.rename(entry)
+            self._in_use.add((name, key))
+
+        self.set_current_key(parquet_dims, name, key)
+        work(f"Cached {name} variant {key[:12]} ({report.total_bytes / 1e6:,.1f} MB)")
+        self.evict()
+
+    def entries(self):
+        out = []
+        for meta_path in self.root.glob(f"*/*/{ENTRY_FILE}"):
+            try:
+                meta = json.loads(meta_path.read_text())
+            except ValueError:
+                continue
+            meta["path"] = meta_path.parent
+            out.append(meta)
+        return out
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            entries = sorted(self.entries(), key=lambda m: m["last_used"])
+            total = sum(m["bytes"] for m in entries)
+
+            for meta in entries:
+                if total <= self.max_bytes:
+                    break
+                if (meta["name"], meta["key"]) in self._in_use:
+                    continue
+                shutil.rmtree(meta["path"], ignore_errors=True)
+                total -= meta["bytes"]
+                info(
+                    f"Evicted cached {meta['name']} variant {meta['key'][:12]} "
+                    f"({meta['bytes'] / 1e6:,.1f} MB)"
+                )
@@ -6,10 +6,12 @@ def render_output(cfg):
 
     st.subheader("1️⃣ Output")
 
+    formats = ["csv", "parquet", "deltaparquet", "arrow", "orc", "duckdb"]
+
     sales["file_format"] = st.selectbox(
         "Output format",
-        ["csv", "parquet", "deltaparquet"],
-        index=["csv", "parquet", "deltaparquet"].index(sales["file_format"]),
+        formats,
+        index=formats.index(sales["file_format"]),
     )
 
     sales["skip_order_cols"] = st.checkbox(